@@ -38,6 +38,169 @@ class Settings(BaseSettings):
         "image/jpg",
         "image/gif",
     }
+    IMAGE_UPLOAD_CONCURRENCY: int = int(os.getenv("IMAGE_UPLOAD_CONCURRENCY", 4))
+
+    # Idempotency-Key 관련 설정
+    IDEMPOTENCY_TTL_SECONDS: int = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", 24 * 60 * 60))
+    IDEMPOTENCY_LOCK_TIMEOUT_SECONDS: int = int(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT_SECONDS", 60))
+    IDEMPOTENCY_MEMORY_MAX_ENTRIES: int = int(os.getenv("IDEMPOTENCY_MEMORY_MAX_ENTRIES", 1000))
+
+    # 게시글 일괄 가져오기 관련 설정
+    IMPORT_MAX_RECORDS: int = int(os.getenv("IMPORT_MAX_RECORDS", 10000))
+    # zip 압축 폭탄 방지: 압축을 풀기 전에 항목 수와 압축 해제 크기 합계를 확인합니다
+    IMPORT_MAX_ZIP_ENTRIES: int = int(os.getenv("IMPORT_MAX_ZIP_ENTRIES", 20000))
+    IMPORT_MAX_UNCOMPRESSED_BYTES: int = int(os.getenv("IMPORT_MAX_UNCOMPRESSED_BYTES", 1024 * 1024 * 1024))
+    IMPORT_BATCH_SIZE: int = 500  # Firestore batch 당 최대 쓰기 수
+    IMPORT_BATCH_CONCURRENCY: int = int(os.getenv("IMPORT_BATCH_CONCURRENCY", 4))
+    IMPORT_COMMIT_ATTEMPTS: int = 3  # 일시적인 오류로 batch 커밋이 실패했을 때 최대 시도 횟수
+
+    # 게시글 내보내기 관련 설정
+    EXPORT_CHUNK_SIZE: int = int(os.getenv("EXPORT_CHUNK_SIZE", 500))
+
+    # 변경 피드 관련 설정
+    CHANGE_FEED_MAX_LIMIT: int = int(os.getenv("CHANGE_FEED_MAX_LIMIT", 500))
+    # 커밋이 늦게 끝난 쓰기를 놓치지 않도록 최근 몇 초 동안의 변경은 다음 요청으로 미룹니다
+    CHANGE_FEED_SETTLE_SECONDS: int = int(os.getenv("CHANGE_FEED_SETTLE_SECONDS", 5))
+
+    # 게시글 변경 SSE 관련 설정
+    SSE_QUEUE_SIZE: int = int(os.getenv("SSE_QUEUE_SIZE", 100))
+    SSE_HISTORY_SIZE: int = int(os.getenv("SSE_HISTORY_SIZE", 1000))
+    SSE_HEARTBEAT_SECONDS: int = int(os.getenv("SSE_HEARTBEAT_SECONDS", 15))
+    SSE_RETRY_MILLISECONDS: int = int(os.getenv("SSE_RETRY_MILLISECONDS", 3000))
+    SSE_RESUME_LIMIT: int = int(os.getenv("SSE_RESUME_LIMIT", 500))
+    # Firestore 리스너가 끊겼는지 확인하는 간격과 다시 구독할 때의 최대 대기 시간 (1초부터 두 배씩 늘립니다)
+    SSE_WATCH_CHECK_SECONDS: float = float(os.getenv("SSE_WATCH_CHECK_SECONDS", 5))
+    SSE_WATCH_MAX_BACKOFF_SECONDS: float = float(os.getenv("SSE_WATCH_MAX_BACKOFF_SECONDS", 60))
+    # 리스너 쿼리(updated_at >= 기준 시각)의 결과가 계속 커지지 않도록 기준 시각을 옮기는 간격
+    SSE_WATCH_REANCHOR_SECONDS: float = float(os.getenv("SSE_WATCH_REANCHOR_SECONDS", 60 * 60))
+
+    # 게시글 일괄 조회 최대 개수 (Firestore `in` 쿼리 제한)
+    BATCH_MAX_IDS: int = 30
+
+    # 게시글 검색 관련 설정
+    SEARCH_INDEX_ENABLED: bool = os.getenv("SEARCH_INDEX_ENABLED", "true").lower() == "true"
+
+    # 정적 스냅샷(CDN) 관련 설정
+    SNAPSHOT_ENABLED: bool = os.getenv("SNAPSHOT_ENABLED", "false").lower() == "true"
+    SNAPSHOT_BACKEND: str = os.getenv("SNAPSHOT_BACKEND", "gcs")  # gcs | local
+    SNAPSHOT_LOCAL_DIR: str = os.getenv("SNAPSHOT_LOCAL_DIR", "snapshots")
+    SNAPSHOT_PREFIX: str = os.getenv("SNAPSHOT_PREFIX", "static")
+    SNAPSHOT_PAGE_SIZE: int = int(os.getenv("SNAPSHOT_PAGE_SIZE", 10))
+    SNAPSHOT_DEBOUNCE_SECONDS: float = float(os.getenv("SNAPSHOT_DEBOUNCE_SECONDS", 2))
+    SNAPSHOT_CACHE_CONTROL: str = os.getenv("SNAPSHOT_CACHE_CONTROL", "public, max-age=60")
+
+    # 응답 캐시 및 압축 관련 설정
+    RESPONSE_CACHE_TTL_SECONDS: float = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 30))
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 1000))
+    # memory: 프로세스 내 캐시 | shared: 워커끼리 공유하는 /dev/shm 캐시
+    RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_SHARED_DIR: str = os.getenv("RESPONSE_CACHE_SHARED_DIR", "/dev/shm/kusis-response-cache")
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", 500))  # 이보다 작은 응답은 압축하지 않음
+    GZIP_LEVEL: int = int(os.getenv("GZIP_LEVEL", 6))
+    BROTLI_QUALITY: int = int(os.getenv("BROTLI_QUALITY", 8))
+    # 이보다 큰 응답은 압축이 이벤트 루프를 오래 막지 않도록 스레드에서 압축합니다
+    COMPRESSION_THREAD_MIN_SIZE: int = int(os.getenv("COMPRESSION_THREAD_MIN_SIZE", 64 * 1024))
+
+    # 클라이언트 초기화 관련 설정
+    CLIENT_PREWARM_ENABLED: bool = os.getenv("CLIENT_PREWARM_ENABLED", "true").lower() == "true"
+
+    # 시작 시 캐시 워밍업 관련 설정
+    WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    WARMUP_TIMEOUT_SECONDS: float = float(os.getenv("WARMUP_TIMEOUT_SECONDS", 10))
+    WARMUP_LIST_PAGES: int = int(os.getenv("WARMUP_LIST_PAGES", 1))  # 카테고리별로 미리 읽을 목록 페이지 수
+    WARMUP_LIST_LIMIT: int = int(os.getenv("WARMUP_LIST_LIMIT", 10))
+    WARMUP_POST_COUNT: int = int(os.getenv("WARMUP_POST_COUNT", 10))  # 미리 읽을 최신 게시글 수
+
+    # 요청 deadline, 백엔드 호출 timeout, circuit breaker 관련 설정
+    REQUEST_DEADLINE_PUBLIC_SECONDS: float = float(os.getenv("REQUEST_DEADLINE_PUBLIC_SECONDS", 5))
+    REQUEST_DEADLINE_ADMIN_SECONDS: float = float(os.getenv("REQUEST_DEADLINE_ADMIN_SECONDS", 30))
+    REQUEST_DEADLINE_UPLOAD_SECONDS: float = float(os.getenv("REQUEST_DEADLINE_UPLOAD_SECONDS", 120))
+    BACKEND_CALL_TIMEOUT_SECONDS: float = float(os.getenv("BACKEND_CALL_TIMEOUT_SECONDS", 10))  # 호출 하나의 최대 시간
+    CIRCUIT_BREAKER_WINDOW_SIZE: int = int(os.getenv("CIRCUIT_BREAKER_WINDOW_SIZE", 20))
+    CIRCUIT_BREAKER_MIN_CALLS: int = int(os.getenv("CIRCUIT_BREAKER_MIN_CALLS", 10))
+    CIRCUIT_BREAKER_FAILURE_RATE: float = float(os.getenv("CIRCUIT_BREAKER_FAILURE_RATE", 0.5))
+    CIRCUIT_BREAKER_OPEN_SECONDS: float = float(os.getenv("CIRCUIT_BREAKER_OPEN_SECONDS", 10))
+
+    # 헤지 읽기(hedged read) 관련 설정
+    HEDGED_READS_ENABLED: bool = os.getenv("HEDGED_READS_ENABLED", "false").lower() == "true"
+    # 이 백분위 시간 안에 응답이 없으면 한 번 더 요청
+    HEDGE_PERCENTILE: float = float(os.getenv("HEDGE_PERCENTILE", 0.95))
+    HEDGE_BUDGET_RATIO: float = float(os.getenv("HEDGE_BUDGET_RATIO", 0.05))  # 추가 요청은 전체 요청의 5% 이하
+    HEDGE_LATENCY_WINDOW_SIZE: int = int(os.getenv("HEDGE_LATENCY_WINDOW_SIZE", 500))
+    HEDGE_MIN_SAMPLES: int = int(os.getenv("HEDGE_MIN_SAMPLES", 50))
+
+    # Firestore 사용량(과금) 집계 관련 설정
+    FIRESTORE_COST_TRACKING_ENABLED: bool = os.getenv("FIRESTORE_COST_TRACKING_ENABLED", "true").lower() == "true"
+    # 응답에 X-Firestore-Cost 헤더를 붙일지 여부 (디버깅용)
+    FIRESTORE_COST_HEADER_ENABLED: bool = os.getenv("FIRESTORE_COST_HEADER_ENABLED", "false").lower() == "true"
+    FIRESTORE_SLOW_QUERY_SECONDS: float = float(os.getenv("FIRESTORE_SLOW_QUERY_SECONDS", 1))
+    FIRESTORE_EXPENSIVE_QUERY_READS: int = int(os.getenv("FIRESTORE_EXPENSIVE_QUERY_READS", 100))
+
+    # 요청 추적(tracing) 관련 설정
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "false").lower() == "true"
+    TRACING_EXPORTER: str = os.getenv("TRACING_EXPORTER", "none")  # none | console | file
+    TRACING_FILE_PATH: str = os.getenv("TRACING_FILE_PATH", "traces.jsonl")
+    TRACING_SAMPLE_RATE: float = float(os.getenv("TRACING_SAMPLE_RATE", 1))  # exporter로 보낼 요청 비율
+    SERVER_TIMING_ENABLED: bool = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+    SERVER_TIMING_MAX_ENTRIES: int = int(os.getenv("SERVER_TIMING_MAX_ENTRIES", 5))
+
+    # 로깅 관련 설정
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVELS: str = os.getenv("LOG_LEVELS", "")  # 모듈별 레벨, 예: utils.crud_utils=DEBUG,uvicorn.access=WARNING
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")  # json | text
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", 10000))  # 가득 차면 새 로그를 버림
+    LOG_DEBUG_SAMPLE_RATE: float = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", 1))  # DEBUG 로그를 남길 비율
+
+    # 관리자 프로파일링 관련 설정
+    # 관리자 인증 뒤에 있어도 CPU/메모리를 쓰는 엔드포인트이므로 필요한 환경에서만 켭니다
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_MAX_SECONDS: float = float(os.getenv("PROFILING_MAX_SECONDS", 30))  # CPU 프로파일 최대 길이
+    PROFILING_MIN_INTERVAL_MS: float = float(os.getenv("PROFILING_MIN_INTERVAL_MS", 1))  # 가장 짧은 샘플 간격
+    TRACEMALLOC_MAX_FRAMES: int = int(os.getenv("TRACEMALLOC_MAX_FRAMES", 25))
+    TRACEMALLOC_MAX_SECONDS: float = float(os.getenv("TRACEMALLOC_MAX_SECONDS", 600))  # 이후 자동으로 추적 중지
+    LOOP_LAG_INTERVAL_SECONDS: float = float(os.getenv("LOOP_LAG_INTERVAL_SECONDS", 0.5))
+    LOOP_LAG_WINDOW_SIZE: int = int(os.getenv("LOOP_LAG_WINDOW_SIZE", 600))
+
+    # 이벤트 루프 블로킹 감시 관련 설정 (스테이징에서 켜서 새로 생긴 동기 호출을 찾습니다)
+    LOOP_WATCHDOG_ENABLED: bool = os.getenv("LOOP_WATCHDOG_ENABLED", "false").lower() == "true"
+    LOOP_WATCHDOG_THRESHOLD_MS: float = float(os.getenv("LOOP_WATCHDOG_THRESHOLD_MS", 100))
+    LOOP_WATCHDOG_STACK_DEPTH: int = int(os.getenv("LOOP_WATCHDOG_STACK_DEPTH", 30))
+
+    # 데이터 백엔드 관련 설정: google(Firestore, GCS) | memory(부하 테스트/벤치마크용 인메모리 가짜 백엔드)
+    DATA_BACKEND: str = os.getenv("DATA_BACKEND", "google")
+    MEMORY_BACKEND_SEED_CONTENTS: int = int(os.getenv("MEMORY_BACKEND_SEED_CONTENTS", 0))  # 시작 시 만들 게시글 수
+    MEMORY_BACKEND_ADMIN_UID: str = os.getenv("MEMORY_BACKEND_ADMIN_UID", "admin")  # 시작 시 만들 관리자 uid
+    MEMORY_FIRESTORE_LATENCY_MS: float = float(os.getenv("MEMORY_FIRESTORE_LATENCY_MS", 0))  # RPC마다 넣을 지연
+    MEMORY_STORAGE_LATENCY_MS: float = float(os.getenv("MEMORY_STORAGE_LATENCY_MS", 0))
+    MEMORY_BACKEND_JITTER_MS: float = float(os.getenv("MEMORY_BACKEND_JITTER_MS", 0))  # 0~jitter 사이 추가 지연
+    MEMORY_BACKEND_SLOW_RATE: float = float(os.getenv("MEMORY_BACKEND_SLOW_RATE", 0))  # 꼬리 지연이 생길 확률
+    MEMORY_BACKEND_SLOW_MS: float = float(os.getenv("MEMORY_BACKEND_SLOW_MS", 0))
+    MEMORY_BACKEND_ERROR_RATE: float = float(os.getenv("MEMORY_BACKEND_ERROR_RATE", 0))  # ServiceUnavailable 확률
+    MEMORY_BACKEND_SEED: int = int(os.getenv("MEMORY_BACKEND_SEED", 0))  # 같은 값이면 같은 지연/오류 순서
+
+    # 서버 실행(serve.py) 관련 설정
+    SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
+    SERVER_PORT: int = int(os.getenv("SERVER_PORT", os.getenv("PORT", 8000)))
+    # 워커 프로세스 수. serve.py는 설정하지 않으면 사용할 수 있는 CPU 수로 정해 워커에 넘기고,
+    # `uvicorn main:app`처럼 직접 실행하면 프로세스 하나이므로 1입니다
+    WEB_CONCURRENCY: int = int(os.getenv("WEB_CONCURRENCY", 1))
+    WORKER_MAX_REQUESTS: int = int(os.getenv("WORKER_MAX_REQUESTS", 10000))  # 이만큼 처리한 워커는 재시작 (0: 끄기)
+    GRACEFUL_SHUTDOWN_SECONDS: int = int(os.getenv("GRACEFUL_SHUTDOWN_SECONDS", 30))
+    # X-Forwarded-For/Proto를 믿을 프록시 IP 목록 (쉼표 구분). 로드밸런서 뒤라면 그 주소 대역으로 설정합니다
+    FORWARDED_ALLOW_IPS: str = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+    # 과부하 제어(admission control) 관련 설정: public(공개 조회) / admin(관리자, 쓰기) / upload(파일 업로드)
+    ADMISSION_ENABLED: bool = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_PUBLIC_CONCURRENCY: int = int(os.getenv("ADMISSION_PUBLIC_CONCURRENCY", 64))
+    ADMISSION_PUBLIC_QUEUE_SIZE: int = int(os.getenv("ADMISSION_PUBLIC_QUEUE_SIZE", 256))
+    ADMISSION_PUBLIC_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("ADMISSION_PUBLIC_QUEUE_TIMEOUT_SECONDS", 2))
+    ADMISSION_ADMIN_CONCURRENCY: int = int(os.getenv("ADMISSION_ADMIN_CONCURRENCY", 8))
+    ADMISSION_ADMIN_QUEUE_SIZE: int = int(os.getenv("ADMISSION_ADMIN_QUEUE_SIZE", 32))
+    ADMISSION_ADMIN_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("ADMISSION_ADMIN_QUEUE_TIMEOUT_SECONDS", 10))
+    ADMISSION_UPLOAD_CONCURRENCY: int = int(os.getenv("ADMISSION_UPLOAD_CONCURRENCY", 2))
+    ADMISSION_UPLOAD_QUEUE_SIZE: int = int(os.getenv("ADMISSION_UPLOAD_QUEUE_SIZE", 8))
+    ADMISSION_UPLOAD_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("ADMISSION_UPLOAD_QUEUE_TIMEOUT_SECONDS", 30))
+    ADMISSION_RETRY_AFTER_SECONDS: int = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", 1))
 
     @property
     def DATABASE_URL(self):
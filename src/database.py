@@ -1,42 +1,94 @@
+import asyncio
 import os
+import threading
 
 import firebase_admin
 from firebase_admin import auth, credentials
 from google.cloud import firestore, storage
 from google.oauth2 import service_account
 
+from config import settings
+
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 KEY_PATH = os.path.join(CURRENT_DIR, "kusis-kr-firebase-adminsdk.json")
 
-if not os.path.exists(KEY_PATH):
-    raise FileNotFoundError(f"서비스 계정 키 파일을 찾을 수 없습니다: {KEY_PATH}")
+# 클라이언트는 import 시점이 아니라 처음 사용할 때 만듭니다 (콜드 스타트 단축, 키 파일 없이 import 가능).
+# 인메모리 백엔드와 비용 계측 모듈도 그 설정을 쓸 때만 import합니다
+_credentials: service_account.Credentials | None = None
+_firestore_client: firestore.AsyncClient | None = None
+_storage_client: storage.Client | None = None
+_sync_firestore_client: firestore.Client | None = None
+# 동기 Depends는 스레드풀에서 실행되므로 생성이 겹치지 않게 잠급니다
+_client_lock = threading.Lock()
 
-GLOBAL_CREDS = service_account.Credentials.from_service_account_file(KEY_PATH)
 
-if not firebase_admin._apps:
-    cred = credentials.Certificate(KEY_PATH)
-    firebase_admin.initialize_app(cred, {
-        'encoding': 'utf-8'
-    })
+def get_credentials() -> service_account.Credentials:
+    """
+    서비스 계정 인증 정보를 읽고 firebase_admin을 초기화합니다. 처음 호출될 때 한 번만 수행합니다.
+    """
+    global _credentials
+    with _client_lock:
+        if _credentials is not None:
+            return _credentials
+        if not os.path.exists(KEY_PATH):
+            raise FileNotFoundError(f"서비스 계정 키 파일을 찾을 수 없습니다: {KEY_PATH}")
 
-_firestore_client = firestore.AsyncClient(credentials=GLOBAL_CREDS)
-_storage_client = storage.Client(
-    credentials=GLOBAL_CREDS,
-    project=GLOBAL_CREDS.project_id
-)
+        if not firebase_admin._apps:
+            cred = credentials.Certificate(KEY_PATH)
+            firebase_admin.initialize_app(cred, {
+                'encoding': 'utf-8'
+            })
+
+        _credentials = service_account.Credentials.from_service_account_file(KEY_PATH)
+        return _credentials
 
 
 def get_async_firestore_client() -> firestore.AsyncClient:
     """
     애플리케이션 전체에서 재사용 가능한 Firestore Async Client를 반환합니다.
+    DATA_BACKEND가 memory면 인메모리 가짜 클라이언트를 반환합니다.
     """
+    global _firestore_client
+    if settings.DATA_BACKEND == "memory":
+        from utils.memory_backend_utils import get_memory_firestore_client
+        return get_memory_firestore_client()
+    if _firestore_client is None:
+        creds = get_credentials()
+        with _client_lock:
+            if _firestore_client is None:
+                client = firestore.AsyncClient(credentials=creds)
+                if settings.FIRESTORE_COST_TRACKING_ENABLED:
+                    from utils.firestore_cost_utils import instrument_firestore_client
+                    client = instrument_firestore_client(client)
+                _firestore_client = client
     return _firestore_client
 
 
+def get_firestore_client() -> firestore.Client:
+    """
+    실시간 리스너(on_snapshot)용 동기 Firestore Client를 반환합니다. 처음 호출될 때 생성합니다.
+    DATA_BACKEND가 memory면 비동기 클라이언트와 같은 인메모리 클라이언트를 반환합니다 (on_snapshot만 씁니다).
+    """
+    global _sync_firestore_client
+    if settings.DATA_BACKEND == "memory":
+        from utils.memory_backend_utils import get_memory_firestore_client
+        return get_memory_firestore_client()
+    if _sync_firestore_client is None:
+        creds = get_credentials()
+        with _client_lock:
+            if _sync_firestore_client is None:
+                _sync_firestore_client = firestore.Client(credentials=creds, project=creds.project_id)
+    return _sync_firestore_client
+
+
 def get_auth_client():
     """
     애플리케이션 전체에서 재사용 가능한 Auth Client를 반환합니다.
     """
+    if settings.DATA_BACKEND == "memory":
+        from utils.memory_backend_utils import memory_auth_client
+        return memory_auth_client
+    get_credentials()
     return auth
 
 
@@ -44,4 +96,45 @@ async def get_storage() -> storage.Client:
     """
     애플리케이션 전체에서 재사용 가능한 Google Cloud Storage Client를 반환합니다.
     """
+    global _storage_client
+    if settings.DATA_BACKEND == "memory":
+        from utils.memory_backend_utils import get_memory_storage_client
+        return get_memory_storage_client()
+    if _storage_client is None:
+        creds = get_credentials()
+        with _client_lock:
+            if _storage_client is None:
+                _storage_client = storage.Client(credentials=creds, project=creds.project_id)
     return _storage_client
+
+
+async def prewarm_clients() -> None:
+    """
+    Firestore gRPC 채널과 Storage HTTP 커넥션 풀을 동시에 미리 열어 첫 요청의 연결 지연을 없앱니다.
+    """
+    firestore_client = get_async_firestore_client()
+    storage_client = await get_storage()
+    bucket = storage_client.bucket(settings.GCS_BUCKET_NAME)
+
+    await asyncio.gather(
+        firestore_client.collection("counters").document("contents").get(),
+        asyncio.to_thread(bucket.exists),
+    )
+
+
+async def close_clients() -> None:
+    """
+    생성된 클라이언트의 채널과 커넥션을 닫습니다. 앱 종료 시 lifespan에서 호출합니다.
+    """
+    global _firestore_client, _storage_client, _sync_firestore_client
+    if _firestore_client is not None:
+        if _firestore_client._firestore_api_internal is not None:
+            await _firestore_client._firestore_api_internal.transport.close()
+        _firestore_client = None
+    if _sync_firestore_client is not None:
+        if _sync_firestore_client._firestore_api_internal is not None:
+            _sync_firestore_client._firestore_api_internal.transport.close()
+        _sync_firestore_client = None
+    if _storage_client is not None:
+        _storage_client.close()
+        _storage_client = None
@@ -9,7 +9,9 @@ from google.cloud import storage
 from config import Settings
 from database import get_async_firestore_client, get_storage
 from exception import InactiveUserException
+from utils.idempotency_utils import IdempotencyStore, idempotency_store
 from utils.image_utils import ImageUploader
+from utils.resilience_utils import call
 
 
 async def get_current_admin(
@@ -28,7 +30,7 @@ async def get_current_admin(
         payload = jwt.decode(token, key=Settings().JWT_SECRET_KEY, algorithms=Settings().JWT_ALGORITHM)
         user_id: str = payload.get("sub")
 
-        user_doc = db.collection("users").document(user_id).get()
+        user_doc = await call("firestore", "read", db.collection("users").document(user_id).get)
 
         if not user_doc.exists:
             raise credentials_exception
@@ -54,3 +56,8 @@ async def get_image_uploader(
 ) -> ImageUploader:
     """Get ImageUploader instance with storage client dependency."""
     return ImageUploader(storage_client)
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """Get the process-wide IdempotencyStore."""
+    return idempotency_store
@@ -25,6 +25,27 @@ class RouteReqPostContent(BaseModel):
     def validate_contents(cls, value: str | None) -> str:
         return value.replace('\\n', '\n')
 
+class RouteReqImportContent(RouteReqPostContent):
+    images: list[str] = Field(
+        [],
+        title="images",
+        description="이미지 목록. http(s) URL은 그대로 사용하고, 그 외에는 zip 안의 파일 경로로 간주합니다.",
+    )
+    created_at: datetime | None = Field(None, title="created_at", description="원본 게시글 작성일 (없으면 현재 시각)")
+
+
+class RouteResImportResult(BaseModel):
+    line: int = Field(title="line", description="NDJSON 줄 번호 (1부터 시작)")
+    status: str = Field(title="status", description="created: 생성됨, failed: 실패")
+    post_number: int | None = Field(
+        None,
+        title="post_number",
+        description="생성된 게시글 Post Number. 커밋에 실패한 줄은 예약되었지만 쓰이지 않은 번호",
+    )
+    content_id: str | None = Field(None, title="content_id", description="생성된 게시글 ID")
+    error: str | None = Field(None, title="error", description="실패 사유")
+
+
 class DomainReqPostContent(BaseModel):
     post_number: int = Field(title="post_number", description="게시글 Post Number")
     title: str = Field(title="title", description="게시글 제목", min_length=1, max_length=200)
@@ -75,6 +96,37 @@ class RouteResGetContentList(BaseModel):
     total: int = Field(description="전체 게시글 수")
 
 
+class RouteResContentBatchItem(BaseModel):
+    post_number: int = Field(title="post_number", description="요청한 게시글 Post Number")
+    is_found: bool = Field(title="is_found", description="존재: True, 없거나 삭제됨: False")
+    content: RouteResGetContent | None = Field(None, title="content", description="게시글 (없으면 null)")
+
+
+class RouteResGetContentBatch(BaseModel):
+    data: list[RouteResContentBatchItem] = Field([], description="요청 순서대로 정렬된 게시글 목록")
+    count: int = Field(description="찾은 게시글 수")
+
+
+class RouteResSearchContent(BaseModel):
+    data: list[RouteResContentSummary] = Field([], description="검색 결과 게시글 요약 정보 (관련도 순)")
+    count: int = Field(description="현재 페이지 게시글 수")
+    next_cursor: str | None = Field(None, description="다음 페이지 커서 (마지막 페이지면 null)")
+
+
+class RouteResContentChange(BaseModel):
+    content_id: str = Field(title="content_id", description="게시글 ID")
+    post_number: int = Field(title="post_number", description="게시글 Post Number")
+    updated_at: datetime = Field(title="updated_at", description="게시글 최종 수정일")
+    is_deleted: bool = Field(False, title="is_deleted", description="삭제: True(tombstone), 미삭제: False")
+    content: RouteResGetContent | None = Field(None, title="content", description="게시글 (삭제된 경우 null)")
+
+
+class RouteResGetContentChanges(BaseModel):
+    data: list[RouteResContentChange] = Field([], description="since 이후 생성/수정/삭제된 게시글 (updated_at 순)")
+    next_token: str | None = Field(description="다음 요청에 since로 넘길 토큰")
+    has_more: bool = Field(description="이번 응답 이후에 바로 가져올 변경이 더 있는지 여부")
+
+
 class RouteReqPutContent(BaseModel):
     category: str | None = Field(description="Content category")
     title: str | None = Field(None, title="title", description="게시글 제목")
@@ -86,6 +138,11 @@ class RouteReqPutContent(BaseModel):
         min_length=1,
         max_length=10000
     )
+    updated_at: datetime | None = Field(
+        None,
+        title="updated_at",
+        description="클라이언트가 마지막으로 조회한 게시글 최종 수정일 (지정 시 다른 수정이 있었으면 409)",
+    )
 
     @field_validator("contents")
     @classmethod
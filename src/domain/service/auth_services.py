@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime
 
 import aiohttp
@@ -17,8 +18,11 @@ from domain.schema.auth_schemas import (
     RouteResUpdateUser,
 )
 from domain.service.token_services import create_user_tokens
+from utils.resilience_utils import call, remaining_budget
+from utils.tracing_utils import traced
 
 
+@traced("service_login_admin")
 async def service_login_admin(
     email: str,
     password: str,
@@ -28,7 +32,7 @@ async def service_login_admin(
         # Firebase Auth REST API를 통한 이메일/비밀번호 검증
         auth_url = f"https://identitytoolkit.googleapis.com/v1/accounts:signInWithPassword?key={settings.FIREBASE_WEB_API_KEY}"
 
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=remaining_budget())) as session:
             async with session.post(auth_url, json={
                 "email": email,
                 "password": password,
@@ -42,7 +46,7 @@ async def service_login_admin(
                 auth_data = await response.json()
                 user_id = auth_data["localId"]
 
-        admin_doc = await db.collection("users").document(user_id).get()
+        admin_doc = await call("firestore", "read", db.collection("users").document(user_id).get)
 
         if not admin_doc.exists:
             raise HTTPException(
@@ -72,6 +76,7 @@ async def service_login_admin(
         ) from e
 
 
+@traced("service_register_user")
 async def service_register_user(
     email: str,
     password: str,
@@ -79,9 +84,10 @@ async def service_register_user(
     db: AsyncClient,
 ) -> RouteResRegisterUser:
     try:
-        # Create user in Firebase Auth
+        # Create user in Firebase Auth (Admin SDK는 동기 HTTP 호출이므로 스레드에서 실행합니다)
         auth_client = get_auth_client()
-        user = auth_client.create_user(
+        user = await asyncio.to_thread(
+            auth_client.create_user,
             email=email,
             password=password,
             display_name=name
@@ -100,7 +106,7 @@ async def service_register_user(
         }
 
         # Firestore 비동기 작업으로 수정
-        await db.collection("users").document(user.uid).set(user_data)
+        await call("firestore", "write", db.collection("users").document(user.uid).set, user_data)
 
         return RouteResRegisterUser(
             email=email,
@@ -119,11 +125,12 @@ async def service_register_user(
         ) from e
 
 
+@traced("service_get_user")
 async def service_get_user(
     uid: str,
     db: AsyncClient,
 ) -> RouteResGetUser:
-    user_doc = await db.collection("users").document(uid).get()
+    user_doc = await call("firestore", "read", db.collection("users").document(uid).get)
     if not user_doc.exists:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -141,6 +148,7 @@ async def service_get_user(
     )
 
 
+@traced("service_update_user")
 async def service_update_user(
     uid: str,
     request: RouteReqUpdateUser,
@@ -160,7 +168,7 @@ async def service_update_user(
         NotFoundError: If user does not exist
     """
     user_ref = db.collection("users").document(uid)
-    user_doc = await user_ref.get()
+    user_doc = await call("firestore", "read", user_ref.get)
 
     if not user_doc.exists:
         raise HTTPException(
@@ -178,9 +186,9 @@ async def service_update_user(
 
     update_data["updated_at"] = datetime.now()
 
-    await user_ref.update(update_data)
+    await call("firestore", "write", user_ref.update, update_data)
 
-    updated_doc = await user_ref.get()
+    updated_doc = await call("firestore", "read", user_ref.get)
     user_data = updated_doc.to_dict()
 
     return RouteResUpdateUser(
@@ -194,12 +202,13 @@ async def service_update_user(
     )
 
 
+@traced("service_delete_user")
 async def service_delete_user(
     uid: str,
     db: AsyncClient,
 ) -> None:
     user_ref = db.collection("users").document(uid)
-    user_doc = await user_ref.get()
+    user_doc = await call("firestore", "read", user_ref.get)
 
     if not user_doc.exists:
         raise HTTPException(
@@ -208,6 +217,6 @@ async def service_delete_user(
         )
 
     # Firestore 비동기 업데이트로 수정
-    await user_ref.update({"is_deleted": True})
+    await call("firestore", "write", user_ref.update, {"is_deleted": True})
 
     return
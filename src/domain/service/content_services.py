@@ -1,23 +1,43 @@
-import time
-from datetime import datetime
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
 
 from fastapi import HTTPException, UploadFile, status
+from google.api_core.exceptions import GoogleAPICallError
 from google.cloud.firestore_v1.async_client import AsyncClient
 from google.cloud.firestore_v1.base_query import And, FieldFilter
 from zoneinfo import ZoneInfo
 
+from config import settings
 from domain.schema.content_schemas import (
+    ContentCategory,
     RouteReqPostContent,
     RouteReqPutContent,
+    RouteResContentBatchItem,
+    RouteResContentChange,
     RouteResContentSummary,
     RouteResGetContent,
+    RouteResGetContentBatch,
+    RouteResGetContentChanges,
     RouteResGetContentDetail,
     RouteResGetContentList,
+    RouteResSearchContent,
 )
+from domain.service.snapshot_services import snapshot_publisher
+from exception import InternalServerErrorException, ServiceUnavailableException
+from utils.cache_utils import response_cache
 from utils.crud_utils import FirestoreService
+from utils.event_utils import build_content_event, content_event_hub
+from utils.hedge_utils import hedged_read
 from utils.image_utils import ImageUploader
+from utils.resilience_utils import call
+from utils.search_utils import content_search_index
+from utils.shared_utils import decode_change_token, encode_change_token
+from utils.tracing_utils import set_span_attribute, traced
 
 
+@traced("service_get_content", attributes=("post_number",))
 async def service_get_content(
     post_number: int,
     db: AsyncClient,
@@ -42,6 +62,35 @@ async def service_get_content(
     return response
 
 
+@traced("service_get_content_batch")
+async def service_get_content_batch(
+    post_numbers: list[int],
+    db: AsyncClient,
+) -> RouteResGetContentBatch:
+    """여러 게시글을 쿼리 한 번으로 조회하고, 요청 순서대로 (없는 게시글은 is_found=False로) 반환합니다."""
+    set_span_attribute("count", len(post_numbers))
+    documents = await FirestoreService(db).get_documents_by_increment_ids("contents", "post_number", post_numbers)
+
+    items = []
+    for post_number in post_numbers:
+        content_data = documents.get(post_number)
+        items.append(RouteResContentBatchItem(
+            post_number=post_number,
+            is_found=content_data is not None,
+            content=None if content_data is None else RouteResGetContent(
+                content_id=content_data["document_id"],
+                **content_data
+            ),
+        ))
+
+    response = RouteResGetContentBatch(
+        data=items,
+        count=len(documents),
+    )
+    return response
+
+
+@traced("service_get_content_list", attributes=("page", "limit", "category"))
 async def service_get_content_list(
     page: int,
     limit: int,
@@ -49,31 +98,16 @@ async def service_get_content_list(
     db: AsyncClient,
 ) -> RouteResGetContentList:
     # Calculate offset for pagination
-    start_time = time.time()
     offset = (page - 1) * limit
 
     filters = [FieldFilter("is_deleted", "==", False)]
     if category:
         filters.append(FieldFilter("category", "==", category))
 
-    """query_start1 = time.time()
-    total_query = db.collection("contents").where(filter=And(filters))
-    aggregate_query = AsyncAggregationQuery(total_query)
-    aggregate_query.count(alias="total")
-    results = await aggregate_query.get()
-    total_count = results[0][0].value
-    query_end1 = time.time()
-
-    print(f"Query time: {query_end1 - query_start1} seconds")"""
-
-    query_start2 = time.time()
     count_query = db.collection("counters").document("contents")
-    count_doc = await count_query.get()
+    count_doc = await hedged_read("firestore.contents.count", lambda: call("firestore", "read", count_query.get))
     total_count = count_doc.to_dict()["count"]
-    query_end2 = time.time()
-    print(f"Query2 time: {query_end2 - query_start2} seconds")
 
-    query_start3 = time.time()
     # Get paginated contents using And filter
     contents_query = (
         db.collection("contents")
@@ -82,12 +116,8 @@ async def service_get_content_list(
         .offset(offset)
         .limit(limit)
     )
-    contents = await contents_query.get()
-    query_end3 = time.time()
-
-    print(f"Query3 time: {query_end3 - query_start3} seconds")
+    contents = await hedged_read("firestore.contents.list", lambda: call("firestore", "read", contents_query.get))
 
-    parse_start = time.time()
     content_list = [
         RouteResContentSummary(
             post_number=content_data["post_number"],
@@ -98,20 +128,16 @@ async def service_get_content_list(
         for content in contents
         if (content_data := content.to_dict())
     ]
-    parse_end = time.time()
-
-    print(f"Parse time: {parse_end - parse_start} seconds")
 
     response = RouteResGetContentList(
         data=content_list,
         count=len(content_list),
         total=total_count
     )
-    total_time = time.time() - start_time
-    print(f"Total time: {total_time} seconds")
     return response
 
 
+@traced("service_create_content")
 async def service_create_content(
     content: RouteReqPostContent,
     images: list[UploadFile],
@@ -136,16 +162,18 @@ async def service_create_content(
         "images": image_urls,  # 업로드된 이미지 URL 목록 저장
     })
 
-    # Create document with auto-increment ID
-    result = await FirestoreService(db).create_document_with_increment_id("contents", "post_number", content_data)
-    if result is None:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to create content"
-        )
+    # Create document with auto-increment ID (카운터 증가와 문서 쓰기를 한 번에 커밋)
+    try:
+        result = await FirestoreService(db).create_document_with_increment_id("contents", "post_number", content_data)
+    except GoogleAPICallError as e:
+        raise InternalServerErrorException(e) from e
 
     # Update content data with the generated ID
     content_data["post_number"] = result["post_number"]
+    set_span_attribute("post_number", result["post_number"])
+    content_search_index.upsert(result["post_number"], content_data)
+    snapshot_publisher.schedule(result["post_number"], [content.category.value])
+    response_cache.invalidate()
 
     response = RouteResGetContent(
         content_id=result["document_id"],
@@ -154,34 +182,15 @@ async def service_create_content(
     return response
 
 
+@traced("service_update_content", attributes=("post_number",))
 async def service_update_content(
     post_number: int,
     request: RouteReqPutContent,
     db: AsyncClient,
 ) -> RouteResGetContent:
-    # Query for the document with matching post_number and not deleted
-    contents_query = (
-        db.collection("contents")
-        .where(
-            filter=And([
-                FieldFilter("post_number", "==", post_number),
-                FieldFilter("is_deleted", "==", False)
-            ])
-        )
-        .limit(1)
-    )
-    contents = await contents_query.get()
-
-    if not contents or len(contents) == 0:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Content not found"
-        )
-
-    content_doc = contents[0]
     # Exclude None values, empty strings, and empty lists from the update
     content_data = {
-        key: value for key, value in request.model_dump(exclude_unset=True).items()
+        key: value for key, value in request.model_dump(exclude_unset=True, exclude={"updated_at"}).items()
         if value is not None and value != "" and value != []
     }
 
@@ -190,49 +199,57 @@ async def service_update_content(
         content_data.update({
             "updated_at": datetime.now(ZoneInfo("Asia/Seoul")),
         })
-        # Update using the correct document reference with await
-        await db.collection("contents").document(content_doc.id).update(content_data)
 
-    # Get the updated document
-    updated_doc = await db.collection("contents").document(content_doc.id).get()
+    # 조회와 수정을 하나의 트랜잭션으로 처리하고, 병합된 문서로 응답을 만듭니다
+    updated_data = await FirestoreService(db).update_document_by_increment_id(
+        "contents", "post_number", post_number, content_data, expected_updated_at=request.updated_at
+    )
+    if updated_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Content not found"
+        )
+    content_search_index.upsert(post_number, updated_data)
+    # 카테고리가 바뀌었으면 이전 카테고리 목록도 다시 만들어야 하므로 모든 목록을 갱신
+    changed_categories = (
+        [category.value for category in ContentCategory] if "category" in content_data else [updated_data["category"]]
+    )
+    snapshot_publisher.schedule(post_number, changed_categories)
+    response_cache.invalidate()
 
     response = RouteResGetContent(
-        content_id=content_doc.id,
-        **updated_doc.to_dict()
+        content_id=updated_data.pop("document_id"),
+        **updated_data
     )
     return response
 
 
+@traced("service_delete_content", attributes=("post_number",))
 async def service_delete_content(
     post_number: int,
     db: AsyncClient,
+    expected_updated_at: datetime | None = None,
 ) -> None:
-    # Query for the document with matching post_number and not deleted
-    contents_query = (
-        db.collection("contents")
-        .where(
-            filter=And([
-                FieldFilter("post_number", "==", post_number),
-                FieldFilter("is_deleted", "==", False)
-            ])
-        )
-        .limit(1)
+    deleted_data = await FirestoreService(db).update_document_by_increment_id(
+        "contents",
+        "post_number",
+        post_number,
+        {"is_deleted": True, "updated_at": datetime.now(ZoneInfo("Asia/Seoul"))},
+        expected_updated_at=expected_updated_at,
     )
-    contents = await contents_query.get()
-
-    if not contents or len(contents) == 0:
+    if deleted_data is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Content not found"
         )
-
-    content_doc = contents[0]
-    # Update using the correct document reference with await
-    await db.collection("contents").document(content_doc.id).update({"is_deleted": True})
+    content_search_index.remove(post_number, deleted_data["updated_at"])
+    snapshot_publisher.schedule(post_number, [deleted_data["category"]])
+    response_cache.invalidate()
 
     return
 
 
+@traced("service_get_content_detail", attributes=("post_number",))
 async def service_get_content_detail(
     post_number: int,
     db: AsyncClient,
@@ -248,7 +265,7 @@ async def service_get_content_detail(
         )
         .limit(1)
     )
-    contents = await contents_query.get()
+    contents = await call("firestore", "read", contents_query.get)
 
     if not contents or len(contents) == 0:
         raise HTTPException(
@@ -271,3 +288,168 @@ async def service_get_content_detail(
         category=content_data["category"],
     )
     return response
+
+
+@traced("service_get_content_changes", attributes=("limit",))
+async def service_get_content_changes(
+    since: str | None,
+    limit: int,
+    db: AsyncClient,
+) -> RouteResGetContentChanges:
+    """
+    since 토큰 이후에 생성/수정/삭제된 게시글을 updated_at 순으로 반환합니다.
+    삭제된 게시글은 내용 없이 is_deleted=True인 tombstone으로 전달합니다.
+    """
+    # 아직 커밋 중일 수 있는 최근 쓰기는 제외해서, 토큰이 늦게 커밋된 변경을 건너뛰지 않게 합니다
+    settled_until = datetime.now(timezone.utc) - timedelta(seconds=settings.CHANGE_FEED_SETTLE_SECONDS)
+    changes_query = (
+        db.collection("contents")
+        .where(filter=FieldFilter("updated_at", "<=", settled_until))
+        .order_by("updated_at")
+        .order_by("__name__")
+        .limit(limit + 1)
+    )
+    if since:
+        try:
+            since_updated_at, since_document_id = decode_change_token(since)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid since token"
+            ) from e
+        changes_query = changes_query.start_after({"updated_at": since_updated_at, "__name__": since_document_id})
+
+    documents = await call("firestore", "read", changes_query.get)
+    has_more = len(documents) > limit
+    documents = documents[:limit]
+
+    changes = []
+    for document in documents:
+        content_data = document.to_dict()
+        is_deleted = content_data.get("is_deleted", False)
+        changes.append(RouteResContentChange(
+            content_id=document.id,
+            post_number=content_data["post_number"],
+            updated_at=content_data["updated_at"],
+            is_deleted=is_deleted,
+            content=None if is_deleted else RouteResGetContent(content_id=document.id, **content_data),
+        ))
+
+    next_token = since
+    if documents:
+        next_token = encode_change_token(documents[-1].get("updated_at"), documents[-1].id)
+
+    response = RouteResGetContentChanges(
+        data=changes,
+        next_token=next_token,
+        has_more=has_more,
+    )
+    return response
+
+
+@traced("service_search_content", attributes=("category", "limit"))
+async def service_search_content(
+    query: str,
+    category: str | None,
+    limit: int,
+    cursor: str | None,
+) -> RouteResSearchContent:
+    """프로세스 내 역색인으로 게시글 제목/내용을 검색합니다. Firestore를 조회하지 않습니다."""
+    if not settings.SEARCH_INDEX_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Search is disabled on this server"
+        )
+    # 색인을 만드는 중에는 일부 게시글만 검색되므로 빈 결과 대신 503으로 나중에 다시 요청하게 합니다
+    if not content_search_index.is_ready:
+        raise ServiceUnavailableException("Search index is still being built", retry_after=5)
+    try:
+        results, next_cursor = content_search_index.search(query, category=category, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        ) from e
+
+    response = RouteResSearchContent(
+        data=[RouteResContentSummary(**summary) for summary in results],
+        count=len(results),
+        next_cursor=next_cursor,
+    )
+    return response
+
+
+def _format_sse(event: dict[str, object]) -> str:
+    data = json.dumps(event["data"], ensure_ascii=False)
+    # id가 없는 이벤트(reset)는 클라이언트의 Last-Event-ID를 바꾸지 않습니다
+    id_line = f"id: {event['id']}\n" if event["id"] is not None else ""
+    return f"{id_line}event: {event['type']}\ndata: {data}\n\n"
+
+
+async def _load_missed_events(
+    last_event_id: str,
+    category: str | None,
+    db: AsyncClient,
+) -> list[dict[str, object]]:
+    """hub history에 없는 Last-Event-ID 이후의 변경을 Firestore에서 다시 읽어옵니다."""
+    try:
+        since_updated_at, since_document_id = decode_change_token(last_event_id)
+    except ValueError:
+        return []
+
+    missed_query = (
+        db.collection("contents")
+        .where(filter=FieldFilter("updated_at", ">=", since_updated_at))
+        .order_by("updated_at")
+        .order_by("__name__")
+        .start_after({"updated_at": since_updated_at, "__name__": since_document_id})
+        .limit(settings.SSE_RESUME_LIMIT)
+    )
+    documents = await call("firestore", "read", missed_query.get)
+    # 놓친 변경은 변경 종류를 알 수 없으므로, 만들어진 뒤 수정되지 않은 문서를 새 글로 봅니다
+    events = [
+        build_content_event(document.id, document.to_dict(), document.create_time == document.update_time)
+        for document in documents
+    ]
+    return [event for event in events if category is None or event["category"] == category]
+
+
+async def service_stream_content_events(
+    category: str | None,
+    last_event_id: str | None,
+    db: AsyncClient,
+) -> AsyncIterator[str]:
+    """
+    게시글 create/update/delete 이벤트를 Server-Sent Events 형식으로 스트리밍합니다.
+    Last-Event-ID가 있으면 그 이후의 이벤트를 먼저 보내고, 이벤트가 없을 때는 heartbeat 주석을 보냅니다.
+    """
+    # backlog를 읽는 동안 들어오는 이벤트를 놓치지 않도록 먼저 구독합니다
+    subscriber = content_event_hub.subscribe(category)
+    try:
+        yield f"retry: {settings.SSE_RETRY_MILLISECONDS}\n\n"
+
+        last_sort_key = None
+        if last_event_id:
+            backlog = content_event_hub.events_after(last_event_id, category)
+            if backlog is None:
+                backlog = await _load_missed_events(last_event_id, category, db)
+            for event in backlog:
+                yield _format_sse(event)
+                last_sort_key = event["sort_key"]
+
+        while True:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+
+            # 느린 구독자로 정리된 경우 스트림을 끝내고 클라이언트가 재접속하게 합니다
+            if event is None:
+                return
+            # backlog로 이미 보낸 이벤트는 건너뜀
+            if last_sort_key is not None and event["sort_key"] is not None and event["sort_key"] <= last_sort_key:
+                continue
+            yield _format_sse(event)
+    finally:
+        content_event_hub.unsubscribe(subscriber)
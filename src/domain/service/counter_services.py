@@ -1,48 +1,30 @@
 # services/counter_service.py
-import asyncio
-
-from google.api_core.exceptions import GoogleAPICallError, RetryError
 from google.cloud.firestore_v1.async_client import AsyncClient
+from google.cloud.firestore_v1.async_transaction import AsyncTransaction
+
+from utils.resilience_utils import call
+from utils.tracing_utils import traced
 
 
-async def get_async_next_id(
+@traced("reserve_async_ids", attributes=("collection_name", "count"))
+async def reserve_async_ids(
     collection_name: str,
     db: AsyncClient,
-) -> int | None:
-    counter_ref = db.collection("counters").document(collection_name)
-    max_retries = 5
-    base_delay = 0.1  # 100ms
-    async def attempt_transaction() -> int:
-        transaction = db.transaction()
-        await transaction._begin()
+    transaction: AsyncTransaction,
+    count: int = 1,
+) -> int:
+    """
+    주어진 트랜잭션 안에서 컬렉션 카운터를 count만큼 증가시키고, 예약된 구간의 첫 번째 ID를 반환합니다.
+    커밋은 호출한 쪽의 트랜잭션과 함께 이루어지므로 문서 쓰기가 실패하면 ID도 소모되지 않습니다.
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
 
-        # Get the current counter value
-        snapshot = await counter_ref.get(transaction=transaction)
-        if snapshot.exists:
-            current_count = snapshot.to_dict().get('count', 0)
-            next_id = current_count + 1
-            transaction.update(counter_ref, {"count": next_id})
-        else:
-            next_id = 1
-            transaction.set(counter_ref, {"count": next_id})
+    counter_ref = db.collection("counters").document(collection_name)
 
-        # Commit the transaction
-        await transaction._commit()
-        return next_id
+    # Get the current counter value
+    snapshot = await call("firestore", "read", counter_ref.get, transaction=transaction)
+    current_count = snapshot.to_dict().get("count", 0) if snapshot.exists else 0
 
-    for attempt in range(max_retries):
-        try:
-            return await attempt_transaction()
-        except (GoogleAPICallError, RetryError) as e:
-            # Handle specific Firestore exceptions
-            if attempt == max_retries - 1:
-                print(f"Firestore transaction error after {max_retries} attempts: {e}")
-                return None
-            # Exponential backoff with jitter
-            delay = base_delay * (2 ** attempt) * (0.5 + asyncio.random.random())
-            await asyncio.sleep(delay)
-        except Exception as e:
-            # Handle any other exceptions
-            print(f"Unexpected error: {e}")
-            return None
-    return None
+    transaction.set(counter_ref, {"count": current_count + count}, merge=True)
+    return current_count + 1
@@ -0,0 +1,65 @@
+import json
+import zlib
+from collections.abc import AsyncIterator
+
+from fastapi.encoders import jsonable_encoder
+from google.cloud.firestore_v1.async_client import AsyncClient
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from config import settings
+from utils.resilience_utils import call
+
+
+async def service_export_contents(
+    db: AsyncClient,
+    after: int | None = None,
+    include_deleted: bool = False,
+    is_gzip: bool = False,
+) -> AsyncIterator[bytes]:
+    """
+    contents 컬렉션을 post_number 오름차순으로 읽어 NDJSON으로 스트리밍합니다.
+
+    EXPORT_CHUNK_SIZE개씩 읽고 마지막 post_number 다음부터 이어 읽기 때문에,
+    컬렉션 크기와 관계없이 메모리 사용량이 일정합니다.
+    청크마다 circuit breaker와 호출 timeout 아래에서 읽으므로, 백엔드 장애 시 스트림이 멈춰 있지 않고 끊깁니다.
+    각 줄에 post_number가 포함되므로 중단된 경우 마지막 post_number를 after로 넘겨 이어받을 수 있습니다.
+
+    Args:
+        db: Firestore client
+        after: 이 post_number 다음 게시글부터 내보냅니다.
+        include_deleted: 삭제된 게시글 포함 여부
+        is_gzip: gzip 압축 여부
+    """
+    cursor = after or 0
+    compressor = zlib.compressobj(wbits=31) if is_gzip else None  # wbits=31: gzip 포맷
+
+    while True:
+        query = (
+            db.collection("contents")
+            .where(filter=FieldFilter("post_number", ">", cursor))
+            .order_by("post_number")
+            .limit(settings.EXPORT_CHUNK_SIZE)
+        )
+
+        documents = await call("firestore", "read", query.get)
+        lines = []
+        for document in documents:
+            content_data = document.to_dict()
+            cursor = content_data["post_number"]
+            if content_data.get("is_deleted") and not include_deleted:
+                continue
+            content_data["content_id"] = document.id
+            lines.append(json.dumps(jsonable_encoder(content_data), ensure_ascii=False) + "\n")
+
+        chunk = "".join(lines).encode()
+        if compressor is not None:
+            # 청크마다 flush해서 압축 중에도 바로 전송되게 합니다
+            chunk = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if chunk:
+            yield chunk
+
+        if len(documents) < settings.EXPORT_CHUNK_SIZE:
+            break
+
+    if compressor is not None:
+        yield compressor.flush()
@@ -0,0 +1,303 @@
+import asyncio
+import mimetypes
+import random
+import shutil
+import tempfile
+import zipfile
+from collections.abc import AsyncIterator
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from fastapi import HTTPException, UploadFile, status
+from google.api_core.exceptions import Aborted, GoogleAPICallError, ServiceUnavailable
+from google.cloud.firestore_v1.async_client import AsyncClient
+from pydantic import ValidationError
+
+from config import settings
+from domain.schema.content_schemas import RouteReqImportContent, RouteResImportResult
+from domain.service.snapshot_services import snapshot_publisher
+from utils.cache_utils import response_cache
+from utils.crud_utils import FirestoreService
+from utils.image_utils import ImageUploader
+from utils.resilience_utils import call
+from utils.search_utils import content_search_index
+from utils.tracing_utils import set_span_attribute, traced
+
+
+class ImportArchive:
+    """
+    업로드된 NDJSON 또는 zip 파일.
+    요청 처리가 끝나면 UploadFile이 닫히므로, 스트리밍 응답 동안 읽을 수 있도록 임시 파일로 복사해 둡니다.
+    """
+
+    def __init__(self, lines: list[tuple[int, str]], spool, zip_file: zipfile.ZipFile | None):
+        self.lines = lines
+        self.spool = spool
+        self.zip_file = zip_file
+
+    async def read_image(self, path: str) -> bytes:
+        if self.zip_file is None:
+            raise KeyError(path)
+        try:
+            # 압축 해제는 이벤트 루프를 막지 않도록 스레드에서 합니다 (ZipFile은 스레드 간 읽기를 직렬화합니다)
+            return await asyncio.to_thread(self.zip_file.read, path.lstrip("/"))
+        except KeyError as e:
+            raise KeyError(path) from e
+
+    def close(self) -> None:
+        if self.zip_file is not None:
+            self.zip_file.close()
+        self.spool.close()
+
+
+def _bad_request(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def _dump_result(result: RouteResImportResult) -> str:
+    return result.model_dump_json() + "\n"
+
+
+def _read_records(spool) -> tuple[zipfile.ZipFile | None, bytes]:
+    """
+    업로드 파일에서 NDJSON 바이트를 읽습니다. zip이면 압축을 풀기 전에 항목 수와 압축 해제 크기 합계를 확인합니다.
+    ZipFile은 각 항목을 선언된 file_size까지만 풀기 때문에, 선언된 크기 합계가 실제로 풀리는 크기의 상한입니다.
+    압축하지 않은 NDJSON도 같은 크기 제한을 넘으면 메모리로 읽지 않습니다.
+    """
+    if not zipfile.is_zipfile(spool):
+        if spool.seek(0, 2) > settings.IMPORT_MAX_UNCOMPRESSED_BYTES:
+            raise _bad_request(
+                f"Import file is too large. Maximum allowed: {settings.IMPORT_MAX_UNCOMPRESSED_BYTES} bytes"
+            )
+        spool.seek(0)
+        return None, spool.read()
+
+    zip_file = zipfile.ZipFile(spool)
+    try:
+        infos = zip_file.infolist()
+        if len(infos) > settings.IMPORT_MAX_ZIP_ENTRIES:
+            raise _bad_request(f"Too many files in zip archive. Maximum allowed: {settings.IMPORT_MAX_ZIP_ENTRIES}")
+        if sum(info.file_size for info in infos) > settings.IMPORT_MAX_UNCOMPRESSED_BYTES:
+            raise _bad_request(
+                f"Zip archive is too large when uncompressed. Maximum allowed: "
+                f"{settings.IMPORT_MAX_UNCOMPRESSED_BYTES} bytes"
+            )
+        ndjson_names = sorted(info.filename for info in infos if info.filename.endswith((".ndjson", ".jsonl")))
+        if not ndjson_names:
+            raise _bad_request("Zip archive must contain a .ndjson or .jsonl file")
+        return zip_file, zip_file.read(ndjson_names[0])
+    except Exception:
+        zip_file.close()
+        raise
+
+
+async def service_prepare_import(archive: UploadFile) -> ImportArchive:
+    """업로드 파일을 검증하고 NDJSON 레코드 줄 목록을 읽어 둡니다."""
+    if archive is None:
+        raise _bad_request("Import file is required")
+
+    spool = tempfile.TemporaryFile()
+    await asyncio.to_thread(shutil.copyfileobj, archive.file, spool)
+    spool.seek(0)
+
+    zip_file = None
+    try:
+        zip_file, raw = await asyncio.to_thread(_read_records, spool)
+        try:
+            text = raw.decode("utf-8-sig")
+        except UnicodeDecodeError as e:
+            raise _bad_request("Import file must be UTF-8 encoded") from e
+    except Exception:
+        if zip_file is not None:
+            zip_file.close()
+        spool.close()
+        raise
+
+    lines = [(line_no, line) for line_no, line in enumerate(text.splitlines(), start=1) if line.strip()]
+    if len(lines) > settings.IMPORT_MAX_RECORDS:
+        if zip_file is not None:
+            zip_file.close()
+        spool.close()
+        raise _bad_request(f"Too many records. Maximum allowed: {settings.IMPORT_MAX_RECORDS}")
+
+    return ImportArchive(lines, spool, zip_file)
+
+
+async def _upload_record_images(
+    line_no: int,
+    record: RouteReqImportContent,
+    archive: ImportArchive,
+    image_uploader: ImageUploader,
+    semaphore: asyncio.Semaphore,
+) -> tuple[int, RouteReqImportContent, list[str], str | None]:
+    async def upload(image: str) -> str:
+        if image.startswith(("http://", "https://")):
+            return image
+        data = await archive.read_image(image)
+        content_type = mimetypes.guess_type(image)[0]
+        return await image_uploader.upload_image_bytes(image.rsplit("/", 1)[-1], content_type, data)
+
+    # 동시에 메모리에 올라가는 이미지 수를 제한하기 위해 레코드 단위로 세마포어를 잡습니다
+    async with semaphore:
+        try:
+            image_urls = await asyncio.gather(*(upload(image) for image in record.images))
+        except KeyError as e:
+            return line_no, record, [], f"Image not found in archive: {e.args[0]}"
+        except HTTPException as e:
+            return line_no, record, [], str(e.detail)
+        except Exception as e:
+            return line_no, record, [], f"Failed to upload image: {e}"
+    return line_no, record, list(image_urls), None
+
+
+async def _commit_batch(db: AsyncClient, writes: list[tuple[object, dict[str, object]]]) -> None:
+    """
+    batch를 커밋합니다. 문서 ID를 미리 정해 두고 set하므로, 일시적인 오류로 다시 커밋해도 문서가 한 번만 생깁니다.
+    재시도하지 않으면 예약해 둔 post_number 구간이 빈 번호로 남습니다.
+    """
+    for attempt in range(settings.IMPORT_COMMIT_ATTEMPTS):
+        batch = db.batch()
+        for doc_ref, content_data in writes:
+            batch.set(doc_ref, content_data)
+        try:
+            await call("firestore", "write", batch.commit)
+            return
+        except (Aborted, ServiceUnavailable):
+            if attempt == settings.IMPORT_COMMIT_ATTEMPTS - 1:
+                raise
+            await asyncio.sleep(0.1 * (2 ** attempt) * (0.5 + random.random()))
+
+
+@traced("import.commit_chunk")
+async def _commit_chunk(
+    db: AsyncClient,
+    chunk: list[tuple[int, int, dict[str, object]]],
+    semaphore: asyncio.Semaphore,
+) -> list[RouteResImportResult]:
+    set_span_attribute("records", len(chunk))
+    writes = [(db.collection("contents").document(), content_data) for _, _, content_data in chunk]
+
+    async with semaphore:
+        try:
+            await _commit_batch(db, writes)
+        except (GoogleAPICallError, HTTPException) as e:
+            # 예약한 post_number는 다시 쓰이지 않으므로, 실패한 줄마다 비게 된 번호를 함께 알려줍니다
+            return [
+                RouteResImportResult(
+                    line=line_no,
+                    status="failed",
+                    post_number=post_number,
+                    error=f"{e} (reserved post_number {post_number} was not used)",
+                )
+                for line_no, post_number, _ in chunk
+            ]
+
+    for _, post_number, content_data in chunk:
+        content_search_index.upsert(post_number, content_data)
+        snapshot_publisher.schedule(post_number, [content_data["category"]])
+    response_cache.invalidate()
+
+    return [
+        RouteResImportResult(line=line_no, status="created", post_number=post_number, content_id=doc_ref.id)
+        for (line_no, post_number, _), (doc_ref, _) in zip(chunk, writes, strict=True)
+    ]
+
+
+def _parse_records(
+    lines: list[tuple[int, str]],
+) -> tuple[list[tuple[int, RouteReqImportContent]], list[RouteResImportResult]]:
+    """NDJSON 줄을 검증해 (유효한 레코드, 검증에 실패한 줄의 결과)로 나눕니다."""
+    records = []
+    failures = []
+    for line_no, line in lines:
+        try:
+            records.append((line_no, RouteReqImportContent.model_validate_json(line)))
+        except ValidationError as e:
+            error = "; ".join(
+                f"{'.'.join(map(str, err['loc']))}: {err['msg']}" if err["loc"] else err["msg"]
+                for err in e.errors()
+            )
+            failures.append(RouteResImportResult(line=line_no, status="failed", error=error))
+    return records, failures
+
+
+def _build_documents(
+    prepared: list[tuple[int, RouteReqImportContent, list[str]]],
+    first_post_number: int,
+) -> list[tuple[int, int, dict[str, object]]]:
+    """예약한 post_number 구간을 파일 순서대로 부여해 (줄 번호, post_number, 문서 데이터) 목록을 만듭니다."""
+    now = datetime.now(ZoneInfo("Asia/Seoul"))
+    documents = []
+    for post_number, (line_no, record, image_urls) in enumerate(prepared, start=first_post_number):
+        content_data = record.model_dump(exclude={"images", "created_at"})
+        content_data.update({
+            "post_number": post_number,
+            "created_at": record.created_at or now,
+            "updated_at": now,
+            "is_deleted": False,
+            "images": image_urls,
+        })
+        documents.append((line_no, post_number, content_data))
+    return documents
+
+
+async def service_import_contents(
+    archive: ImportArchive,
+    db: AsyncClient,
+    image_uploader: ImageUploader,
+) -> AsyncIterator[str]:
+    """
+    NDJSON 레코드를 게시글로 일괄 생성하고, 레코드별 결과를 NDJSON 한 줄씩 스트리밍합니다.
+
+    1. 레코드를 검증하고 이미지를 동시에 업로드합니다.
+    2. 성공한 레코드 수만큼 post_number 구간을 카운터 트랜잭션 한 번으로 예약합니다.
+    3. 문서를 500개 단위 batch로 나누어 제한된 동시성으로 커밋합니다.
+    """
+    tasks: list[asyncio.Task] = []
+    try:
+        records, failures = _parse_records(archive.lines)
+        for result in failures:
+            yield _dump_result(result)
+
+        # 1. 이미지 업로드
+        image_semaphore = asyncio.Semaphore(settings.IMAGE_UPLOAD_CONCURRENCY * 2)
+        tasks = [
+            asyncio.create_task(_upload_record_images(line_no, record, archive, image_uploader, image_semaphore))
+            for line_no, record in records
+        ]
+        prepared = []
+        for task in asyncio.as_completed(tasks):
+            line_no, record, image_urls, error = await task
+            if error is not None:
+                yield _dump_result(RouteResImportResult(line=line_no, status="failed", error=error))
+                continue
+            prepared.append((line_no, record, image_urls))
+
+        if not prepared:
+            return
+
+        # 2. post_number 구간 예약 (파일 순서대로 부여)
+        prepared.sort(key=lambda item: item[0])
+        try:
+            first_post_number = await FirestoreService(db).allocate_increment_ids("contents", len(prepared))
+        except (GoogleAPICallError, HTTPException) as e:
+            # circuit breaker 열림(503)/deadline 초과(504)도 실패 결과로 내보내야 스트림이 중간에 끊기지 않습니다
+            for line_no, _, _ in prepared:
+                yield _dump_result(RouteResImportResult(line=line_no, status="failed", error=str(e)))
+            return
+
+        # 3. batch 커밋
+        documents = _build_documents(prepared, first_post_number)
+        batch_semaphore = asyncio.Semaphore(settings.IMPORT_BATCH_CONCURRENCY)
+        tasks = [
+            asyncio.create_task(_commit_chunk(db, documents[i:i + settings.IMPORT_BATCH_SIZE], batch_semaphore))
+            for i in range(0, len(documents), settings.IMPORT_BATCH_SIZE)
+        ]
+        for task in asyncio.as_completed(tasks):
+            for result in await task:
+                yield _dump_result(result)
+    finally:
+        # 클라이언트 연결이 끊기면 남은 작업을 정리합니다
+        for task in tasks:
+            task.cancel()
+        archive.close()
@@ -0,0 +1,202 @@
+import asyncio
+import hashlib
+import json
+import logging
+
+from google.cloud.firestore_v1.async_client import AsyncClient
+from google.cloud.firestore_v1.base_query import And, FieldFilter
+
+from config import settings
+from database import get_async_firestore_client
+from domain.schema.content_schemas import (
+    ContentCategory,
+    RouteResContentSummary,
+    RouteResGetContent,
+    RouteResGetContentList,
+)
+from utils.crud_utils import FirestoreService
+from utils.logging_utils import logging_manager
+from utils.resilience_utils import call
+from utils.snapshot_utils import GCSSnapshotStorage, LocalSnapshotStorage, get_snapshot_storage
+
+logger = logging.getLogger(__name__)
+
+SnapshotStorage = GCSSnapshotStorage | LocalSnapshotStorage
+
+ALL_CATEGORIES = "all"
+
+
+def content_snapshot_path(post_number: int) -> str:
+    return f"{settings.SNAPSHOT_PREFIX}/content/{post_number}.json"
+
+
+def list_snapshot_path(category: str, page: int) -> str:
+    return f"{settings.SNAPSHOT_PREFIX}/list/{category}/{page}.json"
+
+
+def _list_meta_path(category: str) -> str:
+    return f"{settings.SNAPSHOT_PREFIX}/list/{category}/meta.json"
+
+
+async def publish_content_snapshot(
+    post_number: int,
+    db: AsyncClient,
+    snapshot_storage: SnapshotStorage,
+) -> None:
+    """게시글 하나를 GET /content/{post_number}와 같은 JSON으로 저장합니다. 삭제된 게시글은 파일을 지웁니다."""
+    content_data = await FirestoreService(db).get_document_by_increment_id("contents", "post_number", post_number)
+    if content_data is None:
+        await snapshot_storage.delete(content_snapshot_path(post_number))
+        return
+
+    content = RouteResGetContent(content_id=content_data.pop("document_id"), **content_data)
+    await snapshot_storage.write(content_snapshot_path(post_number), content.model_dump_json().encode())
+
+
+async def publish_list_snapshots(
+    category: str,
+    db: AsyncClient,
+    snapshot_storage: SnapshotStorage,
+) -> None:
+    """
+    카테고리 목록을 GET /content?page=N&limit=SNAPSHOT_PAGE_SIZE와 같은 JSON 페이지들로 저장합니다.
+    category가 "all"이면 전체 목록입니다. 목록이 줄어들어 남게 된 이전 페이지는 지웁니다.
+    meta.json에 페이지별 해시를 남겨 두고, 내용이 바뀐 페이지만 다시 업로드합니다.
+    """
+    filters = [FieldFilter("is_deleted", "==", False)]
+    if category != ALL_CATEGORIES:
+        filters.append(FieldFilter("category", "==", category))
+
+    count_doc = await call("firestore", "read", db.collection("counters").document("contents").get)
+    total_count = count_doc.to_dict()["count"] if count_doc.exists else 0
+
+    contents_query = (
+        db.collection("contents")
+        .where(filter=And(filters))
+        .order_by("post_number", direction="DESCENDING")
+    )
+
+    previous_meta = await snapshot_storage.read(_list_meta_path(category))
+    previous_meta = json.loads(previous_meta) if previous_meta else {}
+    # 해시가 없는 이전 형식의 meta면 모든 페이지를 다시 씁니다
+    previous_hashes = previous_meta.get("hashes", [])
+
+    page = 0
+    page_hashes: list[str] = []
+    summaries: list[RouteResContentSummary] = []
+
+    async def write_page() -> None:
+        response = RouteResGetContentList(data=summaries, count=len(summaries), total=total_count)
+        data = response.model_dump_json().encode()
+        page_hash = hashlib.sha256(data).hexdigest()
+        page_hashes.append(page_hash)
+        if page > len(previous_hashes) or previous_hashes[page - 1] != page_hash:
+            await snapshot_storage.write(list_snapshot_path(category, page), data)
+
+    async for content in contents_query.stream():
+        content_data = content.to_dict()
+        summaries.append(RouteResContentSummary(
+            post_number=content_data["post_number"],
+            title=content_data["title"],
+            first_image=content_data["images"][0] if content_data["images"] else "",
+            category=content_data["category"],
+        ))
+        if len(summaries) == settings.SNAPSHOT_PAGE_SIZE:
+            page += 1
+            await write_page()
+            summaries = []
+
+    # 마지막 페이지 (게시글이 없으면 빈 1페이지)
+    if summaries or page == 0:
+        page += 1
+        await write_page()
+
+    previous_pages = previous_meta.get("pages", page)
+    for stale_page in range(page + 1, previous_pages + 1):
+        await snapshot_storage.delete(list_snapshot_path(category, stale_page))
+    await snapshot_storage.write(_list_meta_path(category), json.dumps({"pages": page, "hashes": page_hashes}).encode())
+
+
+async def rebuild_all_snapshots(db: AsyncClient, snapshot_storage: SnapshotStorage) -> None:
+    """모든 게시글과 모든 카테고리 목록 스냅샷을 다시 만듭니다."""
+    async for document in db.collection("contents").stream():
+        content_data = document.to_dict()
+        if content_data.get("is_deleted"):
+            await snapshot_storage.delete(content_snapshot_path(content_data["post_number"]))
+        else:
+            content = RouteResGetContent(content_id=document.id, **content_data)
+            await snapshot_storage.write(
+                content_snapshot_path(content_data["post_number"]), content.model_dump_json().encode()
+            )
+
+    for category in [ALL_CATEGORIES, *(category.value for category in ContentCategory)]:
+        await publish_list_snapshots(category, db, snapshot_storage)
+
+
+class SnapshotPublisher:
+    """
+    게시글 변경을 모아 두었다가 SNAPSHOT_DEBOUNCE_SECONDS 뒤에 한 번에 스냅샷을 갱신합니다.
+    연속된 수정이 같은 목록 페이지를 여러 번 다시 쓰지 않게 합니다.
+    """
+
+    def __init__(self, debounce_seconds: float = settings.SNAPSHOT_DEBOUNCE_SECONDS):
+        self.debounce_seconds = debounce_seconds
+        self.dirty_post_numbers: set[int] = set()
+        self.dirty_categories: set[str] = set()
+        self._flush_task: asyncio.Task | None = None
+
+    def schedule(self, post_number: int, categories: list[str | ContentCategory]) -> None:
+        if not settings.SNAPSHOT_ENABLED:
+            return
+        self.dirty_post_numbers.add(post_number)
+        self.dirty_categories.update([ALL_CATEGORIES, *(ContentCategory(category).value for category in categories)])
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        # flush 중에 schedule()된 변경은 이 작업이 살아 있어 새 작업을 만들지 않으므로,
+        # 남은 변경이 없을 때까지 반복합니다
+        while self.dirty_post_numbers or self.dirty_categories:
+            await asyncio.sleep(self.debounce_seconds)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Snapshot publish failed")
+
+    async def flush(self) -> None:
+        post_numbers, self.dirty_post_numbers = self.dirty_post_numbers, set()
+        categories, self.dirty_categories = self.dirty_categories, set()
+        if not post_numbers and not categories:
+            return
+
+        try:
+            db = get_async_firestore_client()
+            snapshot_storage = await get_snapshot_storage()
+            await asyncio.gather(
+                *(publish_content_snapshot(post_number, db, snapshot_storage) for post_number in post_numbers),
+                *(publish_list_snapshots(category, db, snapshot_storage) for category in categories),
+            )
+        except Exception:
+            # 실패한 갱신은 다음 flush에서 다시 시도합니다 (같은 스냅샷을 다시 써도 결과는 같습니다)
+            self.dirty_post_numbers.update(post_numbers)
+            self.dirty_categories.update(categories)
+            raise
+
+
+snapshot_publisher = SnapshotPublisher()
+
+
+async def main() -> None:
+    db = get_async_firestore_client()
+    snapshot_storage = await get_snapshot_storage()
+    await rebuild_all_snapshots(db, snapshot_storage)
+    logger.info("Snapshot rebuild completed")
+
+
+if __name__ == "__main__":
+    # 전체 재생성: src 디렉터리에서 `python -m domain.service.snapshot_services`
+    logging_manager.setup()
+    try:
+        asyncio.run(main())
+    finally:
+        logging_manager.shutdown()
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+import time
+
+from google.cloud.firestore_v1.async_client import AsyncClient
+from pydantic import BaseModel
+
+from config import settings
+from database import get_async_firestore_client, prewarm_clients
+from domain.schema.content_schemas import ContentCategory
+from domain.service.content_services import service_get_content, service_get_content_list
+from utils.cache_utils import CachedResponse, response_cache
+from utils.compression_utils import build_cache_key
+from utils.response_utils import dump_json
+
+logger = logging.getLogger(__name__)
+
+# 목록 API의 기본 query 값. 기본값과 같은 파라미터는 생략된 형태로도 캐시해 둡니다
+_DEFAULT_LIST_QUERY = {"page": "1", "limit": "10"}
+
+
+class WarmupState:
+    """시작 시 워밍업 진행 상태. /ready가 이 상태를 보고 트래픽을 받을 준비가 되었는지 응답합니다."""
+
+    def __init__(self):
+        self.is_ready = False
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self.error: str | None = None
+
+
+warmup_state = WarmupState()
+
+
+def _list_query_variants(page: int, limit: int, category: str | None) -> list[list[tuple[str, str]]]:
+    query = {"page": str(page), "limit": str(limit)}
+    if category:
+        query["category"] = category
+    short_query = {key: value for key, value in query.items() if _DEFAULT_LIST_QUERY.get(key) != value}
+
+    variants = [list(query.items())]
+    if short_query != query:
+        variants.append(list(short_query.items()))
+    return variants
+
+
+def _cache_response(
+    path: str,
+    query_variants: list[list[tuple[str, str]]],
+    response: BaseModel,
+    generation: int,
+) -> None:
+    """서비스 함수 결과를 실제 GET 요청과 같은 캐시 키와 본문으로 ResponseCache에 넣습니다."""
+    body = dump_json(response)
+    for query in query_variants:
+        response_cache.set(build_cache_key(path, query), CachedResponse(
+            status_code=200,
+            headers=[(b"content-type", b"application/json")],
+            body=body,
+        ), generation)
+
+
+async def _warm_up_content_list(page: int, category: str | None, db: AsyncClient) -> list[int]:
+    generation = response_cache.current_generation()
+    response = await service_get_content_list(page=page, limit=settings.WARMUP_LIST_LIMIT, category=category, db=db)
+    _cache_response(
+        "/content", _list_query_variants(page, settings.WARMUP_LIST_LIMIT, category), response, generation,
+    )
+    return [summary.post_number for summary in response.data]
+
+
+async def _warm_up_content(post_number: int, db: AsyncClient) -> None:
+    generation = response_cache.current_generation()
+    response = await service_get_content(post_number=post_number, db=db)
+    _cache_response(f"/content/{post_number}", [[]], response, generation)
+
+
+async def service_warm_up_content_cache(db: AsyncClient) -> None:
+    """
+    카테고리별(전체 포함) 첫 목록 페이지와 최신 게시글을 미리 읽어 응답 캐시에 넣습니다.
+    조회수 기록이 없으므로 많이 읽히는 게시글은 전체 목록의 최신 게시글로 대신합니다.
+    """
+    pages = range(1, settings.WARMUP_LIST_PAGES + 1)
+    categories = [None, *(category.value for category in ContentCategory)]
+    list_results = await asyncio.gather(
+        *(_warm_up_content_list(page, category, db) for category in categories for page in pages)
+    )
+
+    # 첫 번째 카테고리(None)가 전체 목록이므로 앞에서부터 최신 게시글 순입니다
+    latest_post_numbers = [post_number for post_numbers in list_results[:len(pages)] for post_number in post_numbers]
+    # 그 사이 삭제된 게시글(404)이 있어도 나머지는 계속 채웁니다
+    await asyncio.gather(
+        *(_warm_up_content(post_number, db) for post_number in latest_post_numbers[:settings.WARMUP_POST_COUNT]),
+        return_exceptions=True,
+    )
+
+
+async def _warm_up() -> None:
+    # 연결을 미리 열지 못해도 캐시 워밍업은 계속 진행합니다 (첫 조회가 연결을 엽니다)
+    if settings.CLIENT_PREWARM_ENABLED:
+        try:
+            await prewarm_clients()
+        except Exception:
+            logger.warning("Client prewarm failed", exc_info=True)
+    if settings.WARMUP_ENABLED:
+        await service_warm_up_content_cache(get_async_firestore_client())
+
+
+async def run_warmup() -> None:
+    """
+    연결과 캐시를 미리 준비합니다. 끝나거나 WARMUP_TIMEOUT_SECONDS가 지나면 ready 상태가 됩니다.
+    워밍업 실패는 서비스를 막지 않습니다.
+    """
+    warmup_state.started_at = time.monotonic()
+    try:
+        await asyncio.wait_for(_warm_up(), timeout=settings.WARMUP_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        warmup_state.error = "timeout"
+        logger.warning("Warm-up timed out after %s seconds", settings.WARMUP_TIMEOUT_SECONDS)
+    except Exception as e:
+        warmup_state.error = str(e)
+        logger.exception("Warm-up failed")
+    finally:
+        warmup_state.finished_at = time.monotonic()
+        warmup_state.is_ready = True
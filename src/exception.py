@@ -14,3 +14,28 @@ class InternalServerErrorException(HTTPException):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Unexpected error occurred during service: {str(error)}"
         )
+
+
+class ConflictException(HTTPException):
+    def __init__(self, detail: str):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=detail
+        )
+
+
+class ServiceUnavailableException(HTTPException):
+    def __init__(self, detail: str, retry_after: float = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(max(1, round(retry_after)))}
+        )
+
+
+class GatewayTimeoutException(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Request deadline exceeded"
+        )
@@ -1,15 +1,107 @@
+import asyncio
 import json
+import logging
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from config import Settings
+from database import close_clients, get_async_firestore_client
+from domain.service.snapshot_services import snapshot_publisher
+from domain.service.warmup_services import run_warmup, warmup_state
 from route.admin_route import router as admin_router
 from route.auth_route import router as auth_router
 from route.content_route import router as content_router
+from route.profiling_route import router as profiling_router
+from utils.admission_utils import AdmissionControlMiddleware, admission_limiters
+from utils.compression_utils import CompressionMiddleware
+from utils.event_utils import content_event_hub
+from utils.firestore_cost_utils import FirestoreCostMiddleware
+from utils.hedge_utils import hedged_readers
+from utils.logging_utils import RequestIdMiddleware, logging_manager
+from utils.metrics_utils import MetricsMiddleware, expose_metrics
+from utils.profiling_utils import loop_lag_monitor, loop_watchdog
+from utils.resilience_utils import BACKEND_UNAVAILABLE_ERRORS, DeadlineMiddleware, backend_unavailable_handler
+from utils.search_utils import content_search_index
+from utils.tracing_utils import TracingMiddleware
 
 settings = Settings()
 
+# print 대신 대기열을 거쳐 백그라운드 스레드에서 stdout에 쓰는 JSON 로깅을 사용합니다
+logging_manager.setup()
+
+logger = logging.getLogger(__name__)
+
+
+async def build_search_index() -> None:
+    """검색 색인을 만듭니다. 실패하면 로그를 남기고 백오프하며 다시 시도합니다. 그동안 검색은 503을 반환합니다."""
+    delay = 1.0
+    while True:
+        try:
+            await content_search_index.build(get_async_firestore_client())
+            logger.info("Search index built", extra={"documents": len(content_search_index.documents)})
+            return
+        except Exception:
+            logger.exception("Search index build failed, retrying in %s seconds", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 60.0)
+
+
+_search_rebuild_tasks: set[asyncio.Task] = set()
+
+
+def rebuild_search_index() -> None:
+    """
+    게시글 변경 리스너가 다시 연결되면, 끊겨 있던 동안 다른 워커나 인스턴스가 반영한 변경(삭제 포함)을 읽도록
+    색인을 새로 만들어 교체합니다. 아직 끝나지 않은 이전 재구성은 취소합니다.
+    """
+    for previous_task in _search_rebuild_tasks:
+        previous_task.cancel()
+    task = asyncio.create_task(build_search_index())
+    _search_rebuild_tasks.add(task)
+    task.add_done_callback(_search_rebuild_tasks.discard)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 연결과 캐시 워밍업은 백그라운드에서 진행하고, 끝날 때까지 /ready는 503을 반환합니다
+    warmup_task = asyncio.create_task(run_warmup())
+    loop_lag_monitor.start()
+    if settings.LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
+
+    # 다른 워커나 다른 인스턴스가 처리한 게시글 변경은 이 프로세스의 검색 색인에 반영되지 않으므로,
+    # Firestore 리스너로 받아 반영합니다. 색인을 만드는 동안의 변경도 놓치지 않도록 먼저 엽니다
+    if settings.SEARCH_INDEX_ENABLED:
+        content_event_hub.add_change_handler(content_search_index.apply_change, on_reset=rebuild_search_index)
+    if settings.SEARCH_INDEX_ENABLED or settings.WEB_CONCURRENCY > 1:
+        # 워커마다 SSE history도 같은 변경으로 채워집니다
+        content_event_hub.start()
+
+    # 검색 색인은 요청 처리를 막지 않도록 백그라운드에서 만듭니다
+    search_index_task = None
+    if settings.SEARCH_INDEX_ENABLED:
+        search_index_task = asyncio.create_task(build_search_index())
+
+    yield
+
+    warmup_task.cancel()
+    loop_lag_monitor.stop()
+    loop_watchdog.stop()
+    if search_index_task is not None:
+        search_index_task.cancel()
+    for task in list(_search_rebuild_tasks):
+        task.cancel()
+    # 게시글 변경 리스너 정리
+    content_event_hub.stop()
+    # 아직 반영하지 않은 스냅샷 갱신
+    await snapshot_publisher.flush()
+    await close_clients()
+    # 대기열에 남은 로그 출력
+    logging_manager.shutdown()
+
 
 app = FastAPI(
     title="kusis.kr backend API",
@@ -24,6 +116,7 @@ app = FastAPI(
         "name": "MIT",
         "url": "https://opensource.org/licenses/MIT"
     },
+    lifespan=lifespan,
     json_encoder=json.JSONEncoder,
     json_dumps_params={"ensure_ascii": False}
 )
@@ -36,6 +129,21 @@ origins = [
 ]
 
 
+# 캐시 HIT는 제한 없이 응답하도록 CompressionMiddleware보다 안쪽에 둡니다
+app.add_middleware(AdmissionControlMiddleware)
+
+# 대기열에서 기다린 시간도 요청 deadline에 포함되도록 AdmissionControlMiddleware보다 바깥에 둡니다
+app.add_middleware(DeadlineMiddleware)
+
+# CORS 헤더가 캐시된 응답에도 요청마다 붙도록 CORSMiddleware보다 안쪽에 둡니다
+app.add_middleware(CompressionMiddleware)
+
+# 요청별 Firestore 사용량 헤더가 응답 캐시에 함께 저장되지 않도록 CompressionMiddleware보다 바깥에 둡니다
+app.add_middleware(FirestoreCostMiddleware, routes=app.router.routes)
+
+# Server-Timing 헤더도 캐시에 저장되지 않도록 CompressionMiddleware보다 바깥에 둡니다
+app.add_middleware(TracingMiddleware, routes=app.router.routes)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -44,12 +152,49 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
+# 캐시 HIT와 CORS preflight까지 포함해 전체 처리 시간을 재도록 가장 바깥에 둡니다
+app.add_middleware(MetricsMiddleware, routes=app.router.routes)
+
+# 모든 로그에 request_id가 붙도록 가장 바깥에 둡니다
+app.add_middleware(RequestIdMiddleware)
+
+
+for error_class in BACKEND_UNAVAILABLE_ERRORS:
+    app.add_exception_handler(error_class, backend_unavailable_handler)
 
 app.include_router(admin_router)
 app.include_router(auth_router)
 app.include_router(content_router)
+if settings.PROFILING_ENABLED:
+    app.include_router(profiling_router)
 
 
 @app.get("/")
 async def root():
     return {"message": "kusis.kr API 서버입니다."}
+
+
+@app.get("/ready")
+async def ready():
+    """워밍업이 끝났거나 시간 초과된 뒤에만 200을 반환합니다. 로드밸런서 readiness probe용입니다."""
+    if not warmup_state.is_ready:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"status": "warming_up"})
+    return {"status": "ready"}
+
+
+@app.get("/admission")
+async def admission():
+    """경로 종류별 동시 실행 수, 대기열 길이와 거절 횟수를 반환합니다."""
+    return {name: limiter.stats() for name, limiter in admission_limiters.items()}
+
+
+@app.get("/hedging")
+async def hedging():
+    """헤지 읽기 대상별 요청 수, 추가 요청 수, 추가 요청이 먼저 끝난 횟수와 현재 헤지 지연 시간을 반환합니다."""
+    return {name: reader.stats() for name, reader in hedged_readers.items()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """요청/백엔드 호출 지연 시간, 캐시 HIT 수, 과부하 제어 상태 등을 Prometheus text format으로 반환합니다."""
+    return PlainTextResponse(expose_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,8 +1,10 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, File, UploadFile, status
+from fastapi import APIRouter, Depends, File, Header, Response, UploadFile, status
 
-from dependency import get_image_uploader
+from database import get_async_firestore_client
+from dependency import get_idempotency_store, get_image_uploader
+from utils.idempotency_utils import IdempotencyStore, make_request_fingerprint
 from utils.image_utils import ImageUploader
 
 router = APIRouter(
@@ -14,13 +16,26 @@ router = APIRouter(
 @router.post(
     "/upload",
     summary="이미지 업로드",
-    description="""이미지를 업로드합니다.""",
+    description="""이미지를 업로드합니다.
+    `Idempotency-Key` 헤더를 보내면 같은 키로 재시도된 요청은 다시 업로드하지 않고 처음 응답을 그대로 돌려줍니다.""",
     status_code=status.HTTP_201_CREATED,
 )
 async def upload_images(
     image_uploader: Annotated[ImageUploader, Depends(get_image_uploader)],
+    idempotency_store: Annotated[IdempotencyStore, Depends(get_idempotency_store)],
+    http_response: Response,
     images: list[UploadFile] = File(None),
+    idempotency_key: Annotated[str | None, Header(alias="Idempotency-Key", max_length=255)] = None,
+    db = Depends(get_async_firestore_client),
 ) -> list[str]:
-    response = await image_uploader.upload_images(images)
+    response, is_replayed = await idempotency_store.run(
+        db=db,
+        scope="admin:upload",
+        key=idempotency_key,
+        fingerprint=await make_request_fingerprint({}, images),
+        handler=lambda: image_uploader.upload_images(images),
+    )
+    if is_replayed:
+        http_response.headers["Idempotent-Replayed"] = "true"
 
     return response
@@ -19,6 +19,7 @@ from domain.service.auth_services import (
     service_register_user,
     service_update_user,
 )
+from utils.response_utils import FastJSONResponse
 
 router = APIRouter(
     prefix="/auth",
@@ -81,7 +82,7 @@ async def get_admin(
         uid=uid,
         db=db
     )
-    return result
+    return FastJSONResponse(result)
 
 
 @router.put(
@@ -102,7 +103,7 @@ async def update_admin(
         request=request,
         db=db
     )
-    return result
+    return FastJSONResponse(result)
 
 
 @router.delete(
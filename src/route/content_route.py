@@ -1,25 +1,39 @@
+from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, File, Form, Path, Query, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Path, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 
+from config import settings
 from database import get_async_firestore_client
-from dependency import get_image_uploader
+from dependency import get_current_active_admin, get_idempotency_store, get_image_uploader
 from domain.schema.content_schemas import (
     RouteReqPostContent,
     RouteReqPutContent,
     RouteResGetContent,
+    RouteResGetContentBatch,
+    RouteResGetContentChanges,
     RouteResGetContentDetail,
     RouteResGetContentList,
+    RouteResSearchContent,
 )
 from domain.service.content_services import (
     service_create_content,
     service_delete_content,
     service_get_content,
+    service_get_content_batch,
+    service_get_content_changes,
     service_get_content_detail,
     service_get_content_list,
+    service_search_content,
+    service_stream_content_events,
     service_update_content,
 )
+from domain.service.export_services import service_export_contents
+from domain.service.import_services import service_import_contents, service_prepare_import
+from utils.idempotency_utils import IdempotencyStore, make_request_fingerprint
 from utils.image_utils import ImageUploader
+from utils.response_utils import FastJSONResponse
 
 router = APIRouter(
     prefix="/content",
@@ -27,6 +41,118 @@ router = APIRouter(
 )
 
 
+@router.get(
+    "/changes",
+    summary="게시글 변경 피드",
+    description="""`since` 토큰 이후에 생성, 수정, 삭제된 게시글만 반환합니다.
+    처음에는 `since` 없이 호출해 전체를 받고, 이후에는 응답의 `next_token`을 `since`로 넘겨 변경분만 받습니다.
+    `has_more`가 true이면 바로 다음 페이지를 요청하면 됩니다.""",
+    response_model=RouteResGetContentChanges,
+    status_code=status.HTTP_200_OK,
+)
+async def get_content_changes(
+    since: Annotated[str | None, Query(description="이전 응답의 next_token")] = None,
+    limit: Annotated[
+        int, Query(description="한 번에 받을 최대 변경 수", gt=0, le=settings.CHANGE_FEED_MAX_LIMIT)
+    ] = 100,
+    db = Depends(get_async_firestore_client),
+) -> RouteResGetContentChanges:
+    response = await service_get_content_changes(
+        since=since,
+        limit=limit,
+        db=db,
+    )
+    return FastJSONResponse(response)
+
+
+@router.get(
+    "/batch",
+    summary="게시글 일괄 조회",
+    description=f"""여러 게시글을 Post Number로 한 번에 조회합니다. (최대 {settings.BATCH_MAX_IDS}개)
+    결과는 요청 순서대로 반환되며, 없거나 삭제된 게시글은 `is_found`가 false입니다.""",
+    response_model=RouteResGetContentBatch,
+    status_code=status.HTTP_200_OK,
+)
+async def get_content_batch(
+    ids: Annotated[str, Query(description="쉼표로 구분한 Post Number 목록", example="1,5,9")],
+    db = Depends(get_async_firestore_client),
+) -> RouteResGetContentBatch:
+    try:
+        post_numbers = list(dict.fromkeys(int(value) for value in ids.split(",") if value.strip()))
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be comma-separated integers"
+        ) from e
+    if not post_numbers or len(post_numbers) > settings.BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"ids must contain between 1 and {settings.BATCH_MAX_IDS} post numbers"
+        )
+
+    response = await service_get_content_batch(
+        post_numbers=post_numbers,
+        db=db,
+    )
+    return FastJSONResponse(response)
+
+
+@router.get(
+    "/search",
+    summary="게시글 검색",
+    description="""게시글 제목과 내용을 검색합니다. 결과는 관련도(BM25) 순이며,
+    `next_cursor`로 다음 페이지를 조회합니다.
+    색인을 만드는 중이면 503, 서버에서 검색이 꺼져 있으면(SEARCH_INDEX_ENABLED=false) 501을 반환합니다.""",
+    response_model=RouteResSearchContent,
+    status_code=status.HTTP_200_OK,
+)
+async def search_content(
+    q: Annotated[str, Query(description="검색어", min_length=1, max_length=100)],
+    category: Annotated[
+        str | None, Query(regex="^(apply|notice|cardnews)$")
+    ] = None,
+    limit: Annotated[
+        int, Query(description="페이지 당 게시글 수", example=10, gt=0, le=100)
+    ] = 10,
+    cursor: Annotated[str | None, Query(description="이전 응답의 next_cursor")] = None,
+) -> RouteResSearchContent:
+    response = await service_search_content(
+        query=q,
+        category=category,
+        limit=limit,
+        cursor=cursor,
+    )
+    return FastJSONResponse(response)
+
+
+@router.get(
+    "/events",
+    summary="게시글 변경 이벤트 구독",
+    description="""게시글 생성(create), 수정(update), 삭제(delete) 이벤트를 Server-Sent Events로 받습니다.
+    `category`로 특정 카테고리만 받을 수 있고, 재접속 시 `Last-Event-ID` 헤더 이후의 이벤트를 이어서 받습니다.
+    서버의 변경 리스너가 다시 연결되면 `reset` 이벤트를 보냅니다. 이때는 `data.since`를 `/content/changes`의
+    `since`로 넘겨 놓친 변경을 받아야 합니다.""",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def stream_content_events(
+    category: Annotated[
+        str | None, Query(regex="^(apply|notice|cardnews)$")
+    ] = None,
+    last_event_id: Annotated[str | None, Header(alias="Last-Event-ID")] = None,
+    db = Depends(get_async_firestore_client),
+) -> StreamingResponse:
+    return StreamingResponse(
+        service_stream_content_events(
+            category=category,
+            last_event_id=last_event_id,
+            db=db,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get(
     "/{post_number}",
     summary="게시글 조회",
@@ -42,7 +168,7 @@ async def get_content(
         post_number=post_number,
         db=db,
     )
-    return response
+    return FastJSONResponse(response)
 
 
 @router.get(
@@ -70,13 +196,14 @@ async def get_content_list(
         category=category,
         db=db,
     )
-    return response
+    return FastJSONResponse(response)
 
 
 @router.post(
     "/admin/create",
     summary="게시글 작성",
-    description="""게시글을 작성합니다. 이미지 파일도 함께 업로드할 수 있습니다.""",
+    description="""게시글을 작성합니다. 이미지 파일도 함께 업로드할 수 있습니다.
+    `Idempotency-Key` 헤더를 보내면 같은 키로 재시도된 요청은 다시 처리하지 않고 처음 응답을 그대로 돌려줍니다.""",
     response_model=RouteResGetContent,
     status_code=status.HTTP_201_CREATED,
 )
@@ -85,7 +212,10 @@ async def create_content(
     title: Annotated[str, Form()],
     contents: Annotated[str, Form()],
     image_uploader: Annotated[ImageUploader, Depends(get_image_uploader)],
+    idempotency_store: Annotated[IdempotencyStore, Depends(get_idempotency_store)],
+    http_response: Response,
     images: list[UploadFile] = File(None),
+    idempotency_key: Annotated[str | None, Header(alias="Idempotency-Key", max_length=255)] = None,
     db = Depends(get_async_firestore_client),
 ) -> RouteResGetContent:
     content = RouteReqPostContent(
@@ -93,15 +223,78 @@ async def create_content(
         title=title,
         contents=contents
     )
-    response = await service_create_content(
-        content=content,
-        images=images,
+    response, is_replayed = await idempotency_store.run(
         db=db,
-        image_uploader=image_uploader,
+        scope="content:create",
+        key=idempotency_key,
+        fingerprint=await make_request_fingerprint(content.model_dump(), images),
+        handler=lambda: service_create_content(
+            content=content,
+            images=images,
+            db=db,
+            image_uploader=image_uploader,
+        ),
     )
+    if is_replayed:
+        http_response.headers["Idempotent-Replayed"] = "true"
     return response
 
 
+@router.post(
+    "/admin/import",
+    summary="게시글 일괄 가져오기",
+    description="""NDJSON 파일 또는 NDJSON과 이미지를 담은 zip 파일로 게시글을 일괄 생성합니다.
+    각 줄은 `category`, `title`, `contents`, `images`, `created_at`(선택) 필드를 가진 JSON 객체입니다.
+    `images`의 http(s) URL은 그대로 사용하고, 그 외 값은 zip 안의 이미지 경로로 간주해 업로드합니다.
+    결과는 레코드별 `RouteResImportResult`가 한 줄씩 NDJSON으로 스트리밍됩니다.""",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def import_contents(
+    image_uploader: Annotated[ImageUploader, Depends(get_image_uploader)],
+    archive: UploadFile = File(description="NDJSON 또는 zip 파일"),
+    db = Depends(get_async_firestore_client),
+) -> StreamingResponse:
+    import_archive = await service_prepare_import(archive)
+    return StreamingResponse(
+        service_import_contents(
+            archive=import_archive,
+            db=db,
+            image_uploader=image_uploader,
+        ),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get(
+    "/admin/export",
+    summary="게시글 내보내기",
+    description="""전체 게시글을 post_number 오름차순 NDJSON으로 스트리밍합니다. 관리자만 호출할 수 있습니다.
+    중단된 경우 마지막으로 받은 post_number를 `after`로 넘기면 이어서 받을 수 있습니다.""",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    # 삭제된 게시글까지 내려받을 수 있으므로 인증을 요구합니다
+    dependencies=[Depends(get_current_active_admin)],
+)
+async def export_contents(
+    after: Annotated[int | None, Query(description="이 Post Number 다음 게시글부터 내보내기", ge=0)] = None,
+    include_deleted: Annotated[bool, Query(description="삭제된 게시글 포함 여부")] = False,
+    gzip: Annotated[bool, Query(description="gzip 압축 파일(.ndjson.gz)로 받기")] = False,
+    db = Depends(get_async_firestore_client),
+) -> StreamingResponse:
+    filename = "contents.ndjson.gz" if gzip else "contents.ndjson"
+    return StreamingResponse(
+        service_export_contents(
+            db=db,
+            after=after,
+            include_deleted=include_deleted,
+            is_gzip=gzip,
+        ),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.put(
     "/admin/{post_number}",
     summary="게시글 수정",
@@ -131,12 +324,17 @@ async def update_content(
 )
 async def delete_content(
     post_number: Annotated[int, Path(description="게시글 Post Number", gt=0)],
+    updated_at: Annotated[
+        datetime | None,
+        Query(description="클라이언트가 마지막으로 조회한 게시글 최종 수정일 (지정 시 다른 수정이 있었으면 409)"),
+    ] = None,
     #current_user: Annotated[dict, Depends(get_current_active_admin)],
     db = Depends(get_async_firestore_client),
 ) -> None:
     await service_delete_content(
         post_number=post_number,
         db=db,
+        expected_updated_at=updated_at,
     )
     return
 
@@ -157,4 +355,4 @@ async def get_content_detail(
         post_number=post_number,
         db=db,
     )
-    return response
+    return FastJSONResponse(response)
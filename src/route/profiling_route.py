@@ -0,0 +1,117 @@
+import asyncio
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import PlainTextResponse
+
+from config import settings
+from dependency import get_current_active_admin
+from utils.profiling_utils import loop_lag_monitor, memory_profiler, profiling_guard, run_cpu_profile
+
+router = APIRouter(
+    prefix="/admin/profiling",
+    tags=["profiling"],
+    dependencies=[Depends(get_current_active_admin)],
+)
+
+
+@router.get(
+    "/cpu",
+    summary="CPU 샘플링 프로파일",
+    description="""실행 중인 워커를 `seconds` 동안 샘플링해서
+    collapsed stack 파일(flamegraph.pl, speedscope 호환)로 반환합니다.
+    길이는 PROFILING_MAX_SECONDS로 제한되고, 워커 하나에서 동시에 하나만 실행할 수 있습니다 (실행 중이면 409).
+    요청이 들어간 워커만 프로파일됩니다.""",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def profile_cpu(
+    seconds: Annotated[float, Query(description="샘플링 시간(초)", gt=0)] = 10,
+    interval_ms: Annotated[float, Query(description="샘플 간격(ms)", gt=0)] = 10,
+    all_threads: Annotated[bool, Query(description="이벤트 루프 외 스레드(이미지 최적화 등)도 포함")] = False,
+) -> PlainTextResponse:
+    sampler = await run_cpu_profile(seconds, interval_ms, all_threads)
+    return PlainTextResponse(
+        sampler.collapsed(),
+        headers={
+            "Content-Disposition": 'attachment; filename="profile.collapsed"',
+            "X-Profile-Samples": str(sampler.samples),
+        },
+    )
+
+
+@router.post(
+    "/memory/start",
+    summary="메모리 할당 추적 시작",
+    description="""tracemalloc을 켭니다.
+    추적 중에는 모든 할당이 느려지므로 TRACEMALLOC_MAX_SECONDS 뒤 자동으로 꺼집니다.
+    다른 프로파일이나 스냅샷/diff가 실행 중이면 409를 반환합니다.""",
+    status_code=status.HTTP_200_OK,
+)
+async def start_memory_tracing(
+    frames: Annotated[int, Query(description="할당 위치마다 남길 호출 스택 깊이", ge=1)] = 1,
+) -> dict:
+    async with profiling_guard:
+        memory_profiler.start(frames)
+    return memory_profiler.status()
+
+
+@router.post(
+    "/memory/stop",
+    summary="메모리 할당 추적 중지",
+    status_code=status.HTTP_200_OK,
+)
+async def stop_memory_tracing() -> dict:
+    # 스냅샷/diff를 만드는 도중에 추적을 끄지 않도록 같은 guard를 잡습니다 (실행 중이면 409)
+    async with profiling_guard:
+        memory_profiler.stop()
+    return memory_profiler.status()
+
+
+@router.get(
+    "/memory/snapshot",
+    summary="메모리 스냅샷",
+    description="""현재 할당량이 큰 위치 상위 `limit`개를 반환하고, 이 스냅샷을 다음 diff의 기준으로 삼습니다.""",
+    status_code=status.HTTP_200_OK,
+)
+async def take_memory_snapshot(
+    limit: Annotated[int, Query(ge=1, le=200)] = 20,
+    group_by: Annotated[Literal["lineno", "filename", "traceback"], Query()] = "lineno",
+) -> dict:
+    async with profiling_guard:
+        return await asyncio.to_thread(memory_profiler.snapshot, limit, group_by)
+
+
+@router.get(
+    "/memory/diff",
+    summary="메모리 스냅샷 비교",
+    description="""직전 스냅샷 이후 할당이 늘어난 위치 상위 `limit`개를 반환합니다.
+    예: 스냅샷 → 큰 이미지 업로드 → diff 순서로 호출하면 업로드 후 남아 있는 메모리를 찾을 수 있습니다.""",
+    status_code=status.HTTP_200_OK,
+)
+async def diff_memory_snapshot(
+    limit: Annotated[int, Query(ge=1, le=200)] = 20,
+    group_by: Annotated[Literal["lineno", "filename", "traceback"], Query()] = "lineno",
+) -> dict:
+    async with profiling_guard:
+        return await asyncio.to_thread(memory_profiler.diff, limit, group_by)
+
+
+@router.get(
+    "/memory",
+    summary="메모리 할당 추적 상태",
+    status_code=status.HTTP_200_OK,
+)
+async def get_memory_tracing_status() -> dict:
+    return memory_profiler.status()
+
+
+@router.get(
+    "/loop-lag",
+    summary="이벤트 루프 지연 통계",
+    description=f"""최근 {settings.LOOP_LAG_WINDOW_SIZE}번 측정한 이벤트 루프 지연(예정보다 늦게 깨어난 시간)의
+    평균, p50, p99, 최댓값입니다.""",
+    status_code=status.HTTP_200_OK,
+)
+async def get_loop_lag() -> dict:
+    return loop_lag_monitor.stats()
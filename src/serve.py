@@ -0,0 +1,67 @@
+import os
+
+import uvicorn
+
+from config import settings
+
+
+def available_cpu_count() -> int:
+    """
+    컨테이너에서 실제로 쓸 수 있는 CPU 수. os.cpu_count()는 호스트 전체 코어 수를 반환하므로
+    CPU affinity와 cgroup CPU 할당량(v2: cpu.max, v1: cpu.cfs_quota_us)으로 줄입니다.
+    """
+    count = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    quota_files = [
+        ("/sys/fs/cgroup/cpu.max", None),
+        ("/sys/fs/cgroup/cpu/cpu.cfs_quota_us", "/sys/fs/cgroup/cpu/cpu.cfs_period_us"),
+    ]
+    for quota_path, period_path in quota_files:
+        try:
+            with open(quota_path) as quota_file:
+                values = quota_file.read().split()
+            if period_path is not None:
+                with open(period_path) as period_file:
+                    values.append(period_file.read().strip())
+        except OSError:
+            continue
+        quota, period = values[0], values[1]
+        if quota not in ("max", "-1") and int(period) > 0:
+            # 할당량이 1.5 CPU면 2개로 올림
+            count = min(count, -(-int(quota) // int(period)))
+        break
+    return max(1, count)
+
+
+
+def main() -> None:
+    """
+    운영용 실행 진입점. WEB_CONCURRENCY개(설정하지 않으면 사용할 수 있는 CPU 수)의 워커 프로세스로 앱을 실행합니다.
+    uvloop/httptools가 설치되어 있으면 사용하고, WORKER_MAX_REQUESTS만큼 요청을 처리한 워커는
+    진행 중인 요청을 마친 뒤 재시작됩니다.
+    워커가 여러 개면 응답 캐시는 공유 메모리 캐시를 쓰고, 검색 색인과 SSE history는 워커마다 Firestore 게시글 변경
+    리스너를 열어 다른 워커에서 일어난 변경도 반영합니다.
+    """
+    workers = settings.WEB_CONCURRENCY if "WEB_CONCURRENCY" in os.environ else available_cpu_count()
+    # 워커 프로세스가 import하는 settings도 같은 워커 수를 보도록 환경 변수로 넘깁니다
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    if workers > 1:
+        # 워커끼리 응답 캐시를 나눠 갖지 않도록 공유 메모리 캐시를 기본으로 사용
+        os.environ.setdefault("RESPONSE_CACHE_BACKEND", "shared")
+
+    uvicorn.run(
+        "main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        loop="auto",
+        http="auto",
+        limit_max_requests=settings.WORKER_MAX_REQUESTS or None,
+        timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_SECONDS,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.FORWARDED_ALLOW_IPS,
+    )
+
+
+if __name__ == "__main__":
+    # src 디렉터리에서 `python serve.py`
+    main()
@@ -0,0 +1,218 @@
+import asyncio
+import json
+import re
+import time
+from collections import deque
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from config import settings
+from utils.cache_utils import ResponseCacheBackend, response_cache
+from utils.compression_utils import make_cache_key
+from utils.metrics_utils import callback_metric
+
+PUBLIC = "public"
+ADMIN = "admin"
+UPLOAD = "upload"
+
+# 제한하지 않는 경로 (헬스 체크, 문서, 오래 연결되는 SSE 스트림)
+_EXEMPT_PATHS = {"/", "/ready", "/admission", "/hedging", "/metrics", "/docs", "/redoc", "/openapi.json"}
+_EXEMPT_PATTERNS = [re.compile(r"^/content/events$")]
+_UPLOAD_PATHS = {"/admin/upload", "/content/admin/create", "/content/admin/import"}
+
+
+def classify_request(scope: Scope) -> str | None:
+    """
+    요청을 public(공개 조회) / admin(관리자, 쓰기) / upload(파일 업로드) 중 하나로 분류합니다.
+    제한 대상이 아니면 None.
+    """
+    path = scope["path"]
+    if path in _EXEMPT_PATHS or any(pattern.match(path) for pattern in _EXEMPT_PATTERNS):
+        return None
+    if path in _UPLOAD_PATHS:
+        return UPLOAD
+    if "/admin" in path or scope["method"] not in ("GET", "HEAD"):
+        return ADMIN
+    return PUBLIC
+
+
+class AdmissionLimiter:
+    """
+    동시 실행 수를 max_concurrency로 제한하고, 초과한 요청은 최대 max_queue개까지 FIFO로 대기시킵니다.
+    대기열이 가득 찼거나 queue_timeout_seconds 안에 차례가 오지 않은 요청은 거절합니다.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, queue_timeout_seconds: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        # 누적 지표
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.served_stale = 0
+        self.total_wait_seconds = 0.0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        """실행 슬롯을 얻으면 True, 거절되면 False를 반환합니다."""
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_queue_full += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started_at = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=self.queue_timeout_seconds)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # 시간 초과와 동시에 슬롯을 넘겨받은 경우 다음 대기자에게 돌려줍니다
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            self.rejected_timeout += 1
+            return False
+        finally:
+            self.total_wait_seconds += time.monotonic() - started_at
+
+        self.admitted += 1
+        return True
+
+    def release(self) -> None:
+        # 대기자가 있으면 슬롯을 반납하지 않고 바로 넘겨줍니다 (in_flight 유지)
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queue_timeout_seconds": self.queue_timeout_seconds,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "served_stale": self.served_stale,
+            "total_wait_seconds": round(self.total_wait_seconds, 6),
+        }
+
+
+admission_limiters = {
+    PUBLIC: AdmissionLimiter(
+        PUBLIC,
+        settings.ADMISSION_PUBLIC_CONCURRENCY,
+        settings.ADMISSION_PUBLIC_QUEUE_SIZE,
+        settings.ADMISSION_PUBLIC_QUEUE_TIMEOUT_SECONDS,
+    ),
+    ADMIN: AdmissionLimiter(
+        ADMIN,
+        settings.ADMISSION_ADMIN_CONCURRENCY,
+        settings.ADMISSION_ADMIN_QUEUE_SIZE,
+        settings.ADMISSION_ADMIN_QUEUE_TIMEOUT_SECONDS,
+    ),
+    UPLOAD: AdmissionLimiter(
+        UPLOAD,
+        settings.ADMISSION_UPLOAD_CONCURRENCY,
+        settings.ADMISSION_UPLOAD_QUEUE_SIZE,
+        settings.ADMISSION_UPLOAD_QUEUE_TIMEOUT_SECONDS,
+    ),
+}
+
+callback_metric(
+    "admission_in_flight", "Requests currently admitted per route class", "gauge", ("route_class",),
+    lambda: {(name,): limiter.in_flight for name, limiter in admission_limiters.items()},
+)
+callback_metric(
+    "admission_queued", "Requests waiting for an admission slot per route class", "gauge", ("route_class",),
+    lambda: {(name,): limiter.queued for name, limiter in admission_limiters.items()},
+)
+callback_metric(
+    "admission_rejected_total", "Requests rejected by admission control per route class and reason", "counter",
+    ("route_class", "reason"),
+    lambda: {
+        key: value
+        for name, limiter in admission_limiters.items()
+        for key, value in (
+            ((name, "queue_full"), limiter.rejected_queue_full),
+            ((name, "timeout"), limiter.rejected_timeout),
+        )
+    },
+)
+
+
+class AdmissionControlMiddleware:
+    """
+    경로 종류별로 동시 요청 수와 대기열을 제한해서 과부하 때 Firestore 호출이 무한정 쌓이지 않게 하는 ASGI 미들웨어.
+    거절된 요청은 stale 캐시가 있으면 그 응답을, 없으면 Retry-After와 함께 바로 503을 받습니다.
+    캐시 HIT는 CompressionMiddleware가 먼저 처리하므로 이 미들웨어는 그보다 안쪽에 둡니다.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiters: dict[str, AdmissionLimiter] = admission_limiters,
+        cache: ResponseCacheBackend = response_cache,
+    ):
+        self.app = app
+        self.limiters = limiters
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route_class = classify_request(scope) if scope["type"] == "http" else None
+        if route_class is None or not settings.ADMISSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters[route_class]
+        if not await limiter.acquire():
+            await self.reject(scope, send, limiter)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
+
+    async def reject(self, scope: Scope, send: Send, limiter: AdmissionLimiter) -> None:
+        cache_key = make_cache_key(scope)
+        entry = self.cache.get(cache_key, allow_stale=True) if cache_key is not None else None
+        if entry is not None:
+            limiter.served_stale += 1
+            # CompressionMiddleware가 이 응답을 새 캐시로 저장하지 않도록 STALE로 표시합니다
+            await send({
+                "type": "http.response.start",
+                "status": entry.status_code,
+                "headers": [*entry.headers, (b"x-cache", b"STALE")],
+            })
+            await send({"type": "http.response.body", "body": entry.body})
+            return
+
+        body = json.dumps({"detail": "Server is overloaded, please retry later"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,322 @@
+import fcntl
+import hashlib
+import json
+import logging
+import mmap
+import os
+import tempfile
+import time
+
+from config import settings
+from utils.metrics_utils import callback_metric
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse:
+    """캐시된 HTTP 응답. 압축된 변형(gzip, br)은 처음 요청될 때 한 번만 만들어 함께 보관합니다."""
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: list[tuple[bytes, bytes]],
+        body: bytes,
+        stored_at: float | None = None,
+    ):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+        self.stored_at = time.monotonic() if stored_at is None else stored_at
+        self.variants: dict[str, bytes] = {}
+
+
+class ResponseCache:
+    """
+    GET 게시글/목록 응답을 담는 프로세스 내 캐시.
+    TTL이 지났거나 invalidate()된 항목은 바로 지우지 않고 stale로 남겨, 과부하 시 대신 응답할 수 있게 합니다.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = settings.RESPONSE_CACHE_TTL_SECONDS,
+        max_entries: int = settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[str, CachedResponse] = {}
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.skipped_writes = 0  # SharedResponseCache와 같은 인터페이스 (프로세스 내 캐시는 건너뛰지 않습니다)
+
+    def current_generation(self) -> int:
+        """invalidate()될 때마다 1씩 늘어나는 세대 번호. 요청을 시작할 때 읽어 두었다가 set()에 넘깁니다."""
+        return self.generation
+
+    def get(self, key: str, allow_stale: bool = False) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is not None and (allow_stale or time.monotonic() - entry.stored_at < self.ttl_seconds):
+            if not allow_stale:
+                self.hits += 1
+            return entry
+        if not allow_stale:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, entry: CachedResponse, generation: int | None = None) -> None:
+        # 응답을 만드는 동안 invalidate()되었으면 이미 바뀐 데이터로 만든 응답일 수 있으므로 저장하지 않습니다
+        if generation is not None and generation != self.generation:
+            return
+        self._entries.pop(key, None)
+        if len(self._entries) >= self.max_entries:
+            # 가장 오래 전에 저장된 항목부터 제거
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = entry
+
+    def set_variant(self, key: str, encoding: str, data: bytes) -> None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.variants[encoding] = data
+
+    def invalidate(self) -> None:
+        """모든 항목을 stale로 표시합니다. 다음 요청부터는 새로 만든 응답이 캐시됩니다."""
+        self.generation += 1
+        for entry in self._entries.values():
+            entry.stored_at = float("-inf")
+
+
+class _FileLock:
+    """
+    flock 기반 프로세스 간 배타 잠금. blocking=False면 다른 프로세스가 잡고 있을 때 기다리지 않고
+    with 문의 값으로 False를 돌려줍니다.
+    """
+
+    def __init__(self, fd: int, blocking: bool = True):
+        self.fd = fd
+        self.blocking = blocking
+        self.is_locked = False
+
+    def __enter__(self) -> bool:
+        try:
+            fcntl.flock(self.fd, fcntl.LOCK_EX if self.blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        self.is_locked = True
+        return True
+
+    def __exit__(self, *exc_info) -> None:
+        if self.is_locked:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            self.is_locked = False
+
+
+class SharedResponseCache:
+    """
+    여러 워커 프로세스가 함께 쓰는 공유 메모리(/dev/shm) 응답 캐시. ResponseCache와 같은 인터페이스입니다.
+    항목은 키별 파일(헤더 + 본문 + 압축 변형)로 저장되어 모든 워커가 같은 페이지 캐시를 읽으므로,
+    워커 수가 늘어도 캐시 메모리는 한 벌입니다.
+    쓰기(set, set_variant, invalidate)는 파일 잠금으로 한 번에 한 프로세스만 수행하고,
+    invalidate()는 mmap으로 공유되는 세대(generation) 번호만 올려 모든 항목을 한 번에 stale로 만듭니다.
+    캐시 쓰기가 실패해도(공간 부족 등) 응답은 그대로 보내고 skipped_writes로만 셉니다.
+
+    모든 호출은 이벤트 루프에서 실행되므로 오래 멈추지 않게 합니다. 캐시 쓰기(set, set_variant)는 다른 워커가
+    잠금을 잡고 있으면 기다리지 않고 건너뛰며, 오래된 항목 정리(디렉터리 스캔)는 mmap에 공유되는 항목 수가
+    max_entries를 넘을 때만 max_entries의 90%까지 한 번에 지웁니다. 파일은 tmpfs에 있어 읽기/쓰기는 메모리 복사입니다.
+    """
+
+    def __init__(
+        self,
+        directory: str = settings.RESPONSE_CACHE_SHARED_DIR,
+        ttl_seconds: float = settings.RESPONSE_CACHE_TTL_SECONDS,
+        max_entries: int = settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ):
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.skipped_writes = 0
+        self._generation_map: mmap.mmap | None = None
+        self._lock_fd: int | None = None
+
+    def _open(self) -> None:
+        # fork/spawn된 워커마다 자기 파일 핸들을 갖도록 처음 사용할 때 엽니다
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock_fd = os.open(os.path.join(self.directory, "lock"), os.O_RDWR | os.O_CREAT, 0o600)
+        generation_fd = os.open(os.path.join(self.directory, "generation"), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            with self._write_lock():
+                # 0~8바이트: 세대 번호, 8~16바이트: 항목 수
+                if os.fstat(generation_fd).st_size < 16:
+                    os.ftruncate(generation_fd, 16)
+            self._generation_map = mmap.mmap(generation_fd, 16)
+        finally:
+            os.close(generation_fd)
+
+    def _write_lock(self, blocking: bool = True) -> _FileLock:
+        return _FileLock(self._lock_fd, blocking)
+
+    def _entry_count(self) -> int:
+        return int.from_bytes(self._generation_map[8:16], "little")
+
+    def _set_entry_count(self, count: int) -> None:
+        self._generation_map[8:16] = count.to_bytes(8, "little")
+
+    def _ensure_open(self) -> None:
+        if self._generation_map is None:
+            self._open()
+
+    def current_generation(self) -> int:
+        self._ensure_open()
+        return int.from_bytes(self._generation_map[:8], "little")
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest() + ".entry")
+
+    def _read(self, key: str) -> tuple[dict[str, object], bytes] | None:
+        try:
+            with open(self._entry_path(key), "rb") as entry_file:
+                data = entry_file.read()
+        except FileNotFoundError:
+            return None
+        header_length = int.from_bytes(data[:4], "little")
+        header = json.loads(data[4:4 + header_length])
+        if header["key"] != key:
+            return None
+        return header, data[4 + header_length:]
+
+    def _write(self, key: str, header: dict[str, object], payload: bytes) -> bool:
+        """
+        항목 파일을 씁니다. /dev/shm이 가득 찼을 때(ENOSPC) 같은 OSError는 응답을 실패시키지 않도록
+        임시 파일을 지우고 건너뛴 쓰기로 세어 False를 반환합니다.
+        """
+        header_bytes = json.dumps(header).encode()
+        temp_path = None
+        try:
+            # 다른 워커가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓰고 교체합니다
+            fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as temp_file:
+                temp_file.write(len(header_bytes).to_bytes(4, "little") + header_bytes + payload)
+            os.replace(temp_path, self._entry_path(key))
+            return True
+        except OSError:
+            logger.warning("Failed to write shared response cache entry", exc_info=True)
+            self.skipped_writes += 1
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except FileNotFoundError:
+                    pass
+            return False
+
+    def get(self, key: str, allow_stale: bool = False) -> CachedResponse | None:
+        generation = self.current_generation()
+        stored = self._read(key)
+        is_fresh = (
+            stored is not None
+            and stored[0]["generation"] == generation
+            and time.time() - stored[0]["stored_at"] < self.ttl_seconds
+        )
+        if stored is None or not (allow_stale or is_fresh):
+            if not allow_stale:
+                self.misses += 1
+            return None
+        if not allow_stale:
+            self.hits += 1
+
+        header, payload = stored
+        body_length = header["body_length"]
+        entry = CachedResponse(
+            status_code=header["status_code"],
+            headers=[(name.encode("latin-1"), value.encode("latin-1")) for name, value in header["headers"]],
+            body=payload[:body_length],
+            stored_at=time.monotonic() if is_fresh else float("-inf"),
+        )
+        offset = body_length
+        for encoding, length in header["variants"].items():
+            entry.variants[encoding] = payload[offset:offset + length]
+            offset += length
+        return entry
+
+    def set(self, key: str, entry: CachedResponse, generation: int | None = None) -> None:
+        current_generation = self.current_generation()
+        header = {
+            "key": key,
+            "status_code": entry.status_code,
+            "headers": [(name.decode("latin-1"), value.decode("latin-1")) for name, value in entry.headers],
+            "stored_at": time.time(),
+            "generation": current_generation if generation is None else generation,
+            "body_length": len(entry.body),
+            "variants": {},
+        }
+        with self._write_lock(blocking=False) as is_locked:
+            if not is_locked:
+                # 다른 워커가 쓰는 중이면 기다리지 않습니다. 다음 MISS 요청이 다시 저장합니다
+                self.skipped_writes += 1
+                return
+            # invalidate()도 같은 잠금 안에서 세대를 올리므로, 여기서 확인한 세대는 쓰는 동안 바뀌지 않습니다
+            if generation is not None and generation != self.current_generation():
+                return
+            is_new = not os.path.exists(self._entry_path(key))
+            if self._write(key, header, entry.body) and is_new:
+                self._set_entry_count(self._entry_count() + 1)
+                if self._entry_count() > self.max_entries:
+                    self._evict()
+
+    def set_variant(self, key: str, encoding: str, data: bytes) -> None:
+        self._ensure_open()
+        with self._write_lock(blocking=False) as is_locked:
+            if not is_locked:
+                self.skipped_writes += 1
+                return
+            stored = self._read(key)
+            if stored is None or encoding in stored[0]["variants"]:
+                return
+            header, payload = stored
+            header["variants"][encoding] = len(data)
+            self._write(key, header, payload + data)
+
+    def invalidate(self) -> None:
+        """세대 번호를 올려 모든 워커의 모든 항목을 stale로 표시합니다."""
+        self._ensure_open()
+        with self._write_lock():
+            generation = int.from_bytes(self._generation_map[:8], "little")
+            self._generation_map[:8] = (generation + 1).to_bytes(8, "little")
+
+    def _evict(self) -> None:
+        """가장 오래 전에 저장된 항목부터 max_entries의 90%만 남기고 지웁니다. 쓰기 잠금 안에서 호출합니다."""
+        entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".entry")]
+        keep_count = self.max_entries * 9 // 10
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[:max(0, len(entries) - keep_count)]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+        self._set_entry_count(min(len(entries), keep_count))
+
+
+ResponseCacheBackend = ResponseCache | SharedResponseCache
+
+
+def _create_response_cache() -> ResponseCacheBackend:
+    """RESPONSE_CACHE_BACKEND 설정에 맞는 응답 캐시를 만듭니다."""
+    if settings.RESPONSE_CACHE_BACKEND == "shared":
+        return SharedResponseCache()
+    return ResponseCache()
+
+
+response_cache = _create_response_cache()
+
+# HIT 비율은 rate(hit) / (rate(hit) + rate(miss))로 계산합니다
+callback_metric(
+    "response_cache_requests_total", "Response cache lookups by result", "counter", ("result",),
+    lambda: {("hit",): response_cache.hits, ("miss",): response_cache.misses},
+)
+callback_metric(
+    "response_cache_skipped_writes_total",
+    "Shared response cache writes skipped due to lock contention or write errors",
+    "counter",
+    (),
+    lambda: {(): response_cache.skipped_writes},
+)
@@ -0,0 +1,216 @@
+import asyncio
+import gzip
+import re
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+from utils.cache_utils import CachedResponse, ResponseCacheBackend, response_cache
+
+try:
+    import brotli
+except ImportError:  # Brotli가 설치되지 않은 환경에서는 gzip만 사용
+    brotli = None
+
+# 캐시할 공개 GET 응답 (게시글 조회, 게시글 목록)
+CACHEABLE_PATHS = [re.compile(r"^/content$"), re.compile(r"^/content/\d+$")]
+
+# 이미 압축되어 있거나 스트리밍되는 응답은 압축하지 않습니다
+_SKIP_CONTENT_TYPES = (b"text/event-stream", b"application/gzip", b"image/")
+_EXCLUDED_HEADERS = {b"content-length", b"content-encoding", b"vary", b"x-cache"}
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Accept-Encoding을 보고 br > gzip 순으로 사용할 인코딩을 고릅니다."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip()] = quality
+
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.GZIP_LEVEL)
+
+
+def build_cache_key(path: str, query: list[tuple[str, str]]) -> str:
+    """path + 정렬된 query string으로 캐시 키를 만듭니다."""
+    return f"{path}?{urlencode(sorted(query))}"
+
+
+def make_cache_key(scope: Scope) -> str | None:
+    """캐시 대상 요청이면 캐시 키를 만들고, 아니면 None을 반환합니다."""
+    if scope["method"] != "GET" or not any(pattern.match(scope["path"]) for pattern in CACHEABLE_PATHS):
+        return None
+    return build_cache_key(scope["path"], parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True))
+
+
+def _request_header(scope: Scope, name: bytes) -> str:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return ""
+
+
+def _is_uncompressible(start_message: Message) -> bool:
+    headers = dict(start_message.get("headers", []))
+    return (
+        start_message["status"] in (204, 304)
+        or b"content-encoding" in headers
+        or headers.get(b"content-type", b"").startswith(_SKIP_CONTENT_TYPES)
+    )
+
+
+class CompressionMiddleware:
+    """
+    응답을 Brotli 또는 gzip으로 압축하는 ASGI 미들웨어.
+    게시글/목록 GET 응답은 ResponseCache에 저장하고, 압축 결과도 인코딩별로 함께 저장해서
+    같은 응답을 요청마다 다시 압축하지 않습니다.
+    """
+
+    def __init__(self, app: ASGIApp, cache: ResponseCacheBackend = response_cache):
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(_request_header(scope, b"accept-encoding"))
+        cache_key = make_cache_key(scope)
+
+        generation = None
+        if cache_key is not None:
+            entry = self.cache.get(cache_key)
+            if entry is not None:
+                await self.send_cached(send, cache_key, entry, encoding, cache_status=b"HIT")
+                return
+            # 처리 중에 게시글이 바뀌어 invalidate()되면 이 응답은 저장하지 않도록 시작 시점의 세대를 기억합니다
+            generation = self.cache.current_generation()
+
+        start_message: Message | None = None
+        body_chunks: list[bytes] = []
+        is_passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, is_passthrough
+            if is_passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                if _is_uncompressible(message):
+                    is_passthrough = True
+                    await send(message)
+                return
+
+            body_chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                if cache_key is None:
+                    # 여러 번에 나눠 보내는 스트리밍 응답은 모으지 않고 그대로 전달
+                    is_passthrough = True
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": b"".join(body_chunks), "more_body": True})
+                return
+
+            await self.send_collected(send, cache_key, generation, start_message, b"".join(body_chunks), encoding)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def send_collected(
+        self,
+        send: Send,
+        cache_key: str | None,
+        generation: int | None,
+        start_message: Message,
+        body: bytes,
+        encoding: str | None,
+    ) -> None:
+        """앱이 보낸 응답을 다 모은 뒤 stale 응답인지에 따라 나눠 보냅니다."""
+        entry = CachedResponse(
+            status_code=start_message["status"],
+            headers=[(k, v) for k, v in start_message.get("headers", []) if k.lower() not in _EXCLUDED_HEADERS],
+            body=body,
+        )
+        if (b"x-cache", b"STALE") in start_message.get("headers", []):
+            await self.send_stale(send, cache_key, entry, encoding)
+        else:
+            await self.store_and_send(send, cache_key, generation, entry, encoding)
+
+    async def send_stale(
+        self,
+        send: Send,
+        cache_key: str | None,
+        entry: CachedResponse,
+        encoding: str | None,
+    ) -> None:
+        """
+        과부하로 AdmissionControlMiddleware가 대신 보낸 stale 응답은 다시 캐시하지 않고,
+        캐시에 남아 있는 압축 변형을 그대로 사용합니다.
+        """
+        stale_entry = self.cache.get(cache_key, allow_stale=True) if cache_key is not None else None
+        if stale_entry is not None:
+            await self.send_cached(send, cache_key, stale_entry, encoding, cache_status=b"STALE")
+        else:
+            await self.send_cached(send, None, entry, encoding, cache_status=b"STALE")
+
+    async def store_and_send(
+        self,
+        send: Send,
+        cache_key: str | None,
+        generation: int | None,
+        entry: CachedResponse,
+        encoding: str | None,
+    ) -> None:
+        """캐시 대상인 200 응답은 저장한 뒤 MISS로 보내고, 그 외 응답은 압축만 해서 보냅니다."""
+        if cache_key is not None and entry.status_code == 200:
+            self.cache.set(cache_key, entry, generation)
+            await self.send_cached(send, cache_key, entry, encoding, cache_status=b"MISS")
+        else:
+            await self.send_cached(send, None, entry, encoding, cache_status=None)
+
+    async def send_cached(
+        self,
+        send: Send,
+        cache_key: str | None,
+        entry: CachedResponse,
+        encoding: str | None,
+        cache_status: bytes | None,
+    ) -> None:
+        body = entry.body
+        headers = list(entry.headers)
+        if encoding is not None and len(body) >= settings.COMPRESSION_MIN_SIZE:
+            compressed = entry.variants.get(encoding)
+            if compressed is None:
+                if len(body) >= settings.COMPRESSION_THREAD_MIN_SIZE:
+                    # 큰 응답(긴 목록 등)의 Brotli 압축은 수~수십 ms가 걸려 다른 요청을 막지 않도록 스레드에서 합니다
+                    compressed = await asyncio.to_thread(compress_body, body, encoding)
+                else:
+                    compressed = compress_body(body, encoding)
+                if cache_key is not None:
+                    self.cache.set_variant(cache_key, encoding, compressed)
+            body = compressed
+            headers.append((b"content-encoding", encoding.encode()))
+        headers.append((b"vary", b"Accept-Encoding"))
+        headers.append((b"content-length", str(len(body)).encode()))
+        if cache_status is not None:
+            headers.append((b"x-cache", cache_status))
+
+        await send({"type": "http.response.start", "status": entry.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -1,37 +1,164 @@
+import asyncio
+import logging
+import random
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+
+from fastapi import HTTPException
+from google.api_core.exceptions import Aborted, ServiceUnavailable
 from google.cloud.firestore import DocumentReference
 from google.cloud.firestore_v1.async_client import AsyncClient
+from google.cloud.firestore_v1.async_query import AsyncQuery
+from google.cloud.firestore_v1.async_transaction import AsyncTransaction
 from google.cloud.firestore_v1.base_query import And, FieldFilter
 
-from domain.service.counter_services import get_async_next_id
+from domain.service.counter_services import reserve_async_ids
+from exception import ConflictException
+from utils.hedge_utils import hedged_read
+from utils.resilience_utils import BACKEND_UNAVAILABLE_ERRORS, call
+from utils.tracing_utils import traced
+
+logger = logging.getLogger(__name__)
+
+
+def _is_same_instant(stored: object, expected: datetime) -> bool:
+    """저장된 updated_at과 클라이언트가 본 updated_at이 같은 시점인지 비교합니다."""
+    if not isinstance(stored, datetime):
+        return False
+    # timezone 정보가 없는 값은 UTC로 간주
+    if stored.tzinfo is None:
+        stored = stored.replace(tzinfo=timezone.utc)
+    if expected.tzinfo is None:
+        expected = expected.replace(tzinfo=timezone.utc)
+    return stored == expected
 
 
 class FirestoreService:
     def __init__(self, db: AsyncClient):
         self.db = db
+        self.max_transaction_attempts = 5
+        self.base_retry_delay = 0.1  # 100ms
+
+
+    def _increment_id_query(
+        self,
+        collection_name: str,
+        key_name: str,
+        increment_id: int,
+    ) -> AsyncQuery:
+        return (
+            self.db.collection(collection_name)
+            .where(
+                filter=And([
+                    FieldFilter(f"{key_name}", "==", increment_id),
+                    FieldFilter("is_deleted", "==", False)
+                ])
+            )
+            .limit(1)
+        )
+
+
+    @traced("FirestoreService.run_transaction")
+    async def run_transaction(
+        self,
+        callback: Callable[[AsyncTransaction], Awaitable[object]],
+        retry_unknown_commit: bool = False,
+    ) -> object:
+        """
+        callback을 하나의 트랜잭션 안에서 실행하고 커밋합니다.
+        경합(Aborted) 등 일시적인 오류는 지수 백오프로 재시도하고, 그 외 예외는 롤백 후 그대로 전파합니다.
+        커밋 요청을 보낸 뒤의 ServiceUnavailable은 커밋이 반영되었는지 알 수 없으므로, 반영된 뒤 다시 실행해도
+        안전한 callback일 때만(retry_unknown_commit) 재시도합니다. 그렇지 않으면 expected_updated_at 검사가
+        이미 반영된 자신의 쓰기를 다른 요청의 수정으로 보고 409를 낼 수 있습니다.
+        """
+        for attempt in range(self.max_transaction_attempts):
+            transaction = self.db.transaction()
+            commit_sent = False
+            try:
+                # 트랜잭션 시작도 커밋과 같이 일시적인 오류면 재시도합니다
+                await call("firestore", "write", transaction._begin, pass_timeout=False)
+                result = await callback(transaction)
+                if len(transaction) == 0:
+                    # 쓸 내용이 없으면(찾는 문서가 없는 경우 등) 커밋하지 않고 트랜잭션만 끝냅니다
+                    await self._rollback_quietly(transaction)
+                    return result
+                commit_sent = True
+                await call("firestore", "write", transaction._commit, pass_timeout=False)
+                return result
+            except (Aborted, ServiceUnavailable) as e:
+                await self._rollback_quietly(transaction)
+                is_outcome_unknown = commit_sent and isinstance(e, ServiceUnavailable)
+                if attempt == self.max_transaction_attempts - 1 or (is_outcome_unknown and not retry_unknown_commit):
+                    raise
+                # Exponential backoff with jitter
+                delay = self.base_retry_delay * (2 ** attempt) * (0.5 + random.random())
+                await asyncio.sleep(delay)
+            except Exception:
+                await self._rollback_quietly(transaction)
+                raise
+        return None
+
+
+    @staticmethod
+    async def _rollback_quietly(transaction: AsyncTransaction) -> None:
+        if not transaction.in_progress:
+            return
+        try:
+            await call("firestore", "write", transaction._rollback, pass_timeout=False)
+        except Exception:
+            logger.warning("Error rolling back transaction", exc_info=True)
 
 
+    @traced("FirestoreService.create_document_with_increment_id", attributes=("collection_name",))
     async def create_document_with_increment_id(
         self,
         collection_name: str,
         key_name: str,
         data: dict[str, object],
-    ) -> dict[str, object] | None:
-        next_id = await get_async_next_id(collection_name, self.db)
-        if next_id is None:
-            return None
+    ) -> dict[str, object]:
+        """
+        카운터 증가와 문서 생성을 하나의 트랜잭션으로 커밋합니다.
+        문서 ID를 미리 정해두므로, 커밋 결과를 받지 못해 재시도하더라도 문서나 increment ID가 중복 생성되지 않습니다.
 
-        try:
-            doc_ref: DocumentReference = self.db.collection(collection_name).document()
-            data[f"{key_name}"] = next_id
-            batch = self.db.batch()
-            batch.set(doc_ref, data)
-            await batch.commit() # 비동기 commit 호출
+        Raises:
+            google.api_core.exceptions.GoogleAPICallError: 재시도 후에도 커밋에 실패한 경우
+        """
+        doc_ref: DocumentReference = self.db.collection(collection_name).document()
+
+        async def create_in_transaction(transaction: AsyncTransaction) -> dict[str, object]:
+            snapshot = await call("firestore", "read", doc_ref.get, transaction=transaction)
+            if snapshot.exists:
+                # 이전 시도가 이미 커밋된 경우 그 결과를 그대로 반환
+                return {"document_id": doc_ref.id, f"{key_name}": snapshot.get(key_name)}
+
+            next_id = await reserve_async_ids(collection_name, self.db, transaction)
+            transaction.create(doc_ref, {**data, f"{key_name}": next_id})
             return {"document_id": doc_ref.id, f"{key_name}": next_id}
-        except Exception as e:
-            print(f"Error creating document: {e}")
-            return None
 
+        return await self.run_transaction(create_in_transaction, retry_unknown_commit=True)
 
+
+    @traced("FirestoreService.allocate_increment_ids", attributes=("collection_name", "count"))
+    async def allocate_increment_ids(
+        self,
+        collection_name: str,
+        count: int,
+    ) -> int:
+        """
+        count개의 연속된 increment ID를 하나의 카운터 트랜잭션으로 예약하고, 첫 번째 ID를 반환합니다.
+
+        Raises:
+            google.api_core.exceptions.GoogleAPICallError: 재시도 후에도 커밋에 실패한 경우
+            ServiceUnavailableException, GatewayTimeoutException: circuit breaker가 열렸거나 deadline을 넘긴 경우
+        """
+        # 이미 반영된 예약을 다시 하면 빈 번호만 남고 구간이 겹치지는 않으므로 재시도합니다
+        return await self.run_transaction(
+            lambda transaction: reserve_async_ids(collection_name, self.db, transaction, count),
+            retry_unknown_commit=True,
+        )
+
+
+    @traced("FirestoreService.get_document_by_increment_id", attributes=("collection_name", "increment_id"))
     async def get_document_by_increment_id(
         self,
         collection_name: str,
@@ -39,23 +166,99 @@ class FirestoreService:
         increment_id: int,
     ) -> dict[str, object] | None:
         try:
-            query = (
-                self.db.collection(collection_name)
-                .where(
-                    filter=And([
-                        FieldFilter(f"{key_name}", "==", increment_id),
-                        FieldFilter("is_deleted", "==", False)
-                    ])
-                )
-                .limit(1)
+            query = self._increment_id_query(collection_name, key_name, increment_id)
+            result = await hedged_read(
+                f"firestore.{collection_name}.get_by_increment_id", lambda: call("firestore", "read", query.get)
             )
-            result = await query.get()
             if result:
                 document = result[0]
                 data = document.to_dict()
                 data['document_id'] = document.id  # 문서 ID를 딕셔너리에 추가
                 return data
             return None
-        except Exception as e:
-            print(f"Error fetching document: {e}")
+        except (HTTPException, *BACKEND_UNAVAILABLE_ERRORS):
+            # deadline 초과, circuit breaker, 백엔드 장애로 인한 실패는 "없음"(404)으로 바꾸지 않고 그대로 전달
+            raise
+        except Exception:
+            logger.exception(
+                "Error fetching document",
+                extra={"collection": collection_name, "key_name": key_name, "increment_id": increment_id},
+            )
             return None
+
+
+    @traced("FirestoreService.get_documents_by_increment_ids", attributes=("collection_name",))
+    async def get_documents_by_increment_ids(
+        self,
+        collection_name: str,
+        key_name: str,
+        increment_ids: list[int],
+    ) -> dict[int, dict[str, object]]:
+        """
+        여러 increment ID의 문서를 `in` 쿼리 한 번으로 조회합니다. (Firestore `in`은 최대 30개)
+
+        Returns:
+            increment ID -> 문서 (document_id 포함). 없거나 삭제된 문서는 포함되지 않습니다.
+        """
+        if not increment_ids:
+            return {}
+
+        query = self.db.collection(collection_name).where(
+            filter=And([
+                FieldFilter(f"{key_name}", "in", increment_ids),
+                FieldFilter("is_deleted", "==", False)
+            ])
+        )
+        documents = {}
+        for document in await call("firestore", "read", query.get):
+            data = document.to_dict()
+            data['document_id'] = document.id  # 문서 ID를 딕셔너리에 추가
+            documents[data[key_name]] = data
+        return documents
+
+    @traced("FirestoreService.update_document_by_increment_id", attributes=("collection_name", "increment_id"))
+    async def update_document_by_increment_id(
+        self,
+        collection_name: str,
+        key_name: str,
+        increment_id: int,
+        data: dict[str, object],
+        expected_updated_at: datetime | None = None,
+    ) -> dict[str, object] | None:
+        """
+        increment_id로 삭제되지 않은 문서를 찾아 하나의 트랜잭션 안에서 수정합니다.
+
+        Args:
+            collection_name: 컬렉션 이름
+            key_name: increment ID 필드 이름
+            increment_id: 찾을 increment ID
+            data: 수정할 필드 (비어 있으면 조회만 합니다)
+            expected_updated_at: 클라이언트가 마지막으로 본 updated_at. 지정하면 저장된 값과 다를 때 충돌로 처리합니다.
+
+        Returns:
+            수정 내용이 병합된 문서 (document_id 포함). 문서가 없으면 None.
+
+        Raises:
+            ConflictException: expected_updated_at이 저장된 updated_at과 다른 경우
+        """
+        query = self._increment_id_query(collection_name, key_name, increment_id)
+
+        async def update_in_transaction(transaction: AsyncTransaction) -> dict[str, object] | None:
+            result = await call("firestore", "read", query.get, transaction=transaction)
+            if not result:
+                return None
+
+            document = result[0]
+            document_data = document.to_dict()
+            if expected_updated_at is not None and not _is_same_instant(
+                document_data.get("updated_at"), expected_updated_at
+            ):
+                raise ConflictException("Content has been modified by another request")
+
+            if data:
+                transaction.update(document.reference, data)
+            document_data.update(data)
+            document_data["document_id"] = document.id
+            return document_data
+
+        return await self.run_transaction(update_in_transaction)
@@ -0,0 +1,271 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from config import settings
+from database import get_firestore_client
+from domain.schema.content_schemas import RouteResGetContent
+from utils.shared_utils import encode_change_token
+
+logger = logging.getLogger(__name__)
+
+
+def build_content_event(document_id: str, content_data: dict[str, object], is_created: bool) -> dict[str, object]:
+    """
+    게시글 문서를 SSE로 보낼 create/update/delete 이벤트로 변환합니다.
+    is_created는 문서의 created_at 필드(가져오기에서는 원본 작성일)가 아니라 스냅샷의 변경 종류와
+    Firestore 문서 메타데이터로 판단해 넘깁니다.
+    """
+    if content_data.get("is_deleted"):
+        event_type = "delete"
+        payload = {"content_id": document_id, "post_number": content_data["post_number"]}
+    else:
+        event_type = "create" if is_created else "update"
+        payload = RouteResGetContent(content_id=document_id, **content_data).model_dump(mode="json")
+
+    payload["category"] = content_data.get("category")
+    return {
+        "id": encode_change_token(content_data["updated_at"], document_id),
+        "type": event_type,
+        "category": content_data.get("category"),
+        "sort_key": (content_data["updated_at"], document_id),
+        "data": jsonable_encoder(payload),
+    }
+
+
+class ContentSubscriber:
+    def __init__(self, category: str | None, queue_size: int):
+        self.category = category
+        # None은 스트림을 끝내라는 신호 (느린 구독자 정리)
+        self.queue: asyncio.Queue[dict[str, object] | None] = asyncio.Queue(maxsize=queue_size)
+        self.is_dropped = False
+
+    def accepts(self, event: dict[str, object]) -> bool:
+        return self.category is None or event["category"] == self.category
+
+
+class ContentEventHub:
+    """
+    contents 컬렉션 변경을 구독자들에게 나눠주는 프로세스 단위 broadcast hub.
+    Firestore 리스너는 첫 구독 시 프로세스당 하나만 열고, 구독자마다 크기가 제한된 큐를 둡니다.
+    큐가 가득 찬 느린 구독자는 끊어서 Last-Event-ID로 다시 접속하게 합니다.
+    리스너가 오류로 끊기면 백오프하며 다시 구독하고, 그 사이 놓친 변경은 /content/changes로 다시 받도록
+    모든 구독자에게 reset 이벤트를 보냅니다.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = settings.SSE_QUEUE_SIZE,
+        history_size: int = settings.SSE_HISTORY_SIZE,
+    ):
+        self.queue_size = queue_size
+        self.subscribers: set[ContentSubscriber] = set()
+        # Last-Event-ID 재개를 위한 최근 이벤트
+        self.history: deque[dict[str, object]] = deque(maxlen=history_size)
+        self._watch = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._supervisor: asyncio.Task | None = None
+        self._watch_opened_at = 0.0
+        # 리스너로 받은 가장 최근 변경의 (updated_at, document_id). 기준 시각을 옮길 때 이어서 받을 위치입니다
+        self._latest_sort_key: tuple[datetime, str] | None = None
+        # 기준 시각을 옮긴 리스너의 첫 스냅샷에서 건너뛸 이미 받은 변경의 위치
+        self._resume_after: tuple[datetime, str] | None = None
+        self._change_handlers: list[Callable[[str, dict[str, object]], None]] = []
+        self._reset_handlers: list[Callable[[], None]] = []
+
+    def add_change_handler(
+        self,
+        on_change: Callable[[str, dict[str, object]], None],
+        on_reset: Callable[[], None] | None = None,
+    ) -> None:
+        """
+        SSE 구독자와 별개로 모든 게시글 변경 문서를 (document_id, content_data)로 받을 콜백을 등록합니다.
+        리스너가 다시 연결되어 그 사이 변경을 놓쳤을 수 있으면 on_reset을 호출합니다. 둘 다 이벤트 루프에서 호출됩니다.
+        """
+        self._change_handlers.append(on_change)
+        if on_reset is not None:
+            self._reset_handlers.append(on_reset)
+
+    def start(self) -> None:
+        """구독자가 없어도 리스너를 엽니다. 이벤트 루프 안에서 호출합니다."""
+        self._ensure_listener()
+
+    def subscribe(self, category: str | None = None) -> ContentSubscriber:
+        self._ensure_listener()
+        subscriber = ContentSubscriber(category, self.queue_size)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: ContentSubscriber) -> None:
+        self.subscribers.discard(subscriber)
+
+    def events_after(self, event_id: str, category: str | None = None) -> list[dict[str, object]] | None:
+        """history에서 event_id 이후의 이벤트를 반환합니다. event_id가 history에 없으면 None."""
+        events = list(self.history)
+        for index, event in enumerate(events):
+            if event["id"] == event_id:
+                return [e for e in events[index + 1:] if category is None or e["category"] == category]
+        return None
+
+    def publish(self, event: dict[str, object]) -> None:
+        self.history.append(event)
+        for subscriber in list(self.subscribers):
+            if subscriber.is_dropped or not subscriber.accepts(event):
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+
+    def publish_reset(self) -> None:
+        """
+        리스너가 끊겨 있던 동안의 변경을 놓쳤음을 알립니다. 클라이언트는 data.since를 /content/changes의 since로
+        넘겨 다시 맞춥니다. history는 더 이상 연속적이지 않으므로 비워서 Last-Event-ID 재개가 Firestore를 읽게 합니다.
+        """
+        since = self.history[-1]["id"] if self.history else None
+        self.history.clear()
+        event = {"id": None, "type": "reset", "category": None, "sort_key": None, "data": {"since": since}}
+        for subscriber in list(self.subscribers):
+            if subscriber.is_dropped:
+                continue
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+        for handler in self._reset_handlers:
+            handler()
+
+    def _drop(self, subscriber: ContentSubscriber) -> None:
+        subscriber.is_dropped = True
+        self.subscribers.discard(subscriber)
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(None)
+
+    def _ensure_listener(self) -> None:
+        if self._supervisor is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        try:
+            self._open_watch()
+        except Exception:
+            # 구독을 못 열어도 _supervise()가 백오프하며 다시 시도합니다
+            logger.warning("Opening content change listener failed", exc_info=True)
+        self._supervisor = asyncio.create_task(self._supervise())
+
+    def _open_watch(self, resume_after: tuple[datetime, str] | None = None) -> None:
+        # 리스너 시작(또는 resume_after) 이후에 바뀐 문서만 받도록 updated_at으로 범위를 제한합니다
+        anchor = resume_after[0] if resume_after is not None else datetime.now(timezone.utc)
+        listen_query = (
+            get_firestore_client()
+            .collection("contents")
+            .where(filter=FieldFilter("updated_at", ">=", anchor))
+        )
+        self._resume_after = resume_after
+        self._watch = listen_query.on_snapshot(self._on_snapshot)
+        self._watch_opened_at = time.monotonic()
+
+    def _reanchor_watch(self) -> None:
+        """
+        리스너 쿼리 결과는 기준 시각 이후에 바뀐 모든 문서라서 시간이 지날수록 커지고,
+        watch는 그 결과 전체를 유지합니다.
+        주기적으로 기준 시각을 마지막으로 받은 변경으로 옮겨 다시 구독해 결과를 최근 변경으로 제한합니다.
+        옮기는 동안의 변경은 새 리스너의 첫 스냅샷으로 받으므로 reset을 보내지 않습니다.
+        """
+        self._watch_opened_at = time.monotonic()
+        if self._latest_sort_key is None:
+            # 받은 변경이 없으면 결과도 비어 있습니다
+            return
+        self._close_watch()
+        try:
+            self._open_watch(resume_after=self._latest_sort_key)
+        except Exception:
+            # 다음 확인에서 _supervise()가 다시 구독하고 reset을 보냅니다
+            logger.warning("Re-anchoring content change listener failed", exc_info=True)
+
+    def _close_watch(self) -> None:
+        watch, self._watch = self._watch, None
+        if watch is None:
+            return
+        try:
+            watch.unsubscribe()
+        except Exception:
+            logger.debug("Closing content change listener failed", exc_info=True)
+
+    async def _supervise(self) -> None:
+        """
+        Firestore watch는 복구할 수 없는 오류로 스트림이 끝나면 콜백 없이 조용히 닫히므로,
+        주기적으로 is_active를 확인해 다시 구독합니다.
+        """
+        backoff = 1.0
+        while True:
+            await asyncio.sleep(settings.SSE_WATCH_CHECK_SECONDS)
+            if self._watch is not None and self._watch.is_active:
+                if time.monotonic() - self._watch_opened_at >= settings.SSE_WATCH_REANCHOR_SECONDS:
+                    self._reanchor_watch()
+                continue
+
+            logger.warning("Content change listener stopped, resubscribing")
+            self._close_watch()
+            while True:
+                try:
+                    self._open_watch()
+                    break
+                except Exception:
+                    logger.warning("Resubscribing content change listener failed", exc_info=True)
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, settings.SSE_WATCH_MAX_BACKOFF_SECONDS)
+            backoff = 1.0
+            self.publish_reset()
+
+    def _on_snapshot(self, documents, changes, read_time) -> None:
+        # Firestore watch 스레드에서 호출되므로 이벤트 루프로 넘겨서 처리합니다
+        resume_after, self._resume_after = self._resume_after, None
+        changed_documents = []
+        events = []
+        for change in changes:
+            if change.type.name == "REMOVED":
+                continue
+            document = change.document
+            content_data = document.to_dict()
+            sort_key = (content_data["updated_at"], document.id)
+            # 기준 시각을 옮긴 리스너의 첫 스냅샷에는 이전 리스너로 이미 받은 변경이 다시 들어 있습니다
+            if resume_after is not None and sort_key <= resume_after:
+                continue
+            if self._latest_sort_key is None or sort_key > self._latest_sort_key:
+                self._latest_sort_key = sort_key
+            # 결과에 처음 들어온(ADDED) 문서 중에서도 만들어진 뒤 수정되지 않은 문서만 새 글입니다.
+            # 리스너 시작 전에 만들어진 문서가 수정되어 결과에 들어와도 ADDED로 옵니다
+            is_created = change.type.name == "ADDED" and document.create_time == document.update_time
+            changed_documents.append((document.id, content_data))
+            events.append(build_content_event(document.id, content_data, is_created))
+        if self._change_handlers:
+            self._loop.call_soon_threadsafe(self._notify_change_handlers, changed_documents)
+        events.sort(key=lambda event: event["sort_key"])
+        for event in events:
+            self._loop.call_soon_threadsafe(self.publish, event)
+
+    def _notify_change_handlers(self, changed_documents: list[tuple[str, dict[str, object]]]) -> None:
+        for handler in self._change_handlers:
+            for document_id, content_data in changed_documents:
+                try:
+                    handler(document_id, content_data)
+                except Exception:
+                    logger.exception("Content change handler failed", extra={"document_id": document_id})
+
+    def stop(self) -> None:
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            self._supervisor = None
+        self._close_watch()
+        for subscriber in list(self.subscribers):
+            self._drop(subscriber)
+
+
+content_event_hub = ContentEventHub()
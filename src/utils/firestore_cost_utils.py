@@ -0,0 +1,242 @@
+import logging
+import math
+import time
+from collections.abc import AsyncIterator
+from contextvars import ContextVar
+
+from google.cloud import firestore
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+from utils.metrics_utils import counter, histogram, inc, observe, route_template
+
+logger = logging.getLogger(__name__)
+
+# 요청 밖(워밍업, 스냅샷, 검색 색인)에서 생긴 사용량은 이 라벨로 집계합니다
+BACKGROUND_ROUTE = "background"
+
+# 집계 쿼리는 인덱스 항목 1,000개당 읽기 1회로 과금됩니다
+_AGGREGATION_ENTRIES_PER_READ = 1000
+
+firestore_operations_total = counter(
+    "firestore_operations_total",
+    "Billable Firestore operations attributed to the route that caused them",
+    ("route", "operation"),
+)
+firestore_reads_per_request = histogram(
+    "firestore_reads_per_request",
+    "Firestore document reads per HTTP request",
+    ("route",),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+
+
+class FirestoreCost:
+    """한 요청(또는 백그라운드 작업)이 쓴 Firestore 읽기/쓰기/삭제 수와 스캔한 인덱스 항목 수."""
+
+    __slots__ = ("reads", "writes", "deletes", "index_entries")
+
+    def __init__(self):
+        self.reads = 0
+        self.writes = 0
+        self.deletes = 0
+        self.index_entries = 0
+
+    def as_header(self) -> bytes:
+        return (
+            f"reads={self.reads}, writes={self.writes}, deletes={self.deletes}, index_entries={self.index_entries}"
+        ).encode()
+
+
+_request_cost: ContextVar[FirestoreCost | None] = ContextVar("firestore_request_cost", default=None)
+
+
+def _record(reads: int = 0, writes: int = 0, deletes: int = 0, index_entries: int = 0) -> None:
+    cost = _request_cost.get()
+    if cost is not None:
+        # 요청 안의 사용량은 요청이 끝날 때 경로 라벨과 함께 지표로 옮깁니다
+        cost.reads += reads
+        cost.writes += writes
+        cost.deletes += deletes
+        cost.index_entries += index_entries
+        return
+    _add_to_metrics(BACKGROUND_ROUTE, reads, writes, deletes, index_entries)
+
+
+def _add_to_metrics(route: str, reads: int, writes: int, deletes: int, index_entries: int) -> None:
+    for operation, amount in (("read", reads), ("write", writes), ("delete", deletes), ("index_entry", index_entries)):
+        if amount:
+            inc(firestore_operations_total, (route, operation), amount)
+
+
+def _field(message: object, name: str) -> object:
+    # 라이브러리는 요청을 dict로 넘기지만 proto 메시지로 넘겨도 같게 읽습니다
+    if isinstance(message, dict):
+        return message.get(name)
+    return getattr(message, name, None)
+
+
+def _describe_filter(filter_pb) -> list[str]:
+    if filter_pb is None:
+        return []
+    if "composite_filter" in filter_pb:
+        return [part for child in filter_pb.composite_filter.filters for part in _describe_filter(child)]
+    if "field_filter" in filter_pb:
+        return [f"{filter_pb.field_filter.field.field_path} {filter_pb.field_filter.op.name}"]
+    if "unary_filter" in filter_pb:
+        return [f"{filter_pb.unary_filter.field.field_path} {filter_pb.unary_filter.op.name}"]
+    return []
+
+
+def describe_query(structured_query) -> str:
+    """
+    쿼리 형태를 값 없이 문자열로 만듭니다.
+    예: `contents where is_deleted EQUAL, category EQUAL order_by post_number DESCENDING offset 20 limit 10`
+    """
+    parts = [",".join(collection.collection_id for collection in structured_query.from_) or "?"]
+    filters = _describe_filter(structured_query.where if "where" in structured_query else None)
+    if filters:
+        parts.append("where " + ", ".join(filters))
+    if structured_query.order_by:
+        orders = (f"{order.field.field_path} {order.direction.name}" for order in structured_query.order_by)
+        parts.append("order_by " + ", ".join(orders))
+    if structured_query.offset:
+        parts.append(f"offset {structured_query.offset}")
+    if "limit" in structured_query:
+        parts.append(f"limit {structured_query.limit}")
+    return " ".join(parts)
+
+
+def _log_if_slow_or_expensive(kind: str, shape: str, elapsed: float, reads: int) -> None:
+    if elapsed >= settings.FIRESTORE_SLOW_QUERY_SECONDS or reads >= settings.FIRESTORE_EXPENSIVE_QUERY_READS:
+        logger.warning(
+            "Slow or expensive Firestore %s: %s", kind, shape,
+            extra={"elapsed_seconds": round(elapsed, 3), "reads": reads, "query_shape": shape},
+        )
+
+
+class InstrumentedFirestoreApi:
+    """
+    AsyncClient 안쪽 GAPIC 클라이언트를 감싸서 RPC 응답으로 실제 과금되는 읽기/쓰기/삭제 수를 셉니다.
+    쿼리는 반환된 문서와 offset으로 건너뛴 문서(skipped_results) 모두 읽기로 과금되고, 결과가 없어도 1회가 과금됩니다.
+    나머지 속성(transport 등)은 그대로 넘깁니다.
+    """
+
+    def __init__(self, api):
+        self._api = api
+
+    def __getattr__(self, name: str):
+        return getattr(self._api, name)
+
+    async def run_query(self, request=None, **kwargs) -> AsyncIterator[object]:
+        return self._count_query(await self._api.run_query(request=request, **kwargs), request)
+
+    async def _count_query(self, responses: AsyncIterator[object], request) -> AsyncIterator[object]:
+        # 호출한 쪽이 스트림을 끝까지 읽지 않고 멈출 수 있으므로 응답을 받을 때마다 바로 기록합니다
+        started_at = time.perf_counter()
+        reads = 0
+        try:
+            async for response in responses:
+                scanned = response.skipped_results + (1 if "document" in response else 0)
+                if scanned:
+                    reads += scanned
+                    _record(reads=scanned, index_entries=scanned)
+                yield response
+        finally:
+            if reads == 0:
+                # 결과가 없는 쿼리도 읽기 1회로 과금됩니다
+                _record(reads=1)
+            structured_query = _field(request, "structured_query")
+            if structured_query is not None:
+                elapsed = time.perf_counter() - started_at
+                _log_if_slow_or_expensive("query", describe_query(structured_query), elapsed, max(1, reads))
+
+    async def run_aggregation_query(self, request=None, **kwargs) -> AsyncIterator[object]:
+        return self._count_aggregation(await self._api.run_aggregation_query(request=request, **kwargs), request)
+
+    async def _count_aggregation(self, responses: AsyncIterator[object], request) -> AsyncIterator[object]:
+        started_at = time.perf_counter()
+        reads = 0
+        try:
+            async for response in responses:
+                if "result" in response:
+                    # count() 결과가 곧 스캔한 인덱스 항목 수입니다
+                    index_entries = sum(
+                        value.integer_value for value in response.result.aggregate_fields.values()
+                        if "integer_value" in value
+                    )
+                    reads = max(1, math.ceil(index_entries / _AGGREGATION_ENTRIES_PER_READ))
+                    _record(reads=reads, index_entries=index_entries)
+                yield response
+        finally:
+            if reads == 0:
+                _record(reads=1)
+            aggregation_query = _field(request, "structured_aggregation_query")
+            if aggregation_query is not None:
+                shape = "count " + describe_query(aggregation_query.structured_query)
+                _log_if_slow_or_expensive("aggregation", shape, time.perf_counter() - started_at, max(1, reads))
+
+    async def batch_get_documents(self, request=None, **kwargs) -> AsyncIterator[object]:
+        return self._count_batch_get(await self._api.batch_get_documents(request=request, **kwargs))
+
+    async def _count_batch_get(self, responses: AsyncIterator[object]) -> AsyncIterator[object]:
+        async for response in responses:
+            # 없는 문서를 조회해도 읽기 1회로 과금됩니다
+            if "found" in response or "missing" in response:
+                _record(reads=1)
+            yield response
+
+    def _count_writes(self, request) -> None:
+        writes = _field(request, "writes") or []
+        deletes = sum(1 for write in writes if "delete" in write)
+        _record(writes=len(writes) - deletes, deletes=deletes)
+
+    async def commit(self, request=None, **kwargs):
+        response = await self._api.commit(request=request, **kwargs)
+        self._count_writes(request)
+        return response
+
+    async def batch_write(self, request=None, **kwargs):
+        response = await self._api.batch_write(request=request, **kwargs)
+        self._count_writes(request)
+        return response
+
+
+def instrument_firestore_client(client: firestore.AsyncClient) -> firestore.AsyncClient:
+    """AsyncClient가 쓰는 GAPIC 클라이언트를 InstrumentedFirestoreApi로 바꿔 끼웁니다."""
+    if not isinstance(client._firestore_api, InstrumentedFirestoreApi):
+        client._firestore_api_internal = InstrumentedFirestoreApi(client._firestore_api)
+    return client
+
+
+class FirestoreCostMiddleware:
+    """
+    요청마다 Firestore 사용량을 모아 경로 템플릿 라벨로 지표에 더합니다.
+    FIRESTORE_COST_HEADER_ENABLED면 응답 헤더(X-Firestore-Cost)로도 보여줍니다 (헤더는 응답 시작 시점까지의 값).
+    """
+
+    def __init__(self, app: ASGIApp, routes: list[BaseRoute]):
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.FIRESTORE_COST_TRACKING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        cost = FirestoreCost()
+        token = _request_cost.set(cost)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.FIRESTORE_COST_HEADER_ENABLED:
+                message["headers"] = [*message.get("headers", []), (b"x-firestore-cost", cost.as_header())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_cost.reset(token)
+            route = route_template(scope, self.routes)
+            _add_to_metrics(route, cost.reads, cost.writes, cost.deletes, cost.index_entries)
+            observe(firestore_reads_per_request, (route,), cost.reads)
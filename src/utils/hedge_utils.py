@@ -0,0 +1,141 @@
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+
+from config import settings
+from utils.metrics_utils import callback_metric
+
+
+class LatencyTracker:
+    """최근 window_size번의 응답 시간으로 백분위 값을 계산합니다."""
+
+    def __init__(self, window_size: int = settings.HEDGE_LATENCY_WINDOW_SIZE):
+        self._samples: deque[float] = deque(maxlen=window_size)
+        self._percentile_cache: dict[float, float] = {}
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+        self._percentile_cache.clear()
+
+    def percentile(self, quantile: float) -> float | None:
+        """샘플이 HEDGE_MIN_SAMPLES보다 적으면 None을 반환합니다."""
+        if len(self._samples) < settings.HEDGE_MIN_SAMPLES:
+            return None
+        if quantile not in self._percentile_cache:
+            ordered = sorted(self._samples)
+            self._percentile_cache[quantile] = ordered[min(len(ordered) - 1, math.ceil(quantile * len(ordered)) - 1)]
+        return self._percentile_cache[quantile]
+
+
+class HedgedReader:
+    """
+    멱등한 읽기를 헤지(hedge)합니다. 첫 요청이 최근 p95 안에 응답하지 않으면 같은 요청을 한 번 더 보내
+    먼저 끝난 결과를 쓰고 나머지는 취소합니다.
+    추가 요청 수는 전체 요청의 budget_ratio 이하로 제한해서 읽기 비용이 크게 늘지 않게 합니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        budget_ratio: float = settings.HEDGE_BUDGET_RATIO,
+        quantile: float = settings.HEDGE_PERCENTILE,
+    ):
+        self.name = name
+        self.budget_ratio = budget_ratio
+        self.quantile = quantile
+        self.latency = LatencyTracker()
+        # 지표
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_exhausted = 0
+
+    def _has_budget(self) -> bool:
+        return self.hedged + 1 <= self.requests * self.budget_ratio
+
+    async def read(self, make_call: Callable[[], Awaitable[object]]) -> object:
+        self.requests += 1
+        started_at = time.monotonic()
+        primary = asyncio.ensure_future(make_call())
+        hedge_delay = self.latency.percentile(self.quantile)
+
+        try:
+            if hedge_delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+                if not done:
+                    if self._has_budget():
+                        return await self._race(primary, make_call, started_at)
+                    self.budget_exhausted += 1
+            result = await primary
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        self.latency.record(time.monotonic() - started_at)
+        return result
+
+    async def _race(
+        self,
+        primary: asyncio.Future,
+        make_call: Callable[[], Awaitable[object]],
+        started_at: float,
+    ) -> object:
+        self.hedged += 1
+        hedge_started_at = time.monotonic()
+        hedge = asyncio.ensure_future(make_call())
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # 성공한 결과를 먼저 봅니다
+                for task in sorted(done, key=lambda task: task.exception() is not None):
+                    # 실패한 쪽은 다른 요청이 끝날 때까지 기다리고, 둘 다 실패하면 마지막 예외를 전파합니다
+                    if task.exception() is not None and pending:
+                        continue
+                    if task is hedge and task.exception() is None:
+                        self.hedge_wins += 1
+                    self.latency.record(time.monotonic() - (hedge_started_at if task is hedge else started_at))
+                    return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "budget_exhausted": self.budget_exhausted,
+            "hedge_delay_seconds": self.latency.percentile(self.quantile),
+        }
+
+
+hedged_readers: dict[str, HedgedReader] = {}
+
+callback_metric(
+    "hedged_read_requests_total", "Reads issued through hedged_read per read name", "counter", ("read",),
+    lambda: {(name,): reader.requests for name, reader in hedged_readers.items()},
+)
+callback_metric(
+    "hedged_read_hedges_total", "Extra hedge requests sent per read name", "counter", ("read",),
+    lambda: {(name,): reader.hedged for name, reader in hedged_readers.items()},
+)
+callback_metric(
+    "hedged_read_hedge_wins_total", "Hedge requests that finished before the original per read name", "counter",
+    ("read",),
+    lambda: {(name,): reader.hedge_wins for name, reader in hedged_readers.items()},
+)
+
+
+async def hedged_read(name: str, make_call: Callable[[], Awaitable[object]]) -> object:
+    """
+    HEDGED_READS_ENABLED일 때 make_call()을 헤지해서 실행합니다. 꺼져 있으면 그대로 한 번 호출합니다.
+    make_call은 호출할 때마다 새 요청을 만드는 멱등한 읽기여야 합니다.
+    예: `await hedged_read("content.get", lambda: call("firestore", "read", query.get))`
+    """
+    if not settings.HEDGED_READS_ENABLED:
+        return await make_call()
+    if name not in hedged_readers:
+        hedged_readers[name] = HedgedReader(name)
+    return await hedged_readers[name].read(make_call)
@@ -0,0 +1,280 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException, UploadFile, status
+from fastapi.encoders import jsonable_encoder
+from google.api_core.exceptions import AlreadyExists, FailedPrecondition
+from google.cloud.firestore_v1.async_client import AsyncClient
+
+from config import settings
+from utils.resilience_utils import call
+
+logger = logging.getLogger(__name__)
+
+
+def _hash_file(file: UploadFile) -> str:
+    digest = hashlib.sha256()
+    file.file.seek(0)
+    while chunk := file.file.read(1024 * 1024):
+        digest.update(chunk)
+    file.file.seek(0)
+    return digest.hexdigest()
+
+
+async def make_request_fingerprint(
+    fields: dict[str, object],
+    files: list[UploadFile] | None = None,
+) -> str:
+    """
+    같은 Idempotency-Key로 다른 요청이 들어왔는지 판별하기 위한 요청 지문을 만듭니다.
+    파일은 이름과 타입에 내용의 해시까지 넣어, 같은 이름의 다른 이미지가 처음 응답을 재생하지 않게 합니다.
+    내용 해시는 이벤트 루프를 막지 않도록 스레드에서 계산합니다.
+    """
+    digest = hashlib.sha256()
+    for key in sorted(fields):
+        digest.update(f"{key}={fields[key]}\n".encode())
+    for file in files or []:
+        file_hash = await asyncio.to_thread(_hash_file, file)
+        digest.update(f"file={file.filename}:{file.content_type}:{file_hash}\n".encode())
+    return digest.hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Idempotency-Key 기반 응답 저장소.
+    완료된 응답은 TTL 동안 Firestore에 저장하고, 같은 프로세스에서는 메모리에서 바로 재생합니다.
+    동시에 들어온 중복 요청은 처음 요청의 처리가 끝날 때까지 기다렸다가 같은 응답을 받습니다.
+    """
+
+    def __init__(
+        self,
+        collection_name: str = "idempotency_keys",
+        ttl_seconds: int = settings.IDEMPOTENCY_TTL_SECONDS,
+        lock_timeout_seconds: int = settings.IDEMPOTENCY_LOCK_TIMEOUT_SECONDS,
+        max_memory_entries: int = settings.IDEMPOTENCY_MEMORY_MAX_ENTRIES,
+    ):
+        self.collection_name = collection_name
+        self.ttl_seconds = ttl_seconds
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self.max_memory_entries = max_memory_entries
+        self.poll_interval = 0.2  # 다른 프로세스의 처리 완료를 확인하는 간격
+        # 처리 중인 요청이 잠금의 heartbeat_at을 갱신하는 간격. lock_timeout 동안 갱신이 없으면 중단된 요청으로 봅니다
+        self.heartbeat_interval = lock_timeout_seconds / 3
+        # storage_key -> (만료 시각(monotonic), fingerprint, response)
+        self._completed: dict[str, tuple[float, str, object]] = {}
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def _storage_key(scope: str, key: str) -> str:
+        return hashlib.sha256(f"{scope}:{key}".encode()).hexdigest()
+
+    @staticmethod
+    def _mismatch_exception() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used with a different request"
+        )
+
+    def _remember(self, storage_key: str, fingerprint: str, response: object) -> None:
+        if len(self._completed) >= self.max_memory_entries:
+            # 가장 먼저 저장된 항목부터 제거
+            self._completed.pop(next(iter(self._completed)))
+        self._completed[storage_key] = (time.monotonic() + self.ttl_seconds, fingerprint, response)
+
+    def _recall(self, storage_key: str, fingerprint: str) -> tuple[bool, object]:
+        entry = self._completed.get(storage_key)
+        if entry is None:
+            return False, None
+        expires_at, stored_fingerprint, response = entry
+        if expires_at < time.monotonic():
+            self._completed.pop(storage_key, None)
+            return False, None
+        if stored_fingerprint != fingerprint:
+            raise self._mismatch_exception()
+        return True, response
+
+    async def run(
+        self,
+        db: AsyncClient,
+        scope: str,
+        key: str | None,
+        fingerprint: str,
+        handler: Callable[[], Awaitable[object]],
+    ) -> tuple[object, bool]:
+        """
+        handler를 Idempotency-Key 단위로 한 번만 실행합니다.
+
+        Args:
+            db: Firestore client
+            scope: 엔드포인트 구분자 (예: "content:create")
+            key: 클라이언트가 보낸 Idempotency-Key. 없으면 handler를 그대로 실행합니다.
+            fingerprint: 요청 지문 (make_request_fingerprint)
+            handler: 실제 처리를 수행하는 코루틴 함수
+
+        Returns:
+            (JSON 호환 응답, 저장된 응답을 재생했는지 여부)
+        """
+        if not key:
+            return jsonable_encoder(await handler()), False
+
+        storage_key = self._storage_key(scope, key)
+
+        # 1. 메모리 fast path
+        is_found, response = self._recall(storage_key, fingerprint)
+        if is_found:
+            return response, True
+
+        # 2. 같은 프로세스에서 처리 중인 요청이 있으면 그 결과를 기다림
+        in_flight = self._in_flight.get(storage_key)
+        if in_flight is not None:
+            stored_fingerprint, response = await asyncio.shield(in_flight)
+            if stored_fingerprint != fingerprint:
+                raise self._mismatch_exception()
+            return response, True
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[storage_key] = future
+        try:
+            response, is_replayed = await self._run_with_firestore(db, storage_key, fingerprint, handler)
+            future.set_result((fingerprint, response))
+            return response, is_replayed
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 기다리는 요청이 없어도 "exception was never retrieved" 경고가 나지 않도록 처리
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(storage_key, None)
+
+    async def _run_with_firestore(
+        self,
+        db: AsyncClient,
+        storage_key: str,
+        fingerprint: str,
+        handler: Callable[[], Awaitable[object]],
+    ) -> tuple[object, bool]:
+        doc_ref = db.collection(self.collection_name).document(storage_key)
+        deadline = time.monotonic() + self.lock_timeout_seconds
+        while True:
+            try:
+                write_result = await call("firestore", "write", doc_ref.create, self._lock_data(fingerprint))
+                break
+            except AlreadyExists:
+                pass
+
+            is_found, response, stale_snapshot = await self._wait_for_stored_response(doc_ref, fingerprint, deadline)
+            if is_found:
+                self._remember(storage_key, fingerprint, response)
+                return response, True
+            if stale_snapshot is None:
+                # 이전 시도의 잠금이 지워졌으면 다시 create로 잠금을 잡습니다
+                continue
+            # 만료되었거나 중단된 이전 시도는 읽은 뒤 아무도 바꾸지 않았을 때만 대신 처리합니다
+            try:
+                option = db.write_option(last_update_time=stale_snapshot.update_time)
+                # 잠금 시각은 기다리기 시작한 때가 아니라 잠금을 가져오는 지금으로 기록합니다
+                write_result = await call(
+                    "firestore", "write", doc_ref.update, self._lock_data(fingerprint), option=option
+                )
+                break
+            except FailedPrecondition:
+                # 다른 요청이 먼저 대신 처리하기 시작했으면 그 요청이 끝나기를 기다립니다
+                continue
+
+        heartbeat = asyncio.create_task(self._keep_lock_alive(db, doc_ref, write_result.update_time))
+        try:
+            response = jsonable_encoder(await handler())
+        except Exception:
+            heartbeat.cancel()
+            # 실패한 요청은 저장하지 않고, 같은 키로 다시 시도할 수 있게 합니다
+            try:
+                await call("firestore", "write", doc_ref.delete)
+            except Exception:
+                # 잠금은 lock_timeout이 지나면 다른 요청이 가져가므로, 원래 오류를 그대로 전달합니다
+                logger.warning("Failed to release idempotency lock", exc_info=True)
+            raise
+        finally:
+            heartbeat.cancel()
+
+        await call("firestore", "write", doc_ref.update, {"status": "completed", "response": response})
+        self._remember(storage_key, fingerprint, response)
+        return response, False
+
+    def _lock_data(self, fingerprint: str) -> dict[str, object]:
+        now = datetime.now(timezone.utc)
+        return {
+            "status": "in_progress",
+            "fingerprint": fingerprint,
+            "created_at": now,
+            "heartbeat_at": now,
+            # Firestore TTL 정책이 이 필드를 기준으로 문서를 삭제합니다
+            "expires_at": now + timedelta(seconds=self.ttl_seconds),
+        }
+
+    async def _keep_lock_alive(self, db: AsyncClient, doc_ref, update_time: datetime) -> None:
+        """
+        handler가 lock_timeout보다 오래 걸려도(여러 이미지 업로드 등) 다른 요청이 잠금을 가져가 같은 요청을
+        두 번 처리하지 않도록, 처리하는 동안 heartbeat_at을 갱신합니다.
+        """
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                option = db.write_option(last_update_time=update_time)
+                write_result = await call(
+                    "firestore", "write", doc_ref.update, {"heartbeat_at": datetime.now(timezone.utc)}, option=option
+                )
+                update_time = write_result.update_time
+            except FailedPrecondition:
+                logger.warning("Idempotency lock was taken over by another request")
+                return
+            except Exception:
+                # 일시적인 실패는 다음 주기에 다시 갱신합니다
+                logger.warning("Failed to refresh idempotency lock", exc_info=True)
+
+    async def _wait_for_stored_response(
+        self,
+        doc_ref,
+        fingerprint: str,
+        deadline: float,
+    ) -> tuple[bool, object, object]:
+        """
+        다른 프로세스가 같은 키를 처리 중이면 완료될 때까지 기다립니다.
+
+        Returns:
+            (저장된 응답을 찾았는지 여부, 응답, 대신 처리해도 되는 만료/중단된 문서의 스냅샷)
+            문서가 없어졌으면 스냅샷은 None입니다.
+        """
+        while True:
+            snapshot = await call("firestore", "read", doc_ref.get)
+            if not snapshot.exists:
+                return False, None, None
+
+            record = snapshot.to_dict()
+            if record["expires_at"] < datetime.now(timezone.utc):
+                return False, None, snapshot
+            if record["fingerprint"] != fingerprint:
+                raise self._mismatch_exception()
+            if record["status"] == "completed":
+                return True, record["response"], None
+
+            # 처리 중인 요청이 heartbeat_at을 갱신하지 못한 지 lock_timeout이 지났으면 중단된 것으로 봅니다
+            last_heartbeat = record.get("heartbeat_at", record["created_at"])
+            lock_age = (datetime.now(timezone.utc) - last_heartbeat).total_seconds()
+            if lock_age > self.lock_timeout_seconds:
+                return False, None, snapshot
+            if time.monotonic() > deadline:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="A request with this Idempotency-Key is still being processed"
+                )
+            await asyncio.sleep(self.poll_interval)
+
+
+idempotency_store = IdempotencyStore()
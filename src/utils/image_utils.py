@@ -1,3 +1,6 @@
+import asyncio
+import logging
+import time
 from io import BytesIO
 from typing import Annotated
 
@@ -7,6 +10,11 @@ from PIL import Image
 
 from config import settings
 from database import get_storage
+from utils.metrics_utils import image_optimize_duration_seconds, image_upload_bytes, inc, observe
+from utils.resilience_utils import call
+from utils.tracing_utils import set_span_attribute, start_span, traced
+
+logger = logging.getLogger(__name__)
 
 
 class ImageUploader:
@@ -18,21 +26,26 @@ class ImageUploader:
         # 이미지 최적화 설정
         self.max_dimension = 1200  # 최대 너비/높이
         self.webp_quality = 50  # WebP 품질 (0-100)
+        # 동시에 최적화/업로드할 이미지 수
+        self._semaphore = asyncio.Semaphore(settings.IMAGE_UPLOAD_CONCURRENCY)
 
     def validate_image(self, file: UploadFile) -> None:
         """이미지 파일의 크기와 타입을 검증합니다."""
+        # 파일 크기 검증
+        file.file.seek(0, 2)
+        file_size = file.file.tell()
+        file.file.seek(0)
+
+        self._validate_type_and_size(file.content_type, file_size)
+
+    def _validate_type_and_size(self, content_type: str | None, file_size: int) -> None:
         # 파일 타입 검증
-        if file.content_type not in self.allowed_types:
+        if content_type not in self.allowed_types:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Unsupported file type. Allowed types: {', '.join(self.allowed_types)}"
             )
 
-        # 파일 크기 검증
-        file.file.seek(0, 2)
-        file_size = file.file.tell()
-        file.file.seek(0)
-
         if file_size > self.max_size:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -84,48 +97,73 @@ class ImageUploader:
 
             return optimized_data, 'image/webp'
 
-        except Exception as e:
-            print(f"Image optimization error: {str(e)}")
+        except Exception:
+            logger.warning("Image optimization failed, uploading original", exc_info=True)
             # 최적화 실패 시 원본 반환
             return image_data, content_type
 
-    async def upload_images(self, files: list[UploadFile]) -> list[str]:
-        """여러 이미지를 업로드하고 GCS URL 목록을 반환합니다."""
-        gcs_urls = []
-
-        for file in files:
-            try:
-                # 이미지 유효성 검사
-                self.validate_image(file)
-
-                # 안전한 파일명 생성 (확장자를 webp로 변경)
-                original_filename = file.filename.rsplit('.', 1)[0]
-                safe_filename = self._generate_safe_filename(f"{original_filename}.webp")
-                blob = self.bucket.blob(f"images/{safe_filename}")
-
-                # 파일 내용 읽기 및 최적화
-                contents = await file.read()
-                optimized_contents, content_type = self.optimize_image(contents, file.content_type)
-
-                # 최적화된 이미지 업로드
-                blob.content_type = content_type
-                blob.upload_from_string(
-                    optimized_contents,
-                    content_type=content_type
+    @traced("ImageUploader.upload_image_bytes")
+    async def upload_image_bytes(self, filename: str, content_type: str | None, data: bytes) -> str:
+        """
+        이미지 바이트를 검증, 최적화한 뒤 업로드하고 GCS URL을 반환합니다.
+        Pillow 변환과 GCS 업로드는 블로킹 작업이므로 스레드에서 실행합니다.
+        """
+        self._validate_type_and_size(content_type, len(data))
+        set_span_attribute("bytes", len(data))
+
+        # 안전한 파일명 생성 (확장자를 webp로 변경)
+        original_filename = filename.rsplit('.', 1)[0]
+        safe_filename = self._generate_safe_filename(f"{original_filename}.webp")
+        blob = self.bucket.blob(f"images/{safe_filename}")
+
+        async with self._semaphore:
+            # 이미지 최적화
+            optimize_started_at = time.perf_counter()
+            with start_span("ImageUploader.optimize_image", bytes=len(data)) as span:
+                optimized_contents, optimized_content_type = await asyncio.to_thread(
+                    self.optimize_image, data, content_type
                 )
+                span.set_attribute("optimized_bytes", len(optimized_contents))
+            observe(image_optimize_duration_seconds, (), time.perf_counter() - optimize_started_at)
+            inc(image_upload_bytes, ("original",), len(data))
+            inc(image_upload_bytes, ("optimized",), len(optimized_contents))
+
+            # 최적화된 이미지 업로드
+            blob.content_type = optimized_content_type
+            await call(
+                "storage",
+                "write",
+                asyncio.to_thread,
+                blob.upload_from_string,
+                optimized_contents,
+                content_type=optimized_content_type
+            )
+
+        # GCS URL 생성
+        return f"https://firebasestorage.googleapis.com/v0/b/{settings.GCS_BUCKET_NAME}/o/images%2F{safe_filename}?alt=media"
 
-                # GCS URL 생성
-                gcs_url = f"https://firebasestorage.googleapis.com/v0/b/{settings.GCS_BUCKET_NAME}/o/images%2F{safe_filename}?alt=media"
-                gcs_urls.append(gcs_url)
+    async def _upload_file(self, file: UploadFile) -> str:
+        try:
+            # 이미지 유효성 검사
+            self.validate_image(file)
 
-            except Exception as e:
-                print(f"Image upload error: {str(e)}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Failed to upload image: {file.filename}"
-                ) from e
+            # 파일 내용 읽기 및 업로드
+            contents = await file.read()
+            return await self.upload_image_bytes(file.filename, file.content_type, contents)
 
-        return gcs_urls
+        except Exception as e:
+            logger.exception("Image upload failed", extra={"image_filename": file.filename})
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to upload image: {file.filename}"
+            ) from e
+
+    @traced("ImageUploader.upload_images")
+    async def upload_images(self, files: list[UploadFile]) -> list[str]:
+        """여러 이미지를 동시에 업로드하고 GCS URL 목록을 입력 순서대로 반환합니다."""
+        set_span_attribute("image_count", len(files))
+        gcs_urls = await asyncio.gather(*(self._upload_file(file) for file in files))
+        return list(gcs_urls)
 
 
 async def get_image_uploader(
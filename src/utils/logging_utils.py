@@ -0,0 +1,184 @@
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+from utils.metrics_utils import callback_metric
+from utils.tracing_utils import current_trace_id
+
+_request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# LogRecord 기본 속성. 이 외의 속성(extra=...)은 JSON 필드로 함께 씁니다
+_RESERVED_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+_CONTEXT_ATTRIBUTES = ("request_id", "trace_id")
+
+# uvicorn 로그(접근 로그 포함)도 같은 대기열로 보내 이벤트 루프에서 stdout에 직접 쓰지 않게 합니다
+_UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+
+class JsonFormatter(logging.Formatter):
+    """로그 한 건을 JSON 한 줄로 만듭니다. request_id와 extra 필드를 함께 씁니다."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in _CONTEXT_ATTRIBUTES:
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        for key, value in vars(record).items():
+            if key not in _RESERVED_ATTRIBUTES and key not in _CONTEXT_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _ContextFilter(logging.Filter):
+    """
+    로그를 남긴 시점의 request_id(추적 중이면 trace_id도)를 기록에 붙이고,
+    DEBUG 로그는 LOG_DEBUG_SAMPLE_RATE 비율만 남깁니다.
+    대기열로 넘기기 전에 실행해야 contextvar 값을 읽을 수 있으므로 QueueHandler에 답니다.
+    """
+
+    def __init__(self, debug_sample_rate: float):
+        super().__init__()
+        self.debug_sample_rate = debug_sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno <= logging.DEBUG and random.random() >= self.debug_sample_rate:
+            return False
+        if not hasattr(record, "request_id"):
+            record.request_id = _request_id.get()
+        if not hasattr(record, "trace_id"):
+            record.trace_id = current_trace_id()
+        return True
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """대기열이 가득 차면 기다리지 않고 로그를 버립니다. 버린 개수는 dropped에 셉니다."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 기본 prepare()는 traceback을 message에 합쳐 버리므로, 메시지와 traceback을 따로 남깁니다
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _parse_module_levels(value: str) -> dict[str, str]:
+    """`utils.crud_utils=DEBUG,uvicorn.access=WARNING` 형식을 {logger 이름: 레벨}로 바꿉니다."""
+    levels = {}
+    for part in value.split(","):
+        name, _, level = part.strip().partition("=")
+        if name and level:
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+class LoggingManager:
+    """루트 로거에 대기열 handler를 달고, 실제 출력은 백그라운드 스레드(QueueListener)가 맡습니다."""
+
+    def __init__(self):
+        self.queue_handler: _NonBlockingQueueHandler | None = None
+        self._listener: logging.handlers.QueueListener | None = None
+
+    def setup(self) -> None:
+        if self._listener is not None:
+            return
+
+        output_handler = logging.StreamHandler(sys.stdout)
+        if settings.LOG_FORMAT == "json":
+            output_handler.setFormatter(JsonFormatter())
+        else:
+            output_handler.setFormatter(
+                logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+            )
+
+        self.queue_handler = _NonBlockingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+        self.queue_handler.addFilter(_ContextFilter(settings.LOG_DEBUG_SAMPLE_RATE))
+
+        root = logging.getLogger()
+        root.handlers = [self.queue_handler]
+        root.setLevel(settings.LOG_LEVEL.upper())
+        for name in _UVICORN_LOGGERS:
+            uvicorn_logger = logging.getLogger(name)
+            uvicorn_logger.handlers = []
+            uvicorn_logger.propagate = True
+        for name, level in _parse_module_levels(settings.LOG_LEVELS).items():
+            logging.getLogger(name).setLevel(level)
+
+        self._listener = logging.handlers.QueueListener(
+            self.queue_handler.queue, output_handler, respect_handler_level=True
+        )
+        self._listener.start()
+
+    def shutdown(self) -> None:
+        """대기열에 남은 로그를 모두 쓰고 백그라운드 스레드를 멈춥니다."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+
+logging_manager = LoggingManager()
+
+callback_metric(
+    "log_records_dropped_total", "Log records dropped because the log queue was full", "counter", (),
+    lambda: {(): logging_manager.queue_handler.dropped if logging_manager.queue_handler is not None else 0},
+)
+
+
+class RequestIdMiddleware:
+    """
+    요청마다 request_id를 정해 로그에 붙입니다. X-Request-ID 헤더가 있으면 그 값을 쓰고, 없으면 새로 만듭니다.
+    같은 값을 응답 헤더로도 돌려줍니다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = next(
+            (value.decode("latin-1")[:128] for key, value in scope["headers"] if key == b"x-request-id"), None
+        ) or uuid.uuid4().hex
+        token = _request_id.set(request_id)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_id.reset(token)
@@ -0,0 +1,959 @@
+import asyncio
+import copy
+import functools
+import logging
+import operator
+import random
+import threading
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable, Iterable
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from types import SimpleNamespace
+
+from firebase_admin import auth
+from google.api_core.exceptions import Aborted, AlreadyExists, FailedPrecondition, NotFound, ServiceUnavailable
+from google.cloud.firestore_v1._helpers import ExistsOption, LastUpdateOption
+from google.cloud.firestore_v1.base_aggregation import AggregationResult
+from google.cloud.firestore_v1.base_client import BaseClient
+from google.cloud.firestore_v1.base_query import BaseCompositeFilter, FieldFilter, Or
+from google.cloud.firestore_v1.watch import ChangeType, DocumentChange
+
+from config import settings
+from domain.schema.content_schemas import ContentCategory
+
+logger = logging.getLogger(__name__)
+
+
+class FaultProfile:
+    """
+    가짜 백엔드 호출(RPC)마다 넣을 지연과 오류.
+    지연 = latency + U(0, jitter), slow_rate 확률로 slow만큼 더 늦어지고(꼬리 지연),
+    error_rate 확률로 ServiceUnavailable을 냅니다.
+    같은 seed면 같은 순서의 지연/오류가 나오므로 측정을 재현할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        latency_seconds: float = 0.0,
+        jitter_seconds: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_seconds: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+    ):
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.slow_rate = slow_rate
+        self.slow_seconds = slow_seconds
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        # Storage 호출은 asyncio.to_thread로 여러 스레드에서 동시에 들어옵니다
+        self._lock = threading.Lock()
+
+    def _draw(self) -> tuple[float, bool]:
+        with self._lock:
+            delay = self.latency_seconds
+            if self.jitter_seconds:
+                delay += self._random.uniform(0, self.jitter_seconds)
+            if self.slow_rate and self._random.random() < self.slow_rate:
+                delay += self.slow_seconds
+            is_failed = bool(self.error_rate) and self._random.random() < self.error_rate
+        return delay, is_failed
+
+    async def apply_async(self, operation: str) -> None:
+        delay, is_failed = self._draw()
+        if delay:
+            await asyncio.sleep(delay)
+        if is_failed:
+            raise ServiceUnavailable(f"Injected failure: {operation}")
+
+    def apply(self, operation: str) -> None:
+        delay, is_failed = self._draw()
+        if delay:
+            time.sleep(delay)
+        if is_failed:
+            raise ServiceUnavailable(f"Injected failure: {operation}")
+
+
+def _profile_from_settings(latency_ms: float) -> FaultProfile:
+    return FaultProfile(
+        latency_seconds=latency_ms / 1000,
+        jitter_seconds=settings.MEMORY_BACKEND_JITTER_MS / 1000,
+        slow_rate=settings.MEMORY_BACKEND_SLOW_RATE,
+        slow_seconds=settings.MEMORY_BACKEND_SLOW_MS / 1000,
+        error_rate=settings.MEMORY_BACKEND_ERROR_RATE,
+        seed=settings.MEMORY_BACKEND_SEED,
+    )
+
+
+def _encode(value: object) -> object:
+    """저장할 값을 Firestore가 돌려주는 형태로 바꿉니다. Enum은 값으로, datetime은 UTC로 바꾸고 나머지는 복사합니다."""
+    if value is None or isinstance(value, (bool, int, float, bytes)):
+        return value
+    if isinstance(value, Enum):
+        return _encode(value.value)
+    if isinstance(value, str):
+        return str(value)
+    if isinstance(value, datetime):
+        # timezone 정보가 없는 값은 Firestore 클라이언트와 같이 UTC로 간주합니다
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+    if isinstance(value, dict):
+        return {str(key): _encode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    raise TypeError(f"Cannot convert to a Firestore Value: {value!r}")
+
+
+def _value_key(value: object) -> tuple:
+    """Firestore 값 정렬 순서(null < bool < 숫자 < timestamp < 문자열 < bytes < 배열 < 맵)를 따르는 정렬 키."""
+    if value is None:
+        return (0,)
+    if isinstance(value, bool):
+        return (1, value)
+    if isinstance(value, (int, float)):
+        return (2, value)
+    if isinstance(value, datetime):
+        return (3, value)
+    if isinstance(value, str):
+        return (4, value)
+    if isinstance(value, bytes):
+        return (5, value)
+    if isinstance(value, list):
+        return (8, tuple(_value_key(item) for item in value))
+    if isinstance(value, dict):
+        return (9, tuple((key, _value_key(item)) for key, item in sorted(value.items())))
+    raise TypeError(f"Unsupported Firestore value: {value!r}")
+
+
+_MISSING = object()
+
+
+def _lookup(data: dict[str, object], field_path: str) -> object:
+    value: object = data
+    for part in field_path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def _set_field(data: dict[str, object], field_path: str, value: object) -> None:
+    *parents, last = field_path.split(".")
+    for part in parents:
+        child = data.get(part)
+        if not isinstance(child, dict):
+            child = data[part] = {}
+        data = child
+    data[last] = value
+
+
+def _merge(target: dict[str, object], source: dict[str, object]) -> dict[str, object]:
+    # set(merge=True)는 중첩된 맵도 필드 단위로 병합합니다
+    for key, value in source.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            target[key] = _merge(dict(target[key]), value)
+        else:
+            target[key] = value
+    return target
+
+
+def _document_id(value: object) -> str:
+    """`__name__` 필드 값(문서 ID, 문서 경로, 참조)을 문서 ID로 바꿉니다."""
+    if isinstance(value, MemoryDocumentReference):
+        return value.id
+    return str(value).rsplit("/", 1)[-1]
+
+
+def _field_value(document_id: str, data: dict[str, object], field_path: str) -> object:
+    if field_path == "__name__":
+        return document_id
+    return _lookup(data, field_path)
+
+
+def _compare_range(compare: Callable[[object, object], bool], value: object, expected: object) -> bool:
+    # 범위 비교는 같은 종류의 값끼리만 일치합니다 (예: timestamp 조건은 문자열 필드와 맞지 않음)
+    value_key, expected_key = _value_key(value), _value_key(expected)
+    return value_key[0] == expected_key[0] and compare(value_key, expected_key)
+
+
+# FieldFilter 연산자별 비교 함수: (문서의 필드 값, 필터 값) -> 일치 여부
+_FILTER_OPERATORS: dict[str, Callable[[object, object], bool]] = {
+    "==": lambda value, expected: _value_key(value) == _value_key(expected),
+    "!=": lambda value, expected: value is not None and _value_key(value) != _value_key(expected),
+    "in": lambda value, expected: any(_value_key(value) == _value_key(item) for item in expected),
+    "not-in": lambda value, expected: value is not None and all(
+        _value_key(value) != _value_key(item) for item in expected
+    ),
+    "array-contains": lambda value, expected: isinstance(value, list) and any(
+        _value_key(item) == _value_key(expected) for item in value
+    ),
+    "array-contains-any": lambda value, expected: isinstance(value, list) and any(
+        _value_key(item) == _value_key(candidate) for item in value for candidate in expected
+    ),
+    "<": functools.partial(_compare_range, operator.lt),
+    "<=": functools.partial(_compare_range, operator.le),
+    ">": functools.partial(_compare_range, operator.gt),
+    ">=": functools.partial(_compare_range, operator.ge),
+}
+
+
+def _matches_field_filter(document_id: str, data: dict[str, object], field_filter: FieldFilter) -> bool:
+    op = field_filter.op_string
+    if op not in _FILTER_OPERATORS:
+        raise ValueError(f"Unsupported filter operator: {op}")
+    value = _field_value(document_id, data, field_filter.field_path)
+    if value is _MISSING:
+        return False
+    expected = field_filter.value
+    if field_filter.field_path == "__name__":
+        expected = [_document_id(item) for item in expected] if op in ("in", "not-in") else _document_id(expected)
+    else:
+        expected = _encode(expected)
+    return _FILTER_OPERATORS[op](value, expected)
+
+
+def _matches(document_id: str, data: dict[str, object], query_filter) -> bool:
+    if isinstance(query_filter, BaseCompositeFilter):
+        results = (_matches(document_id, data, child) for child in query_filter.filters)
+        return any(results) if isinstance(query_filter, Or) else all(results)
+    return _matches_field_filter(document_id, data, query_filter)
+
+
+class _StoredDocument:
+    __slots__ = ("data", "create_time", "update_time", "version")
+
+    def __init__(self, data: dict[str, object], create_time: datetime, update_time: datetime, version: int):
+        # data는 쓰기마다 새 dict로 바꾸므로 스냅샷이 같은 객체를 들고 있어도 안전합니다
+        self.data = data
+        self.create_time = create_time
+        self.update_time = update_time
+        self.version = version
+
+
+class _Write:
+    """batch/트랜잭션에 쌓아 두는 쓰기 하나."""
+
+    __slots__ = ("kind", "reference", "data", "merge", "option")
+
+    def __init__(
+        self,
+        kind: str,
+        reference: "MemoryDocumentReference",
+        data: dict | None = None,
+        merge: bool = False,
+        option: object = None,
+    ):
+        self.kind = kind
+        self.reference = reference
+        self.data = data
+        self.merge = merge
+        self.option = option
+
+
+class MemoryFirestoreClient:
+    """
+    부하 테스트와 벤치마크에서 firestore.AsyncClient 대신 쓰는 인메모리 클라이언트 (DATA_BACKEND=memory).
+    서비스 코드가 쓰는 기능(문서 CRUD, where/And/Or/FieldFilter, order_by, offset, limit, cursor, count, batch,
+    트랜잭션, write_option, get_all, on_snapshot)만 구현합니다.
+    모든 호출이 이벤트 루프 스레드에서 실행되므로 잠금 없이 보관하고, 쿼리는 컬렉션 전체를 훑어 필터/정렬합니다.
+    읽기/쓰기 RPC마다 FaultProfile의 지연과 오류를 넣습니다.
+    """
+
+    def __init__(self, profile: FaultProfile | None = None):
+        self.profile = profile or FaultProfile()
+        self._collections: dict[str, dict[str, _StoredDocument]] = {}
+        self._version = 0
+        self._last_write_time = datetime.fromtimestamp(0, timezone.utc)
+        self._watches: list[MemoryWatch] = []
+
+    def collection(self, *path: str) -> "MemoryCollectionReference":
+        return MemoryCollectionReference(self, "/".join(path))
+
+    def document(self, *path: str) -> "MemoryDocumentReference":
+        collection_path, document_id = "/".join(path).rsplit("/", 1)
+        return MemoryDocumentReference(self, collection_path, document_id)
+
+    def batch(self) -> "MemoryWriteBatch":
+        return MemoryWriteBatch(self)
+
+    def transaction(self, **kwargs) -> "MemoryTransaction":
+        return MemoryTransaction(self)
+
+    # 실제 클라이언트와 같은 LastUpdateOption/ExistsOption을 만듭니다
+    write_option = staticmethod(BaseClient.write_option)
+
+    async def get_all(
+        self,
+        references: Iterable["MemoryDocumentReference"],
+        field_paths: list[str] | None = None,
+        transaction: "MemoryTransaction | None" = None,
+        retry: object = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator["MemoryDocumentSnapshot"]:
+        references = list(references)
+        await self.profile.apply_async("firestore.batch_get")
+        for reference in references:
+            yield self._snapshot(reference, transaction)
+
+    def _stored(self, reference: "MemoryDocumentReference") -> _StoredDocument | None:
+        return self._collections.get(reference.collection_path, {}).get(reference.id)
+
+    def _snapshot(
+        self,
+        reference: "MemoryDocumentReference",
+        transaction: "MemoryTransaction | None" = None,
+    ) -> "MemoryDocumentSnapshot":
+        stored = self._stored(reference)
+        if transaction is not None:
+            transaction._record_read(reference.path, stored.version if stored is not None else 0)
+        return MemoryDocumentSnapshot(reference, stored, datetime.now(timezone.utc))
+
+    def _run_query(self, query: "MemoryQuery", transaction: "MemoryTransaction | None" = None) -> list:
+        read_time = datetime.now(timezone.utc)
+        documents = [
+            (document_id, stored)
+            for document_id, stored in self._collections.get(query.collection_path, {}).items()
+            if all(_matches(document_id, stored.data, query_filter) for query_filter in query._filters)
+        ]
+
+        orders = query._normalized_orders()
+        # 정렬 필드가 없는 문서는 결과에서 빠집니다
+        documents = [
+            (document_id, stored) for document_id, stored in documents
+            if all(_field_value(document_id, stored.data, field) is not _MISSING for field, _ in orders)
+        ]
+        for field, direction in reversed(orders):
+            documents.sort(
+                key=lambda item: _value_key(_field_value(item[0], item[1].data, field)),
+                reverse=direction == "DESCENDING",
+            )
+
+        if query._start is not None or query._end is not None:
+            documents = [
+                (document_id, stored) for document_id, stored in documents
+                if query._is_within_cursors(document_id, stored.data, orders)
+            ]
+        documents = documents[query._offset:]
+        if query._limit is not None:
+            documents = documents[:query._limit]
+
+        snapshots = []
+        for document_id, stored in documents:
+            reference = MemoryDocumentReference(self, query.collection_path, document_id)
+            if transaction is not None:
+                transaction._record_read(reference.path, stored.version)
+            snapshots.append(MemoryDocumentSnapshot(reference, stored, read_time))
+        return snapshots
+
+    def _apply(self, writes: list[_Write]) -> list[SimpleNamespace]:
+        """
+        쓰기 목록을 한 번에 반영합니다. 하나라도 실패 조건(이미 있는 문서 create, 없는 문서 update,
+        맞지 않는 write option)에 걸리면 아무것도 반영하지 않습니다.
+        """
+        for write in writes:
+            _check_preconditions(write, self._stored(write.reference))
+
+        # 같은 시각에 일어난 쓰기도 update_time이 달라야 LastUpdateOption으로 구분할 수 있습니다
+        now = max(datetime.now(timezone.utc), self._last_write_time + timedelta(microseconds=1))
+        self._last_write_time = now
+        changes = []
+        for write in writes:
+            documents = self._collections.setdefault(write.reference.collection_path, {})
+            before = documents.get(write.reference.id)
+            if write.kind == "delete":
+                documents.pop(write.reference.id, None)
+                changes.append((write.reference, before, None))
+                continue
+
+            self._version += 1
+            after = _StoredDocument(
+                _written_data(write, before), before.create_time if before is not None else now, now, self._version
+            )
+            documents[write.reference.id] = after
+            changes.append((write.reference, before, after))
+
+        for watch in list(self._watches):
+            watch._notify(changes, now)
+        return [SimpleNamespace(update_time=now) for _ in writes]
+
+
+def _check_preconditions(write: _Write, stored: _StoredDocument | None) -> None:
+    if write.kind == "create" and stored is not None:
+        raise AlreadyExists(f"Document already exists: {write.reference.path}")
+    if write.kind == "update" and stored is None:
+        raise NotFound(f"No document to update: {write.reference.path}")
+    if isinstance(write.option, LastUpdateOption) and (
+        stored is None or stored.update_time != write.option._last_update_time
+    ):
+        raise FailedPrecondition(f"Document was modified since last read: {write.reference.path}")
+    if isinstance(write.option, ExistsOption) and write.option._exists != (stored is not None):
+        raise FailedPrecondition(f"Document existence precondition failed: {write.reference.path}")
+
+
+def _written_data(write: _Write, before: _StoredDocument | None) -> dict[str, object]:
+    """create/set/update를 반영한 뒤의 문서 데이터를 만듭니다."""
+    if write.kind == "update":
+        data = copy.deepcopy(before.data)
+        for field_path, value in write.data.items():
+            _set_field(data, field_path, _encode(value))
+        return data
+    if write.merge and before is not None:
+        return _merge(copy.deepcopy(before.data), _encode(write.data))
+    return _encode(write.data)
+
+
+class MemoryDocumentSnapshot:
+    def __init__(
+        self,
+        reference: "MemoryDocumentReference",
+        stored: _StoredDocument | None,
+        read_time: datetime,
+    ):
+        self.reference = reference
+        self._data = stored.data if stored is not None else None
+        self.create_time = stored.create_time if stored is not None else None
+        self.update_time = stored.update_time if stored is not None else None
+        self.read_time = read_time
+
+    @property
+    def id(self) -> str:
+        return self.reference.id
+
+    @property
+    def exists(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> dict[str, object] | None:
+        return copy.deepcopy(self._data) if self._data is not None else None
+
+    def get(self, field_path: str) -> object:
+        if self._data is None:
+            return None
+        value = _lookup(self._data, field_path)
+        if value is _MISSING:
+            raise KeyError(field_path)
+        return copy.deepcopy(value)
+
+
+class MemoryDocumentReference:
+    def __init__(self, client: MemoryFirestoreClient, collection_path: str, document_id: str):
+        self._client = client
+        self.collection_path = collection_path
+        self.id = document_id
+
+    @property
+    def path(self) -> str:
+        return f"{self.collection_path}/{self.id}"
+
+    @property
+    def parent(self) -> "MemoryCollectionReference":
+        return MemoryCollectionReference(self._client, self.collection_path)
+
+    def collection(self, collection_id: str) -> "MemoryCollectionReference":
+        return MemoryCollectionReference(self._client, f"{self.path}/{collection_id}")
+
+    async def get(
+        self,
+        field_paths: list[str] | None = None,
+        transaction: "MemoryTransaction | None" = None,
+        retry: object = None,
+        timeout: float | None = None,
+    ) -> MemoryDocumentSnapshot:
+        await self._client.profile.apply_async("firestore.get")
+        return self._client._snapshot(self, transaction)
+
+    async def _write(self, write: _Write) -> SimpleNamespace:
+        await self._client.profile.apply_async("firestore.commit")
+        return self._client._apply([write])[0]
+
+    async def create(self, document_data: dict, retry: object = None, timeout: float | None = None) -> SimpleNamespace:
+        return await self._write(_Write("create", self, document_data))
+
+    async def set(
+        self,
+        document_data: dict,
+        merge: bool = False,
+        retry: object = None,
+        timeout: float | None = None,
+    ) -> SimpleNamespace:
+        return await self._write(_Write("set", self, document_data, merge))
+
+    async def update(
+        self,
+        field_updates: dict,
+        option: object = None,
+        retry: object = None,
+        timeout: float | None = None,
+    ) -> SimpleNamespace:
+        return await self._write(_Write("update", self, field_updates, option=option))
+
+    async def delete(self, option: object = None, retry: object = None, timeout: float | None = None) -> datetime:
+        return (await self._write(_Write("delete", self, option=option))).update_time
+
+
+class MemoryQuery:
+    """조건을 바꿀 때마다 새 쿼리를 돌려주는 불변 쿼리. 실행은 MemoryFirestoreClient._run_query가 맡습니다."""
+
+    def __init__(self, client: MemoryFirestoreClient, collection_path: str):
+        self._client = client
+        self.collection_path = collection_path
+        self._filters: tuple = ()
+        self._orders: tuple[tuple[str, str], ...] = ()
+        self._offset = 0
+        self._limit: int | None = None
+        # (커서 값 목록 또는 스냅샷, 커서 문서 포함 여부)
+        self._start: tuple[object, bool] | None = None
+        self._end: tuple[object, bool] | None = None
+
+    def _copy(self, **changes: object) -> "MemoryQuery":
+        query = MemoryQuery.__new__(MemoryQuery)
+        query.__dict__.update(self.__dict__)
+        for key, value in changes.items():
+            setattr(query, f"_{key}", value)
+        return query
+
+    def where(
+        self,
+        field_path: str | None = None,
+        op_string: str | None = None,
+        value: object = None,
+        *,
+        filter: object = None,
+    ) -> "MemoryQuery":
+        query_filter = filter if filter is not None else FieldFilter(field_path, op_string, value)
+        return self._copy(filters=(*self._filters, query_filter))
+
+    def order_by(self, field_path: str, direction: str = "ASCENDING") -> "MemoryQuery":
+        if direction not in ("ASCENDING", "DESCENDING"):
+            raise ValueError(f"Invalid direction: {direction}")
+        return self._copy(orders=(*self._orders, (field_path, direction)))
+
+    def offset(self, num_to_skip: int) -> "MemoryQuery":
+        return self._copy(offset=num_to_skip)
+
+    def limit(self, count: int) -> "MemoryQuery":
+        return self._copy(limit=count)
+
+    def start_at(self, document_fields_or_snapshot: object) -> "MemoryQuery":
+        return self._copy(start=(document_fields_or_snapshot, True))
+
+    def start_after(self, document_fields_or_snapshot: object) -> "MemoryQuery":
+        return self._copy(start=(document_fields_or_snapshot, False))
+
+    def end_at(self, document_fields_or_snapshot: object) -> "MemoryQuery":
+        return self._copy(end=(document_fields_or_snapshot, True))
+
+    def end_before(self, document_fields_or_snapshot: object) -> "MemoryQuery":
+        return self._copy(end=(document_fields_or_snapshot, False))
+
+    def count(self, alias: str | None = None) -> "MemoryAggregationQuery":
+        return MemoryAggregationQuery(self, alias or "count")
+
+    def _normalized_orders(self) -> list[tuple[str, str]]:
+        # Firestore처럼 마지막 정렬 방향으로 문서 이름 정렬을 덧붙여 순서를 고정합니다
+        orders = list(self._orders)
+        if not any(field == "__name__" for field, _ in orders):
+            orders.append(("__name__", orders[-1][1] if orders else "ASCENDING"))
+        return orders
+
+    def _cursor_values(self, cursor: object, orders: list[tuple[str, str]]) -> list[object]:
+        if isinstance(cursor, MemoryDocumentSnapshot):
+            data = cursor._data or {}
+            return [_field_value(cursor.id, data, field) for field, _ in orders]
+        values = []
+        for field, _ in orders:
+            if field not in cursor:
+                if field == "__name__" and values:
+                    break
+                raise ValueError(f"Cursor is missing the order_by field: {field}")
+            values.append(_document_id(cursor[field]) if field == "__name__" else _encode(cursor[field]))
+        return values
+
+    def _is_within_cursors(self, document_id: str, data: dict[str, object], orders: list[tuple[str, str]]) -> bool:
+        def compare(cursor: object) -> int:
+            # 문서가 쿼리 순서상 커서보다 앞이면 음수, 같으면 0, 뒤면 양수
+            # 커서 값이 문서 ID 없이 끝나면 orders보다 짧습니다
+            for value, (field, direction) in zip(self._cursor_values(cursor, orders), orders, strict=False):
+                document_key = _value_key(_field_value(document_id, data, field))
+                cursor_key = _value_key(value)
+                if document_key != cursor_key:
+                    result = -1 if document_key < cursor_key else 1
+                    return -result if direction == "DESCENDING" else result
+            return 0
+
+        if self._start is not None:
+            cursor, is_inclusive = self._start
+            position = compare(cursor)
+            if position < 0 or (position == 0 and not is_inclusive):
+                return False
+        if self._end is not None:
+            cursor, is_inclusive = self._end
+            position = compare(cursor)
+            if position > 0 or (position == 0 and not is_inclusive):
+                return False
+        return True
+
+    async def get(
+        self,
+        transaction: "MemoryTransaction | None" = None,
+        retry: object = None,
+        timeout: float | None = None,
+    ) -> list[MemoryDocumentSnapshot]:
+        await self._client.profile.apply_async("firestore.run_query")
+        return self._client._run_query(self, transaction)
+
+    async def stream(
+        self,
+        transaction: "MemoryTransaction | None" = None,
+        retry: object = None,
+        timeout: float | None = None,
+    ) -> AsyncIterator[MemoryDocumentSnapshot]:
+        for snapshot in await self.get(transaction=transaction):
+            yield snapshot
+
+    def on_snapshot(self, callback: Callable[[list, list, datetime], None]) -> "MemoryWatch":
+        return MemoryWatch(self, callback)
+
+
+class MemoryCollectionReference(MemoryQuery):
+    @property
+    def id(self) -> str:
+        return self.collection_path.rsplit("/", 1)[-1]
+
+    def document(self, document_id: str | None = None) -> MemoryDocumentReference:
+        # 자동 생성 ID는 Firestore와 같은 20자 영숫자입니다
+        return MemoryDocumentReference(self._client, self.collection_path, document_id or uuid.uuid4().hex[:20])
+
+    async def add(self, document_data: dict, document_id: str | None = None, **kwargs) -> tuple:
+        reference = self.document(document_id)
+        write_result = await reference.create(document_data)
+        return write_result.update_time, reference
+
+
+class MemoryAggregationQuery:
+    def __init__(self, query: MemoryQuery, alias: str):
+        self._query = query
+        self._alias = alias
+
+    async def get(
+        self,
+        transaction: "MemoryTransaction | None" = None,
+        retry: object = None,
+        timeout: float | None = None,
+    ) -> list[list[AggregationResult]]:
+        await self._query._client.profile.apply_async("firestore.run_aggregation_query")
+        count = len(self._query._client._run_query(self._query, transaction))
+        return [[AggregationResult(alias=self._alias, value=count, read_time=datetime.now(timezone.utc))]]
+
+
+class MemoryWatch:
+    """
+    query.on_snapshot의 인메모리 구현. 등록할 때 현재 결과 전체를 ADDED로 한 번 보내고,
+    이후 쓰기마다 결과에 들어오거나(ADDED) 바뀌거나(MODIFIED) 빠진(REMOVED) 문서를 콜백으로 보냅니다.
+    실제 Firestore와 달리 콜백은 쓰기를 반영한 스레드(이벤트 루프)에서 바로 호출됩니다.
+    """
+
+    def __init__(self, query: MemoryQuery, callback: Callable[[list, list, datetime], None]):
+        self._query = query
+        self._callback = callback
+        client = query._client
+        client._watches.append(self)
+        documents = client._run_query(query)
+        changes = [
+            DocumentChange(ChangeType.ADDED, document, -1, index) for index, document in enumerate(documents)
+        ]
+        self._deliver(documents, changes, datetime.now(timezone.utc))
+
+    def _matches(self, reference: MemoryDocumentReference, stored: _StoredDocument | None) -> bool:
+        return stored is not None and all(
+            _matches(reference.id, stored.data, query_filter) for query_filter in self._query._filters
+        )
+
+    def _notify(self, changes: list[tuple], read_time: datetime) -> None:
+        document_changes = []
+        for reference, before, after in changes:
+            if reference.collection_path != self._query.collection_path:
+                continue
+            was_matched, is_matched = self._matches(reference, before), self._matches(reference, after)
+            if is_matched:
+                change_type = ChangeType.MODIFIED if was_matched else ChangeType.ADDED
+                snapshot = MemoryDocumentSnapshot(reference, after, read_time)
+                document_changes.append(DocumentChange(change_type, snapshot, -1, -1))
+            elif was_matched:
+                snapshot = MemoryDocumentSnapshot(reference, before, read_time)
+                document_changes.append(DocumentChange(ChangeType.REMOVED, snapshot, -1, -1))
+        if document_changes:
+            self._deliver(self._query._client._run_query(self._query), document_changes, read_time)
+
+    def _deliver(self, documents: list, changes: list, read_time: datetime) -> None:
+        try:
+            self._callback(documents, changes, read_time)
+        except Exception:
+            logger.exception("Snapshot listener callback failed")
+
+    @property
+    def is_active(self) -> bool:
+        return self in self._query._client._watches
+
+    def unsubscribe(self) -> None:
+        if self in self._query._client._watches:
+            self._query._client._watches.remove(self)
+
+
+class _MemoryWriteBuffer:
+    def __init__(self, client: MemoryFirestoreClient):
+        self._client = client
+        self._writes: list[_Write] = []
+
+    def __len__(self) -> int:
+        return len(self._writes)
+
+    def create(self, reference: MemoryDocumentReference, document_data: dict) -> None:
+        self._writes.append(_Write("create", reference, document_data))
+
+    def set(self, reference: MemoryDocumentReference, document_data: dict, merge: bool = False) -> None:
+        self._writes.append(_Write("set", reference, document_data, merge))
+
+    def update(self, reference: MemoryDocumentReference, field_updates: dict, option: object = None) -> None:
+        self._writes.append(_Write("update", reference, field_updates, option=option))
+
+    def delete(self, reference: MemoryDocumentReference, option: object = None) -> None:
+        self._writes.append(_Write("delete", reference, option=option))
+
+
+class MemoryWriteBatch(_MemoryWriteBuffer):
+    async def commit(self, retry: object = None, timeout: float | None = None) -> list[SimpleNamespace]:
+        await self._client.profile.apply_async("firestore.commit")
+        write_results = self._client._apply(self._writes)
+        self._writes = []
+        return write_results
+
+
+class MemoryTransaction(_MemoryWriteBuffer):
+    """
+    낙관적 동시성 제어로 흉내 낸 트랜잭션. 읽은 문서의 버전을 기억해 두었다가, 커밋 시점에 그 사이 다른 쓰기가
+    있었으면 Aborted로 실패합니다. 경합이 생기면 실제 Firestore처럼 호출한 쪽이 재시도하게 됩니다.
+    (쿼리 결과에 새 문서가 끼어드는 경우는 검사하지 않습니다)
+    """
+
+    def __init__(self, client: MemoryFirestoreClient):
+        super().__init__(client)
+        self._id: str | None = None
+        self._read_versions: dict[str, int] = {}
+
+    @property
+    def id(self) -> str | None:
+        return self._id
+
+    @property
+    def in_progress(self) -> bool:
+        return self._id is not None
+
+    def _record_read(self, path: str, version: int) -> None:
+        self._read_versions.setdefault(path, version)
+
+    def _clean_up(self) -> None:
+        self._writes = []
+        self._read_versions = {}
+        self._id = None
+
+    async def _begin(self, retry_id: str | None = None) -> None:
+        if self.in_progress:
+            raise ValueError("The transaction has already begun")
+        await self._client.profile.apply_async("firestore.begin_transaction")
+        self._id = uuid.uuid4().hex
+
+    async def _rollback(self) -> None:
+        if not self.in_progress:
+            raise ValueError("The transaction has not begun")
+        self._clean_up()
+
+    async def _commit(self) -> list[SimpleNamespace]:
+        if not self.in_progress:
+            raise ValueError("The transaction has not begun")
+        await self._client.profile.apply_async("firestore.commit")
+        for path, version in self._read_versions.items():
+            collection_path, document_id = path.rsplit("/", 1)
+            stored = self._client._collections.get(collection_path, {}).get(document_id)
+            if (stored.version if stored is not None else 0) != version:
+                self._clean_up()
+                raise Aborted("Transaction was aborted due to contention")
+        write_results = self._client._apply(self._writes)
+        self._clean_up()
+        return write_results
+
+
+class MemoryBlob:
+    def __init__(self, bucket: "MemoryBucket", name: str):
+        self.bucket = bucket
+        self.name = name
+        self.content_type: str | None = None
+        self.cache_control: str | None = None
+
+    @property
+    def public_url(self) -> str:
+        return f"memory://{self.bucket.name}/{self.name}"
+
+    @property
+    def size(self) -> int | None:
+        stored = self.bucket._objects.get(self.name)
+        return len(stored[0]) if stored is not None else None
+
+    def upload_from_string(self, data: bytes | str, content_type: str = "text/plain", **kwargs) -> None:
+        self.bucket.profile.apply("storage.upload")
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self.content_type = content_type or self.content_type
+        with self.bucket._lock:
+            self.bucket._objects[self.name] = (bytes(data), self.content_type, self.cache_control)
+
+    def upload_from_file(self, file_obj, content_type: str | None = None, **kwargs) -> None:
+        self.upload_from_string(file_obj.read(), content_type=content_type or self.content_type, **kwargs)
+
+    def download_as_bytes(self, **kwargs) -> bytes:
+        self.bucket.profile.apply("storage.download")
+        with self.bucket._lock:
+            stored = self.bucket._objects.get(self.name)
+        if stored is None:
+            raise NotFound(f"No such object: {self.bucket.name}/{self.name}")
+        return stored[0]
+
+    def exists(self, **kwargs) -> bool:
+        self.bucket.profile.apply("storage.get")
+        with self.bucket._lock:
+            return self.name in self.bucket._objects
+
+    def delete(self, **kwargs) -> None:
+        self.bucket.profile.apply("storage.delete")
+        with self.bucket._lock:
+            if self.bucket._objects.pop(self.name, None) is None:
+                raise NotFound(f"No such object: {self.bucket.name}/{self.name}")
+
+
+class MemoryBucket:
+    def __init__(self, name: str, profile: FaultProfile):
+        self.name = name
+        self.profile = profile
+        # 객체 이름 -> (내용, content_type, cache_control). Storage API는 스레드에서 호출되므로 잠급니다
+        self._objects: dict[str, tuple[bytes, str | None, str | None]] = {}
+        self._lock = threading.Lock()
+
+    def blob(self, blob_name: str, **kwargs) -> MemoryBlob:
+        return MemoryBlob(self, blob_name)
+
+    def get_blob(self, blob_name: str, **kwargs) -> MemoryBlob | None:
+        blob = self.blob(blob_name)
+        return blob if blob.exists() else None
+
+    def exists(self, **kwargs) -> bool:
+        self.profile.apply("storage.get_bucket")
+        return True
+
+    def list_blobs(self, prefix: str | None = None, **kwargs) -> list[MemoryBlob]:
+        self.profile.apply("storage.list")
+        with self._lock:
+            names = sorted(name for name in self._objects if name.startswith(prefix or ""))
+        return [self.blob(name) for name in names]
+
+
+class MemoryStorageClient:
+    """storage.Client 대신 쓰는 인메모리 클라이언트. 같은 이름의 버킷은 같은 객체를 공유합니다."""
+
+    def __init__(self, profile: FaultProfile | None = None):
+        self.profile = profile or FaultProfile()
+        self._buckets: dict[str, MemoryBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, bucket_name: str, **kwargs) -> MemoryBucket:
+        with self._lock:
+            if bucket_name not in self._buckets:
+                self._buckets[bucket_name] = MemoryBucket(bucket_name, self.profile)
+            return self._buckets[bucket_name]
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryAuthClient:
+    """firebase_admin.auth 중 회원가입에 쓰는 create_user만 흉내 냅니다."""
+
+    def __init__(self):
+        self._emails: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def create_user(self, email: str | None = None, display_name: str | None = None, **kwargs) -> SimpleNamespace:
+        with self._lock:
+            if email in self._emails:
+                raise auth.EmailAlreadyExistsError("The user with the provided email already exists", None, None)
+            uid = kwargs.get("uid") or uuid.uuid4().hex[:28]
+            self._emails[email] = uid
+        return SimpleNamespace(uid=uid, email=email, display_name=display_name)
+
+
+def seed_memory_firestore(client: MemoryFirestoreClient, content_count: int, admin_uid: str) -> None:
+    """
+    벤치마크용 초기 데이터를 넣습니다: 게시글 content_count개와 카운터, 관리자 사용자 하나.
+    관리자 토큰은 create_user_tokens(admin_uid)로 만들 수 있습니다.
+    """
+    now = datetime.now(timezone.utc)
+    categories = [category.value for category in ContentCategory]
+    writes = [
+        _Write("set", client.document("users", admin_uid), {
+            "email": f"{admin_uid}@example.com",
+            "name": admin_uid,
+            "created_at": now,
+            "updated_at": now,
+            "is_admin": True,
+            "is_active": True,
+            "is_deleted": False,
+        }),
+        _Write("set", client.document("counters", "contents"), {"count": content_count}),
+    ]
+    for post_number in range(1, content_count + 1):
+        written_at = now - timedelta(minutes=content_count - post_number)
+        writes.append(_Write("set", client.collection("contents").document(), {
+            "post_number": post_number,
+            "title": f"게시글 {post_number}",
+            "contents": f"벤치마크용 게시글 {post_number}번 본문입니다.",
+            "category": categories[post_number % len(categories)],
+            "images": [f"memory://{settings.GCS_BUCKET_NAME}/images/{post_number}.webp"],
+            "created_at": written_at,
+            "updated_at": written_at,
+            "is_deleted": False,
+        }))
+    client._apply(writes)
+
+
+_memory_firestore_client: MemoryFirestoreClient | None = None
+_memory_storage_client: MemoryStorageClient | None = None
+_memory_lock = threading.Lock()
+
+memory_auth_client = MemoryAuthClient()
+
+
+def get_memory_firestore_client() -> MemoryFirestoreClient:
+    """프로세스 전체에서 공유하는 인메모리 Firestore. 처음 호출될 때 MEMORY_BACKEND_SEED_CONTENTS만큼 채웁니다."""
+    global _memory_firestore_client
+    if _memory_firestore_client is None:
+        with _memory_lock:
+            if _memory_firestore_client is None:
+                client = MemoryFirestoreClient(_profile_from_settings(settings.MEMORY_FIRESTORE_LATENCY_MS))
+                seed_memory_firestore(client, settings.MEMORY_BACKEND_SEED_CONTENTS, settings.MEMORY_BACKEND_ADMIN_UID)
+                _memory_firestore_client = client
+                logger.info(
+                    "Using in-memory Firestore", extra={"seed_contents": settings.MEMORY_BACKEND_SEED_CONTENTS},
+                )
+    return _memory_firestore_client
+
+
+def get_memory_storage_client() -> MemoryStorageClient:
+    global _memory_storage_client
+    if _memory_storage_client is None:
+        with _memory_lock:
+            if _memory_storage_client is None:
+                _memory_storage_client = MemoryStorageClient(_profile_from_settings(settings.MEMORY_STORAGE_LATENCY_MS))
+    return _memory_storage_client
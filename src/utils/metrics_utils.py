@@ -0,0 +1,225 @@
+import bisect
+import math
+import time
+from collections.abc import Callable
+
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# 요청/백엔드 호출 시간용 기본 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 라벨로 쓰는 HTTP 메서드. 클라이언트가 보낸 임의의 메서드 이름마다 시계열이 생기지 않도록 나머지는 "other"로 묶습니다
+_KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+# 이름 -> 지표 dict. /metrics는 등록된 순서대로 내보냅니다
+_metrics: dict[str, dict[str, object]] = {}
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values, strict=True))
+    return "{" + pairs + "}"
+
+
+def _register(metric: dict[str, object]) -> dict[str, object]:
+    if metric["name"] in _metrics:
+        raise ValueError(f"Metric already registered: {metric['name']}")
+    _metrics[metric["name"]] = metric
+    return metric
+
+
+def _new_metric(name: str, documentation: str, kind: str, labelnames: tuple[str, ...]) -> dict[str, object]:
+    """
+    지표 하나를 나타내는 dict. values에 라벨 값 조합마다 값(카운터/게이지는 숫자, 히스토그램은 버킷 목록)을 둡니다.
+    기록은 이벤트 루프 스레드에서만 하므로 락 없이 값만 더합니다.
+    """
+    return {"name": name, "documentation": documentation, "kind": kind, "labelnames": labelnames, "values": {}}
+
+
+def counter(name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> dict[str, object]:
+    """계속 증가하기만 하는 값 (요청 수, 오류 수 등)."""
+    return _register(_new_metric(name, documentation, "counter", labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> dict[str, object]:
+    """올라가고 내려가는 현재 값 (처리 중인 요청 수 등)."""
+    return _register(_new_metric(name, documentation, "gauge", labelnames))
+
+
+def histogram(
+    name: str,
+    documentation: str,
+    labelnames: tuple[str, ...] = (),
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+) -> dict[str, object]:
+    """값의 분포 (응답 시간 등). 버킷별 개수를 누적 형태로 내보냅니다."""
+    metric = _new_metric(name, documentation, "histogram", labelnames)
+    metric["buckets"] = tuple(sorted(buckets))
+    return _register(metric)
+
+
+def callback_metric(
+    name: str,
+    documentation: str,
+    kind: str,
+    labelnames: tuple[str, ...],
+    collect: Callable[[], dict[tuple[str, ...], float]],
+) -> dict[str, object]:
+    """
+    다른 모듈이 이미 들고 있는 값(대기열 길이, 캐시 HIT 수 등)을 /metrics를 읽을 때 가져와 내보냅니다.
+    collect는 {라벨 값 튜플: 값} 딕셔너리를 반환합니다.
+    """
+    metric = _new_metric(name, documentation, kind, labelnames)
+    metric["collect"] = collect
+    return _register(metric)
+
+
+def _check_labels(metric: dict[str, object], labels: tuple[str, ...]) -> None:
+    if "collect" in metric:
+        raise TypeError(f"{metric['name']} is collected by callback and cannot be recorded directly")
+    if len(labels) != len(metric["labelnames"]):
+        raise ValueError(f"{metric['name']} expects labels {metric['labelnames']}")
+
+
+def inc(metric: dict[str, object], labels: tuple[str, ...] = (), amount: float = 1) -> None:
+    """카운터나 게이지의 labels 값에 amount를 더합니다."""
+    values = metric["values"]
+    if labels not in values:
+        _check_labels(metric, labels)
+        values[labels] = 0.0
+    values[labels] += amount
+
+
+def dec(metric: dict[str, object], labels: tuple[str, ...] = (), amount: float = 1) -> None:
+    inc(metric, labels, -amount)
+
+
+def observe(metric: dict[str, object], labels: tuple[str, ...], value: float) -> None:
+    """히스토그램의 labels 값에 관측값 하나를 기록합니다."""
+    values = metric["values"]
+    state = values.get(labels)
+    if state is None:
+        _check_labels(metric, labels)
+        # 버킷별 개수(마지막 칸은 +Inf 버킷), 합계, 개수
+        state = values[labels] = {"bucket_counts": [0] * (len(metric["buckets"]) + 1), "sum": 0.0, "count": 0}
+    state["bucket_counts"][bisect.bisect_left(metric["buckets"], value)] += 1
+    state["sum"] += value
+    state["count"] += 1
+
+
+def _histogram_samples(metric: dict[str, object]) -> list[str]:
+    name, labelnames = metric["name"], metric["labelnames"]
+    lines = []
+    bucket_labelnames = (*labelnames, "le")
+    for values, state in metric["values"].items():
+        cumulative = 0
+        for upper_bound, bucket_count in zip((*metric["buckets"], math.inf), state["bucket_counts"], strict=True):
+            cumulative += bucket_count
+            labels = _format_labels(bucket_labelnames, (*values, _format_value(upper_bound)))
+            lines.append(f"{name}_bucket{labels} {cumulative}")
+        labels = _format_labels(labelnames, values)
+        lines.append(f"{name}_sum{labels} {_format_value(state['sum'])}")
+        lines.append(f"{name}_count{labels} {state['count']}")
+    return lines
+
+
+def _expose_metric(metric: dict[str, object]) -> str:
+    name = metric["name"]
+    lines = [f"# HELP {name} {metric['documentation']}", f"# TYPE {name} {metric['kind']}"]
+    if "collect" in metric:
+        values = metric["collect"]().items()
+    elif metric["kind"] == "histogram":
+        values = ()
+        lines.extend(_histogram_samples(metric))
+    else:
+        values = metric["values"].items()
+    lines.extend(
+        f"{name}{_format_labels(metric['labelnames'], labels)} {_format_value(value)}"
+        for labels, value in values
+        if value is not None
+    )
+    return "\n".join(lines)
+
+
+def expose_metrics() -> str:
+    """Prometheus text format (0.0.4)으로 모든 지표를 반환합니다."""
+    return "\n".join(_expose_metric(metric) for metric in _metrics.values()) + "\n"
+
+
+http_requests_total = counter(
+    "http_requests_total", "Total HTTP requests by route, method and status", ("method", "route", "status")
+)
+http_request_duration_seconds = histogram(
+    "http_request_duration_seconds", "HTTP request latency by route, method and status", ("method", "route", "status")
+)
+http_requests_in_flight = gauge("http_requests_in_flight", "HTTP requests currently being handled", ("method",))
+backend_call_duration_seconds = histogram(
+    "backend_call_duration_seconds",
+    "Firestore/storage call latency by operation and outcome",
+    ("backend", "operation", "outcome"),
+)
+image_optimize_duration_seconds = histogram(
+    "image_optimize_duration_seconds", "Time spent resizing and converting an uploaded image to WebP"
+)
+image_upload_bytes = counter(
+    "image_upload_bytes_total", "Uploaded image bytes before and after optimization", ("stage",)
+)
+
+
+def route_template(scope: Scope, routes: list[BaseRoute]) -> str:
+    """요청이 처리된 경로 템플릿(/content/{post_number})을 반환합니다. 맞는 경로가 없으면 "unmatched"."""
+    route = scope.get("route")
+    if route is None:
+        # 캐시 HIT처럼 라우터까지 가지 않은 요청은 경로 목록에서 직접 찾습니다
+        route = next((route for route in routes if route.matches(scope)[0] == Match.FULL), None)
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    요청별 처리 시간과 상태 코드를 경로 템플릿(/content/{post_number}) 단위로 기록하는 ASGI 미들웨어.
+    게시글 번호마다 시계열이 생기지 않도록 실제 경로 대신 템플릿을 라벨로 씁니다.
+    캐시 HIT까지 재도록 가장 바깥에 둡니다.
+    """
+
+    def __init__(self, app: ASGIApp, routes: list[BaseRoute]):
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["method"] in _KNOWN_METHODS else "other"
+        status_code = 500
+        started_at = time.perf_counter()
+        inc(http_requests_in_flight, (method,))
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            dec(http_requests_in_flight, (method,))
+            labels = (method, route_template(scope, self.routes), str(status_code))
+            inc(http_requests_total, labels)
+            observe(http_request_duration_seconds, labels, time.perf_counter() - started_at)
@@ -0,0 +1,354 @@
+import asyncio
+import logging
+import math
+import os
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+from collections import deque
+
+from config import settings
+from exception import ConflictException
+from utils.metrics_utils import counter, histogram, inc, observe
+
+logger = logging.getLogger(__name__)
+
+
+class StackSampler:
+    """
+    sys._current_frames()로 스레드 스택을 주기적으로 읽어 함수 호출 경로별 샘플 수를 셉니다.
+    대상 코드에 계측을 넣지 않으므로 운영 중인 워커에서도 부담이 작습니다 (샘플링은 별도 스레드).
+    """
+
+    def __init__(self, thread_ids: set[int] | None, interval_seconds: float):
+        # None이면 샘플링 스레드를 뺀 모든 스레드
+        self.thread_ids = thread_ids
+        self.interval_seconds = interval_seconds
+        self.samples = 0
+        self.stacks: dict[str, int] = {}
+
+    @staticmethod
+    def _collapse(frame) -> list[str]:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+            frame = frame.f_back
+        stack.reverse()
+        return stack
+
+    def run(self, duration_seconds: float) -> None:
+        """duration_seconds 동안 샘플링합니다. 호출한 스레드를 막으므로 asyncio.to_thread로 실행합니다."""
+        sampler_thread_id = threading.get_ident()
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        deadline = time.monotonic() + duration_seconds
+        while time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == sampler_thread_id:
+                    continue
+                if self.thread_ids is not None and thread_id not in self.thread_ids:
+                    continue
+                thread_name = thread_names.get(thread_id) or str(thread_id)
+                key = ";".join([thread_name, *self._collapse(frame)])
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+            time.sleep(self.interval_seconds)
+
+    def collapsed(self) -> str:
+        """flamegraph.pl / speedscope에서 읽을 수 있는 collapsed stack 형식 (`a;b;c 횟수`)."""
+        lines = sorted(self.stacks.items(), key=lambda item: item[1], reverse=True)
+        return "".join(f"{stack} {count}\n" for stack, count in lines)
+
+
+class ProfilingGuard:
+    """워커 하나에서 동시에 하나의 프로파일만 실행되도록 막습니다."""
+
+    def __init__(self):
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> None:
+        if self._lock.locked():
+            raise ConflictException("Another profiling session is already running on this worker")
+        await self._lock.acquire()
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._lock.release()
+
+    def is_running(self) -> bool:
+        return self._lock.locked()
+
+
+profiling_guard = ProfilingGuard()
+
+
+async def run_cpu_profile(duration_seconds: float, interval_ms: float, all_threads: bool) -> StackSampler:
+    """
+    이벤트 루프 스레드(all_threads면 모든 스레드)를 duration_seconds 동안 샘플링합니다.
+    길이와 샘플 간격은 PROFILING_MAX_SECONDS, PROFILING_MIN_INTERVAL_MS로 제한합니다.
+
+    Raises:
+        ConflictException: 이 워커에서 이미 다른 프로파일이 실행 중인 경우
+    """
+    duration_seconds = min(duration_seconds, settings.PROFILING_MAX_SECONDS)
+    interval_seconds = max(interval_ms, settings.PROFILING_MIN_INTERVAL_MS) / 1000
+    sampler = StackSampler(None if all_threads else {threading.get_ident()}, interval_seconds)
+    async with profiling_guard:
+        await asyncio.to_thread(sampler.run, duration_seconds)
+    return sampler
+
+
+def _format_traceback(traceback: tracemalloc.Traceback) -> str:
+    return " <- ".join(f"{os.path.basename(frame.filename)}:{frame.lineno}" for frame in traceback)
+
+
+class MemoryProfiler:
+    """
+    tracemalloc으로 메모리 할당 위치를 추적합니다. 스냅샷을 찍을 때마다 이전 스냅샷과 비교할 수 있도록 보관합니다.
+    추적 중에는 모든 할당이 느려지므로 필요한 동안만 켭니다.
+    """
+
+    _FILTERS = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    )
+
+    def __init__(self):
+        self.last_snapshot: tracemalloc.Snapshot | None = None
+        self.started_at: float | None = None
+
+    def start(self, frames: int) -> None:
+        """추적을 켭니다. 잊고 끄지 않아도 TRACEMALLOC_MAX_SECONDS 뒤에는 자동으로 꺼집니다."""
+        if tracemalloc.is_tracing():
+            raise ConflictException("Memory tracing is already running")
+        tracemalloc.start(max(1, min(frames, settings.TRACEMALLOC_MAX_FRAMES)))
+        started_at = self.started_at = time.monotonic()
+        self.last_snapshot = None
+        asyncio.get_running_loop().call_later(settings.TRACEMALLOC_MAX_SECONDS, self._stop_if_started_at, started_at)
+
+    def _stop_if_started_at(self, started_at: float) -> None:
+        # 그 사이 다시 시작된 추적은 건드리지 않습니다
+        if self.started_at != started_at:
+            return
+        if profiling_guard.is_running():
+            # 스냅샷/diff가 끝난 뒤에 끕니다
+            asyncio.get_running_loop().call_later(1, self._stop_if_started_at, started_at)
+            return
+        self.stop()
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        self.started_at = None
+        self.last_snapshot = None
+
+    def status(self) -> dict[str, object]:
+        is_tracing = tracemalloc.is_tracing()
+        return {
+            "is_tracing": is_tracing,
+            "frames": tracemalloc.get_traceback_limit() if is_tracing else None,
+            "running_seconds": round(time.monotonic() - self.started_at, 1) if self.started_at is not None else None,
+            "has_snapshot": self.last_snapshot is not None,
+        }
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        if not tracemalloc.is_tracing():
+            raise ConflictException("Memory tracing is not running. Start it first")
+        return tracemalloc.take_snapshot().filter_traces(self._FILTERS)
+
+    def snapshot(self, limit: int, group_by: str) -> dict[str, object]:
+        """
+        현재 할당량 상위 limit개를 반환하고, 다음 diff의 기준으로 보관합니다.
+        블로킹 작업이므로 스레드에서 실행합니다.
+        """
+        snapshot = self._take_snapshot()
+        stats = snapshot.statistics(group_by)
+        self.last_snapshot = snapshot
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "top": [
+                {"location": _format_traceback(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+                for stat in stats[:limit]
+            ],
+        }
+
+    def diff(self, limit: int, group_by: str) -> dict[str, object]:
+        """직전 스냅샷 이후 늘어난(줄어든) 할당 상위 limit개를 반환하고, 새 스냅샷을 기준으로 바꿉니다."""
+        if self.last_snapshot is None:
+            raise ConflictException("No previous snapshot to compare. Take a snapshot first")
+        snapshot = self._take_snapshot()
+        stats = snapshot.compare_to(self.last_snapshot, group_by)
+        self.last_snapshot = snapshot
+        return {
+            "top": [
+                {
+                    "location": _format_traceback(stat.traceback),
+                    "size_diff_bytes": stat.size_diff,
+                    "size_bytes": stat.size,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in stats[:limit]
+            ],
+        }
+
+
+memory_profiler = MemoryProfiler()
+
+
+class LoopLagMonitor:
+    """
+    interval_seconds마다 깨어나 예정보다 얼마나 늦게 깨어났는지(이벤트 루프 지연)를 기록합니다.
+    늦어진 만큼 다른 요청도 같은 시간 동안 처리되지 못했다는 뜻입니다.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = settings.LOOP_LAG_INTERVAL_SECONDS,
+        window_size: int = settings.LOOP_LAG_WINDOW_SIZE,
+    ):
+        self.interval_seconds = interval_seconds
+        self.lags: deque[float] = deque(maxlen=window_size)
+        self.max_lag = 0.0
+        self.last_tick = time.monotonic()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled_at = loop.time() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            lag = max(0.0, loop.time() - scheduled_at)
+            self.last_tick = time.monotonic()
+            self.lags.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+
+    def stats(self) -> dict[str, object]:
+        ordered = sorted(self.lags)
+
+        def percentile(quantile: float) -> float | None:
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, math.ceil(quantile * len(ordered)) - 1)] * 1000, 3)
+
+        return {
+            "interval_seconds": self.interval_seconds,
+            "samples": len(ordered),
+            "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else None,
+            "p50_ms": percentile(0.5),
+            "p99_ms": percentile(0.99),
+            "window_max_ms": round(ordered[-1] * 1000, 3) if ordered else None,
+            "max_ms": round(self.max_lag * 1000, 3),
+        }
+
+
+loop_lag_monitor = LoopLagMonitor()
+
+
+event_loop_blocked_total = counter(
+    "event_loop_blocked_total",
+    "Times the event loop was blocked longer than LOOP_WATCHDOG_THRESHOLD_MS, by innermost application frame",
+    ("location",),
+)
+event_loop_block_duration_seconds = histogram(
+    "event_loop_block_duration_seconds",
+    "Duration of event loop blocks detected by the watchdog",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+# 스택에서 이 프로젝트 코드를 가려낼 때 쓰는 src 디렉터리 경로
+_APPLICATION_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+
+
+def _application_location(frame) -> str:
+    """스택에서 가장 안쪽에 있는 이 프로젝트 코드 위치. 라이브러리 안에서 막혀 있어도 어디서 불렀는지 알 수 있습니다."""
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APPLICATION_ROOT) and "site-packages" not in filename:
+            return f"{os.path.relpath(filename, _APPLICATION_ROOT)}:{frame.f_code.co_qualname}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class LoopWatchdog:
+    """
+    이벤트 루프가 동기 호출(블로킹 I/O, 무거운 계산)로 멈춘 것을 찾아냅니다.
+    루프 안의 heartbeat 작업이 주기적으로 시각을 갱신하고, 별도 스레드가 그 시각이 threshold_seconds 넘게
+    멈춰 있으면 그 순간 루프 스레드의 스택을 떠서 경고 로그와 지표로 남깁니다.
+    """
+
+    def __init__(self, threshold_seconds: float = settings.LOOP_WATCHDOG_THRESHOLD_MS / 1000):
+        self.threshold_seconds = threshold_seconds
+        # 멈춤을 threshold의 1/4 정도 오차 안에서 잡을 수 있도록 자주 확인합니다
+        self.interval_seconds = max(0.01, threshold_seconds / 4)
+        self.last_beat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        """이벤트 루프 안에서 호출합니다. 호출한 스레드를 감시 대상 루프 스레드로 기록합니다."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._beat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._stopped.set()
+        self._thread = None
+
+    async def _beat(self) -> None:
+        while True:
+            self.last_beat = time.monotonic()
+            await asyncio.sleep(self.interval_seconds)
+
+    def _watch(self) -> None:
+        reported_beat: float | None = None
+        while not self._stopped.wait(self.interval_seconds):
+            last_beat = self.last_beat
+            stalled = time.monotonic() - last_beat - self.interval_seconds
+            if reported_beat is not None and last_beat != reported_beat:
+                # 보고했던 멈춤이 끝났습니다. 멈춘 전체 시간은 heartbeat가 다시 돈 시각으로 계산합니다
+                block_duration = max(0.0, last_beat - reported_beat - self.interval_seconds)
+                observe(event_loop_block_duration_seconds, (), block_duration)
+                reported_beat = None
+            if reported_beat is None and stalled >= self.threshold_seconds:
+                self._report(stalled)
+                reported_beat = last_beat
+
+    def _report(self, stalled: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        location = _application_location(frame)
+        inc(event_loop_blocked_total, (location,))
+        logger.warning(
+            "Event loop blocked for at least %.0f ms at %s", stalled * 1000, location,
+            extra={
+                "blocked_ms": round(stalled * 1000, 1),
+                "location": location,
+                "stack": "".join(traceback.format_stack(frame, limit=settings.LOOP_WATCHDOG_STACK_DEPTH)),
+            },
+        )
+
+
+loop_watchdog = LoopWatchdog()
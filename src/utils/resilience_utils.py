@@ -0,0 +1,237 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+
+from google.api_core.exceptions import (
+    DeadlineExceeded,
+    GatewayTimeout,
+    InternalServerError,
+    ResourceExhausted,
+    ServiceUnavailable,
+)
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from config import settings
+from exception import GatewayTimeoutException, ServiceUnavailableException
+from utils.admission_utils import ADMIN, PUBLIC, UPLOAD, classify_request
+from utils.metrics_utils import backend_call_duration_seconds, callback_metric, observe
+from utils.tracing_utils import start_span
+
+# 경로 종류별 요청 처리 시간 한도
+ROUTE_DEADLINES = {
+    PUBLIC: settings.REQUEST_DEADLINE_PUBLIC_SECONDS,
+    ADMIN: settings.REQUEST_DEADLINE_ADMIN_SECONDS,
+    UPLOAD: settings.REQUEST_DEADLINE_UPLOAD_SECONDS,
+}
+
+# 백엔드가 일시적으로 처리하지 못한 오류. 트랜잭션 재시도가 이 예외로 판단하므로 call()은 그대로 전파하고,
+# 요청까지 올라오면 backend_unavailable_handler가 500 대신 503으로 응답합니다
+BACKEND_UNAVAILABLE_ERRORS = (InternalServerError, ResourceExhausted, ServiceUnavailable)
+
+# 백엔드 장애로 보고 circuit breaker에 실패로 기록할 예외 (NotFound 같은 요청 오류는 제외)
+_BACKEND_FAILURES = (
+    asyncio.TimeoutError,
+    DeadlineExceeded,
+    GatewayTimeout,
+    *BACKEND_UNAVAILABLE_ERRORS,
+)
+
+# 응답을 길게 스트리밍하는 경로는 요청 전체 deadline 없이 호출마다 BACKEND_CALL_TIMEOUT_SECONDS만 적용합니다
+_NO_DEADLINE_PATHS = {"/content/admin/import", "/content/admin/export"}
+
+_request_deadline: ContextVar[float | None] = ContextVar("request_deadline", default=None)
+
+
+def remaining_budget(default: float = settings.BACKEND_CALL_TIMEOUT_SECONDS) -> float:
+    """
+    백엔드 호출에 쓸 timeout을 반환합니다. 요청 deadline까지 남은 시간과 default 중 작은 값입니다.
+
+    Raises:
+        GatewayTimeoutException: 요청 deadline이 이미 지난 경우
+    """
+    deadline = _request_deadline.get()
+    if deadline is None:
+        return default
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise GatewayTimeoutException()
+    return min(default, remaining)
+
+
+class CircuitBreaker:
+    """
+    최근 window_size번의 호출 중 실패 비율이 failure_rate_threshold 이상이면 open 상태가 되어
+    open_seconds 동안 호출을 바로 거절합니다. 그 뒤 한 번의 시험 호출(half-open)이 성공하면 다시 닫힙니다.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        window_size: int = settings.CIRCUIT_BREAKER_WINDOW_SIZE,
+        min_calls: int = settings.CIRCUIT_BREAKER_MIN_CALLS,
+        failure_rate_threshold: float = settings.CIRCUIT_BREAKER_FAILURE_RATE,
+        open_seconds: float = settings.CIRCUIT_BREAKER_OPEN_SECONDS,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.open_seconds = open_seconds
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self._outcomes: deque[bool] = deque(maxlen=window_size)
+        self._is_probing = False
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.open_seconds - time.monotonic())
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN:
+            if self.retry_after() > 0:
+                return False
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            # half-open에서는 시험 호출 하나만 통과시킵니다
+            if self._is_probing:
+                return False
+            self._is_probing = True
+        return True
+
+    def cancel_probe(self) -> None:
+        """결과 없이 끝난(취소된) 호출이 시험 호출이었다면 다음 호출이 시험할 수 있게 합니다."""
+        self._is_probing = False
+
+    def record_success(self) -> None:
+        if self.state == self.HALF_OPEN:
+            self.state = self.CLOSED
+            self._outcomes.clear()
+            self._is_probing = False
+        self._outcomes.append(True)
+
+    def record_failure(self) -> None:
+        if self.state == self.HALF_OPEN:
+            self._open()
+            return
+        self._outcomes.append(False)
+        failures = self._outcomes.count(False)
+        if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate_threshold:
+            self._open()
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self._is_probing = False
+        self._outcomes.clear()
+
+
+circuit_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(backend: str, operation: str) -> CircuitBreaker:
+    name = f"{backend}.{operation}"
+    if name not in circuit_breakers:
+        circuit_breakers[name] = CircuitBreaker(name)
+    return circuit_breakers[name]
+
+
+_BREAKER_STATE_VALUES = {CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}
+
+callback_metric(
+    "circuit_breaker_state",
+    "Circuit breaker state per backend operation (0: closed, 1: half-open, 2: open)",
+    "gauge",
+    ("breaker",),
+    lambda: {(name,): _BREAKER_STATE_VALUES[breaker.state] for name, breaker in circuit_breakers.items()},
+)
+
+
+async def call(
+    backend: str,
+    operation: str,
+    func: Callable[..., Awaitable[object]],
+    *args,
+    pass_timeout: bool = True,
+    **kwargs,
+) -> object:
+    """
+    Firestore/GCS 호출을 요청 deadline과 circuit breaker 아래에서 실행합니다.
+    남은 시간을 func의 timeout 인자로 넘기고(pass_timeout=False면 기다리기만 제한),
+    그 안에 끝나지 않으면 504로 실패합니다.
+    예: `await call("firestore", "read", query.get, transaction=transaction)`
+
+    Raises:
+        ServiceUnavailableException: 해당 백엔드/작업의 circuit breaker가 열려 있는 경우
+        GatewayTimeoutException: 요청 deadline 또는 호출 timeout이 지난 경우
+    """
+    timeout = remaining_budget()
+    breaker = get_circuit_breaker(backend, operation)
+    if not breaker.allow():
+        raise ServiceUnavailableException(f"{backend} is temporarily unavailable", retry_after=breaker.retry_after())
+
+    if pass_timeout:
+        kwargs["timeout"] = timeout
+    outcome = "ok"
+    started_at = time.perf_counter()
+    # asyncio.to_thread로 넘긴 블로킹 호출은 실제 호출 대상 이름을 남깁니다
+    target = args[0] if func is asyncio.to_thread and args else func
+    try:
+        with start_span(f"{backend}.{operation}", call=getattr(target, "__qualname__", repr(target))):
+            result = await asyncio.wait_for(func(*args, **kwargs), timeout=timeout)
+    except _BACKEND_FAILURES as e:
+        breaker.record_failure()
+        if isinstance(e, (asyncio.TimeoutError, DeadlineExceeded, GatewayTimeout)):
+            outcome = "timeout"
+            raise GatewayTimeoutException() from e
+        outcome = "error"
+        raise
+    except asyncio.CancelledError:
+        breaker.cancel_probe()
+        outcome = "cancelled"
+        raise
+    except Exception:
+        # NotFound, Conflict 같은 요청 단위 오류는 백엔드가 정상 응답한 것으로 봅니다
+        breaker.record_success()
+        outcome = "client_error"
+        raise
+    finally:
+        observe(backend_call_duration_seconds, (backend, operation, outcome), time.perf_counter() - started_at)
+    breaker.record_success()
+    return result
+
+
+async def backend_unavailable_handler(request: Request, exc: Exception) -> JSONResponse:
+    """BACKEND_UNAVAILABLE_ERRORS를 503으로 바꿔, 클라이언트가 Retry-After 뒤에 다시 시도할 수 있게 합니다."""
+    return JSONResponse(
+        {"detail": "Backend is temporarily unavailable"},
+        status_code=503,
+        headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+    )
+
+
+class DeadlineMiddleware:
+    """
+    요청 종류(public/admin/upload)에 맞는 deadline을 정해 둡니다. 하위 백엔드 호출은 call()에서 남은 시간만 씁니다.
+    대기열에서 기다린 시간도 포함되도록 AdmissionControlMiddleware보다 바깥에 둡니다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route_class = classify_request(scope) if scope["type"] == "http" else None
+        if route_class is None or scope["path"] in _NO_DEADLINE_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        token = _request_deadline.set(time.monotonic() + ROUTE_DEADLINES[route_class])
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_deadline.reset(token)
@@ -0,0 +1,48 @@
+import json
+from datetime import datetime
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # orjson이 설치되지 않은 환경에서는 표준 json으로 직렬화
+    orjson = None
+
+
+def _default(value: object) -> object:
+    # Firestore의 DatetimeWithNanoseconds 같은 datetime 하위 클래스는 orjson이 직접 처리하지 못합니다
+    if isinstance(value, datetime):
+        return datetime.combine(value.date(), value.timetz())
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dump_json(content: object) -> bytes:
+    """
+    이미 검증된 응답 데이터를 JSON bytes로 직렬화합니다.
+    pydantic의 JSON 출력과 같은 형식(UTC는 "Z", 한글은 이스케이프하지 않음)을 유지합니다.
+    """
+    if isinstance(content, BaseModel):
+        # 모델은 pydantic-core가 Python dict를 거치지 않고 바로 JSON으로 씁니다
+        return pydantic_core.to_json(content)
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+    return json.dumps(
+        content,
+        default=lambda value: _default(value).isoformat().replace("+00:00", "Z"),
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    서비스에서 이미 한 번 검증한 응답 모델을 response_model 재검증 없이 바로 직렬화하는 응답.
+    라우트에서 이 응답을 반환하면 FastAPI가 response_model로 다시 검증/직렬화하지 않습니다.
+    (model_construct()는 Python으로 필드를 채워 pydantic-core 검증보다 느리므로, 검증은 생략하지 않고 한 번만 합니다)
+    OpenAPI 스키마는 라우트의 response_model로 그대로 생성됩니다.
+    """
+
+    def render(self, content: object) -> bytes:
+        return dump_json(content)
@@ -0,0 +1,198 @@
+import base64
+import math
+import re
+from datetime import datetime
+
+from google.cloud.firestore_v1.async_client import AsyncClient
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+# 한글/한자는 음절 단위로, 그 외 문자는 영문자+숫자 단어 단위로 자릅니다
+_TOKEN_PATTERN = re.compile(r"[가-힣ㄱ-ㆎ一-鿿]+|[a-z0-9]+")
+_HANGUL_PATTERN = re.compile(r"[가-힣ㄱ-ㆎ一-鿿]")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    한글을 고려한 토크나이저.
+    한글은 띄어쓰기와 조사가 붙는 형태가 다양하므로 음절 bigram으로, 영문/숫자는 소문자 단어로 자릅니다.
+    예: "장학금 신청" -> ["장학", "학금", "신청"]
+    """
+    tokens = []
+    for run in _TOKEN_PATTERN.findall(text.lower()):
+        if _HANGUL_PATTERN.match(run) and len(run) > 1:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def _encode_cursor(score: float, post_number: int) -> str:
+    return base64.urlsafe_b64encode(f"{score!r}:{post_number}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, post_number = base64.urlsafe_b64decode(padded.encode()).decode().split(":")
+        return float(score), int(post_number)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid search cursor") from e
+
+
+class ContentSearchIndex:
+    """
+    게시글 title/contents에 대한 프로세스 내 역색인 (BM25 랭킹).
+    시작 시 build()로 전체를 적재하고, 게시글 생성/수정/삭제 시 upsert()/remove()로 갱신합니다.
+    다른 워커나 다른 인스턴스에서 일어난 변경은 게시글 변경 리스너를 거쳐 apply_change()로 반영합니다.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, title_weight: int = 2):
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight  # 제목 토큰은 본문보다 가중치를 줍니다
+        self.postings: dict[str, dict[int, int]] = {}
+        # post_number -> (문서 길이, 토큰 빈도, 요약, updated_at)
+        self.documents: dict[int, tuple[int, dict[str, int], dict[str, object], datetime | None]] = {}
+        self.total_length = 0
+        self.is_ready = False
+        # build 중에 삭제된 게시글이 오래된 스냅샷으로 다시 추가되지 않도록 기록
+        self._removed: dict[int, datetime | None] = {}
+        # build()가 만들고 있는 새 색인. 그동안 들어온 변경도 함께 반영합니다
+        self._building: list[ContentSearchIndex] = []
+
+    def _is_stale(self, post_number: int, updated_at: datetime | None) -> bool:
+        known = self.documents.get(post_number)
+        known_updated_at = known[3] if known else self._removed.get(post_number)
+        return updated_at is not None and known_updated_at is not None and updated_at < known_updated_at
+
+    def upsert(self, post_number: int, content_data: dict[str, object]) -> None:
+        for index in self._building:
+            index.upsert(post_number, content_data)
+        updated_at = content_data.get("updated_at")
+        if self._is_stale(post_number, updated_at):
+            return
+        self._discard(post_number)
+        self._removed.pop(post_number, None)
+
+        term_counts: dict[str, int] = {}
+        for token in tokenize(str(content_data.get("title", ""))):
+            term_counts[token] = term_counts.get(token, 0) + self.title_weight
+        for token in tokenize(str(content_data.get("contents", ""))):
+            term_counts[token] = term_counts.get(token, 0) + 1
+
+        for term, count in term_counts.items():
+            self.postings.setdefault(term, {})[post_number] = count
+
+        images = content_data.get("images") or []
+        summary = {
+            "post_number": post_number,
+            "title": content_data.get("title", ""),
+            "first_image": images[0] if images else "",
+            "category": content_data.get("category"),
+        }
+        length = sum(term_counts.values())
+        self.documents[post_number] = (length, term_counts, summary, updated_at)
+        self.total_length += length
+
+    def remove(self, post_number: int, updated_at: datetime | None = None) -> None:
+        for index in self._building:
+            index.remove(post_number, updated_at)
+        if self._is_stale(post_number, updated_at):
+            return
+        self._discard(post_number)
+        self._removed[post_number] = updated_at
+
+    def apply_change(self, document_id: str, content_data: dict[str, object]) -> None:
+        """Firestore 리스너로 받은 게시글 문서를 반영합니다. 같은 변경을 여러 번 받아도 결과는 같습니다."""
+        if content_data.get("is_deleted"):
+            self.remove(content_data["post_number"], content_data.get("updated_at"))
+        else:
+            self.upsert(content_data["post_number"], content_data)
+
+    def _discard(self, post_number: int) -> None:
+        document = self.documents.pop(post_number, None)
+        if document is None:
+            return
+        length, term_counts, _, _ = document
+        self.total_length -= length
+        for term in term_counts:
+            term_postings = self.postings.get(term)
+            if term_postings is None:
+                continue
+            term_postings.pop(post_number, None)
+            if not term_postings:
+                del self.postings[term]
+
+    def search(
+        self,
+        query: str,
+        category: str | None = None,
+        limit: int = 10,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, object]], str | None]:
+        """
+        BM25 점수 순(동점이면 최신 글 먼저)으로 검색 결과 요약과 다음 페이지 커서를 반환합니다.
+
+        Raises:
+            ValueError: 커서 형식이 올바르지 않은 경우
+        """
+        after = _decode_cursor(cursor) if cursor else None
+        document_count = len(self.documents)
+        if document_count == 0:
+            return [], None
+        average_length = self.total_length / document_count
+
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            term_postings = self.postings.get(term)
+            if not term_postings:
+                continue
+            idf = math.log(1 + (document_count - len(term_postings) + 0.5) / (len(term_postings) + 0.5))
+            for post_number, frequency in term_postings.items():
+                length = self.documents[post_number][0]
+                norm = self.k1 * (1 - self.b + self.b * length / average_length)
+                scores[post_number] = scores.get(post_number, 0.0) + idf * frequency * (self.k1 + 1) / (
+                    frequency + norm
+                )
+
+        ranked = sorted(
+            (
+                (-score, -post_number)
+                for post_number, score in scores.items()
+                if category is None or self.documents[post_number][2]["category"] == category
+            ),
+        )
+        if after is not None:
+            after_key = (-after[0], -after[1])
+            ranked = [key for key in ranked if key > after_key]
+
+        page = ranked[:limit]
+        results = [self.documents[-post_number][2] for _, post_number in page]
+        next_cursor = None
+        if len(ranked) > limit:
+            last_score, last_post_number = page[-1]
+            next_cursor = _encode_cursor(-last_score, -last_post_number)
+        return results, next_cursor
+
+    async def build(self, db: AsyncClient) -> None:
+        """
+        삭제되지 않은 게시글을 모두 읽어 새 색인을 만든 뒤 한 번에 교체합니다.
+        기존 색인 위에 덧쓰지 않으므로, 리스너가 끊긴 동안 삭제된 게시글도 다시 만들면 사라집니다.
+        """
+        fresh = ContentSearchIndex(self.k1, self.b, self.title_weight)
+        self._building.append(fresh)
+        try:
+            contents_query = db.collection("contents").where(filter=FieldFilter("is_deleted", "==", False))
+            async for document in contents_query.stream():
+                content_data = document.to_dict()
+                fresh.upsert(content_data["post_number"], content_data)
+        finally:
+            self._building.remove(fresh)
+        self.postings = fresh.postings
+        self.documents = fresh.documents
+        self.total_length = fresh.total_length
+        self._removed = fresh._removed
+        self.is_ready = True
+
+
+content_search_index = ContentSearchIndex()
@@ -0,0 +1,24 @@
+import base64
+import json
+from datetime import datetime
+
+
+def encode_change_token(updated_at: datetime, document_id: str) -> str:
+    """변경 피드 위치(updated_at, 문서 ID)를 URL에 안전한 불투명 토큰으로 인코딩합니다."""
+    payload = json.dumps({"u": updated_at.isoformat(), "id": document_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_change_token(token: str) -> tuple[datetime, str]:
+    """
+    encode_change_token으로 만든 토큰을 (updated_at, 문서 ID)로 되돌립니다.
+
+    Raises:
+        ValueError: 토큰 형식이 올바르지 않은 경우
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["u"]), str(payload["id"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError("Invalid change token") from e
@@ -0,0 +1,83 @@
+import asyncio
+import os
+import tempfile
+
+from google.cloud import storage
+
+from config import settings
+from database import get_storage
+
+
+class GCSSnapshotStorage:
+    """정적 스냅샷을 ImageUploader와 같은 GCS 버킷에 저장합니다."""
+
+    def __init__(self, storage_client: storage.Client, bucket_name: str = settings.GCS_BUCKET_NAME):
+        self.bucket = storage_client.bucket(bucket_name)
+        self.cache_control = settings.SNAPSHOT_CACHE_CONTROL
+
+    async def write(self, path: str, data: bytes) -> None:
+        blob = self.bucket.blob(path)
+        blob.cache_control = self.cache_control
+        await asyncio.to_thread(blob.upload_from_string, data, content_type="application/json")
+
+    async def read(self, path: str) -> bytes | None:
+        blob = self.bucket.blob(path)
+        if not await asyncio.to_thread(blob.exists):
+            return None
+        return await asyncio.to_thread(blob.download_as_bytes)
+
+    async def delete(self, path: str) -> None:
+        blob = self.bucket.blob(path)
+        if await asyncio.to_thread(blob.exists):
+            await asyncio.to_thread(blob.delete)
+
+
+class LocalSnapshotStorage:
+    """
+    로컬 디렉터리에 정적 스냅샷을 저장합니다.
+    GCS 없이 개발하거나 테스트할 때 쓰는 대체 저장소입니다.
+    """
+
+    def __init__(self, base_dir: str = settings.SNAPSHOT_LOCAL_DIR):
+        self.base_dir = base_dir
+
+    def _full_path(self, path: str) -> str:
+        return os.path.join(self.base_dir, *path.split("/"))
+
+    def _write(self, path: str, data: bytes) -> None:
+        full_path = self._full_path(path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        # 읽는 쪽이 쓰다 만 파일을 보지 않도록 임시 파일에 쓰고 교체합니다
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(full_path))
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(data)
+        os.replace(temp_path, full_path)
+
+    async def write(self, path: str, data: bytes) -> None:
+        await asyncio.to_thread(self._write, path, data)
+
+    def _read(self, path: str) -> bytes | None:
+        try:
+            with open(self._full_path(path), "rb") as snapshot_file:
+                return snapshot_file.read()
+        except FileNotFoundError:
+            return None
+
+    def _delete(self, path: str) -> None:
+        try:
+            os.remove(self._full_path(path))
+        except FileNotFoundError:
+            pass
+
+    async def read(self, path: str) -> bytes | None:
+        return await asyncio.to_thread(self._read, path)
+
+    async def delete(self, path: str) -> None:
+        await asyncio.to_thread(self._delete, path)
+
+
+async def get_snapshot_storage() -> GCSSnapshotStorage | LocalSnapshotStorage:
+    """SNAPSHOT_BACKEND 설정에 맞는 스냅샷 저장소를 반환합니다."""
+    if settings.SNAPSHOT_BACKEND == "local":
+        return LocalSnapshotStorage()
+    return GCSSnapshotStorage(await get_storage())
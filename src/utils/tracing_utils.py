@@ -0,0 +1,275 @@
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+from utils.metrics_utils import route_template
+
+logger = logging.getLogger(__name__)
+
+
+class Span:
+    """추적 구간 하나. 시작/종료 시각과 속성(post_number, 이미지 수, 바이트 수 등)을 담습니다."""
+
+    __slots__ = ("trace", "name", "span_id", "parent_id", "start", "end", "attributes", "error")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: str | None, attributes: dict[str, object]):
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start = time.perf_counter()
+        self.end: float | None = None
+        self.attributes = attributes
+        self.error: str | None = None
+
+    def set_attribute(self, key: str, value: object) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        end = time.perf_counter() if self.end is None else self.end
+        return (end - self.start) * 1000
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.trace.started_at + (self.start - self.trace.start),
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """추적 중이 아닐 때 돌려주는 빈 구간. 호출하는 쪽이 추적 여부를 확인하지 않아도 됩니다."""
+
+    def set_attribute(self, key: str, value: object) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """요청 하나에서 만들어진 구간 목록."""
+
+    def __init__(self, is_sampled: bool):
+        self.trace_id = os.urandom(16).hex()
+        self.is_sampled = is_sampled
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.spans: list[Span] = []
+
+
+_current_trace: ContextVar[Trace | None] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def start_span(name: str, **attributes: object) -> Iterator[Span | _NoopSpan]:
+    """
+    현재 요청의 추적에 하위 구간을 엽니다. 요청 밖이거나 TRACING_ENABLED가 꺼져 있으면 아무것도 기록하지 않습니다.
+    예: `with start_span("image.optimize", bytes=len(data)) as span: ...`
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield _NOOP_SPAN
+        return
+
+    parent = _current_span.get()
+    span = Span(trace, name, parent.span_id if parent is not None else None, attributes)
+    trace.spans.append(span)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = type(e).__name__
+        raise
+    finally:
+        span.end = time.perf_counter()
+        _current_span.reset(token)
+
+
+def current_trace_id() -> str | None:
+    trace = _current_trace.get()
+    return trace.trace_id if trace is not None else None
+
+
+def set_span_attribute(key: str, value: object) -> None:
+    """현재 구간에 속성을 추가합니다. 결과가 나온 뒤에야 알 수 있는 값(새 post_number 등)에 씁니다."""
+    span = _current_span.get()
+    if span is not None:
+        span.set_attribute(key, value)
+
+
+def traced(name: str, attributes: tuple[str, ...] = ()) -> Callable:
+    """
+    async 함수 전체를 구간으로 감싸는 데코레이터. attributes에 적은 인자 값은 구간 속성으로 남깁니다.
+    예: `@traced("content.get", attributes=("post_number",))`
+    """
+    def decorator(func: Callable[..., Awaitable[object]]) -> Callable[..., Awaitable[object]]:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return await func(*args, **kwargs)
+            arguments = signature.bind_partial(*args, **kwargs).arguments if attributes else {}
+            with start_span(name, **{key: arguments[key] for key in attributes if key in arguments}):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class SpanExporter(ABC):
+    """끝난 추적을 내보내는 곳. 별도 스레드에서 호출되므로 블로킹 I/O를 해도 됩니다."""
+
+    @abstractmethod
+    def export(self, spans: list[dict[str, object]]) -> None:
+        """추적 하나에 속한 구간들을 내보냅니다."""
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """구간 하나를 JSON 한 줄로 stdout에 씁니다."""
+
+    def export(self, spans: list[dict[str, object]]) -> None:
+        sys.stdout.write("".join(json.dumps(span, ensure_ascii=False, default=str) + "\n" for span in spans))
+        sys.stdout.flush()
+
+
+class FileSpanExporter(SpanExporter):
+    """구간 하나를 JSON 한 줄로 파일 끝에 이어 씁니다."""
+
+    def __init__(self, path: str = settings.TRACING_FILE_PATH):
+        self.path = path
+
+    def export(self, spans: list[dict[str, object]]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(span, ensure_ascii=False, default=str) + "\n" for span in spans)
+
+
+class _ExportWorker:
+    """요청 처리를 막지 않도록 내보내기를 백그라운드 스레드 하나에서 차례로 처리합니다."""
+
+    def __init__(self, exporter: SpanExporter):
+        self.exporter = exporter
+        self._queue: queue.SimpleQueue[list[dict[str, object]]] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, spans: list[dict[str, object]]) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                    self._thread.start()
+        self._queue.put(spans)
+
+    def _run(self) -> None:
+        while True:
+            spans = self._queue.get()
+            try:
+                self.exporter.export(spans)
+            except Exception:
+                logger.exception("Span export failed")
+
+
+def _create_exporter() -> SpanExporter | None:
+    """TRACING_EXPORTER 설정에 맞는 exporter를 만듭니다. none이면 내보내지 않고 Server-Timing에만 씁니다."""
+    if settings.TRACING_EXPORTER == "console":
+        return ConsoleSpanExporter()
+    if settings.TRACING_EXPORTER == "file":
+        return FileSpanExporter()
+    return None
+
+
+span_exporter = _create_exporter()
+_export_worker = _ExportWorker(span_exporter) if span_exporter is not None else None
+
+
+def _sanitize_metric_name(name: str) -> str:
+    # Server-Timing 이름은 token이어야 하므로 허용되지 않는 문자는 _로 바꿉니다
+    return "".join(char if char.isalnum() or char in "-_." else "_" for char in name)
+
+
+def build_server_timing(trace: Trace, root: Span) -> bytes:
+    """
+    이름별로 합친 구간 시간 중 상위 SERVER_TIMING_MAX_ENTRIES개와 전체 시간을 Server-Timing 값으로 만듭니다.
+    동시에 실행된 구간은 시간을 더하므로 전체 시간보다 클 수 있고, 그때는 desc에 횟수를 적습니다.
+    """
+    totals: dict[str, list[float]] = {}
+    for span in trace.spans:
+        if span is not root:
+            total = totals.setdefault(span.name, [0.0, 0])
+            total[0] += span.duration_ms
+            total[1] += 1
+    top = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)[:settings.SERVER_TIMING_MAX_ENTRIES]
+    entries = [
+        f"{_sanitize_metric_name(name)};dur={duration:.1f}" + (f';desc="x{count}"' if count > 1 else "")
+        for name, (duration, count) in top
+    ]
+    entries.append(f"total;dur={root.duration_ms:.1f}")
+    return ", ".join(entries).encode()
+
+
+class TracingMiddleware:
+    """
+    요청마다 경로 템플릿 이름의 최상위 구간을 열고, 서비스/Firestore/GCS 구간을 그 아래에 모읍니다.
+    응답에 Server-Timing 헤더로 시간이 오래 걸린 구간을 요약하고, 끝나면 표본으로 뽑힌 추적을 exporter로 보냅니다.
+    Server-Timing이 응답 캐시에 저장되지 않도록 CompressionMiddleware보다 바깥에 둡니다.
+    """
+
+    def __init__(self, app: ASGIApp, routes: list[BaseRoute]):
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.TRACING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(is_sampled=random.random() < settings.TRACING_SAMPLE_RATE)
+        trace_token = _current_trace.set(trace)
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.SERVER_TIMING_ENABLED:
+                    server_timing = build_server_timing(trace, root)
+                    message["headers"] = [*message.get("headers", []), (b"server-timing", server_timing)]
+            await send(message)
+
+        try:
+            with start_span(f"{scope['method']} {scope['path']}", method=scope["method"]) as root:
+                try:
+                    await self.app(scope, receive, send_wrapper)
+                finally:
+                    root.name = f"{scope['method']} {route_template(scope, self.routes)}"
+                    root.set_attribute("path", scope["path"])
+                    root.set_attribute("status", status_code)
+        finally:
+            _current_trace.reset(trace_token)
+            if trace.is_sampled and _export_worker is not None:
+                _export_worker.submit([span.to_dict() for span in trace.spans])
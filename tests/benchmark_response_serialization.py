@@ -0,0 +1,107 @@
+"""
+게시글 목록 응답 직렬화 비용 비교: 기존 방식(검증된 모델 + response_model 재검증 + 표준 JSONResponse),
+model_construct()로 검증을 건너뛴 모델 + FastJSONResponse, 지금 방식(검증된 모델 + FastJSONResponse).
+
+실행: python tests/benchmark_response_serialization.py [--repeat 2000]
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("DATA_BACKEND", "memory")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+from google.api_core.datetime_helpers import DatetimeWithNanoseconds  # noqa: E402
+
+from domain.schema.content_schemas import RouteResContentSummary, RouteResGetContentList  # noqa: E402
+from utils.response_utils import FastJSONResponse  # noqa: E402
+
+PAGE_SIZES = (10, 50, 200)
+CATEGORIES = ("apply", "notice", "cardnews")
+
+_RESPONSE_FIELD = create_model_field("Response_get_content_list", RouteResGetContentList, mode="serialization")
+
+
+def _documents(count: int) -> list[dict[str, object]]:
+    """Firestore 목록 쿼리 결과의 to_dict()와 같은 모양의 문서들."""
+    return [
+        {
+            "post_number": post_number,
+            "title": f"벤치마크 게시글 {post_number}",
+            "contents": "본문 " * 50,
+            "images": [f"https://storage.googleapis.com/kusis/{post_number}.webp"],
+            "category": CATEGORIES[post_number % len(CATEGORIES)],
+            "updated_at": DatetimeWithNanoseconds(2024, 3, 1, 9, 30, post_number % 60, 123456, tzinfo=timezone.utc),
+        }
+        for post_number in range(count, 0, -1)
+    ]
+
+
+def _summary_fields(content_data: dict[str, object]) -> dict[str, object]:
+    return {
+        "post_number": content_data["post_number"],
+        "title": content_data["title"],
+        "first_image": content_data["images"][0] if content_data["images"] else "",
+        "category": content_data["category"],
+    }
+
+
+def _run_without_loop(coroutine) -> object:
+    """
+    serialize_response는 async 엔드포인트에서 중간에 await하지 않으므로 이벤트 루프 없이 끝까지 실행합니다.
+    asyncio.run()의 루프 생성 비용이 측정값에 섞이지 않게 합니다.
+    """
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("serialize_response suspended unexpectedly")
+
+
+def render_validated(documents: list[dict[str, object]]) -> bytes:
+    summaries = [RouteResContentSummary(**_summary_fields(content_data)) for content_data in documents]
+    response = RouteResGetContentList(data=summaries, count=len(summaries), total=1000)
+    content = _run_without_loop(serialize_response(field=_RESPONSE_FIELD, response_content=response))
+    return JSONResponse(content).body
+
+
+def render_constructed(documents: list[dict[str, object]]) -> bytes:
+    summaries = [RouteResContentSummary.model_construct(**_summary_fields(content_data)) for content_data in documents]
+    response = RouteResGetContentList.model_construct(data=summaries, count=len(summaries), total=1000)
+    return FastJSONResponse(response).body
+
+
+def render_fast(documents: list[dict[str, object]]) -> bytes:
+    summaries = [RouteResContentSummary(**_summary_fields(content_data)) for content_data in documents]
+    response = RouteResGetContentList(data=summaries, count=len(summaries), total=1000)
+    return FastJSONResponse(response).body
+
+
+def _measure(func, documents: list[dict[str, object]], repeat: int) -> float:
+    """repeat번 실행한 묶음을 5번 재서 가장 빠른 묶음의 1회 평균(마이크로초)을 반환합니다."""
+    return min(timeit.repeat(lambda: func(documents), number=repeat, repeat=5)) / repeat * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000, help="측정 묶음당 실행 횟수")
+    args = parser.parse_args()
+
+    print(f"{'items':>5}  {'validated (us)':>14}  {'constructed (us)':>16}  {'fast (us)':>10}  {'speedup':>7}")
+    for page_size in PAGE_SIZES:
+        documents = _documents(page_size)
+        validated = _measure(render_validated, documents, args.repeat)
+        constructed = _measure(render_constructed, documents, args.repeat)
+        fast = _measure(render_fast, documents, args.repeat)
+        print(
+            f"{page_size:>5}  {validated:>14.1f}  {constructed:>16.1f}  {fast:>10.1f}  {validated / fast:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+import os
+import sys
+
+# config.Settings는 import 시점에 환경 변수를 읽으므로 src 모듈을 import하기 전에 설정합니다
+os.environ.setdefault("DATA_BACKEND", "memory")
+os.environ.setdefault("SNAPSHOT_ENABLED", "true")
+os.environ.setdefault("SNAPSHOT_BACKEND", "local")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
@@ -0,0 +1,144 @@
+import asyncio
+import errno
+import fcntl
+import gzip
+import os
+
+import pytest
+from starlette.responses import JSONResponse
+
+from utils import compression_utils
+from utils.cache_utils import CachedResponse, ResponseCache, SharedResponseCache
+from utils.compression_utils import CompressionMiddleware
+
+pytestmark = pytest.mark.anyio
+
+
+def _entry(body: bytes = b"{}") -> CachedResponse:
+    return CachedResponse(status_code=200, headers=[(b"content-type", b"application/json")], body=body)
+
+
+@pytest.fixture(params=["memory", "shared"])
+def cache(request, tmp_path) -> ResponseCache | SharedResponseCache:
+    if request.param == "shared":
+        return SharedResponseCache(directory=str(tmp_path))
+    return ResponseCache()
+
+
+def test_set_is_dropped_when_invalidated_after_request_start(cache):
+    generation = cache.current_generation()
+    cache.invalidate()
+    cache.set("/content/1?", _entry(), generation)
+    assert cache.get("/content/1?") is None
+
+    cache.set("/content/1?", _entry(), cache.current_generation())
+    assert cache.get("/content/1?") is not None
+
+
+async def _get(app, path: str, headers: list[tuple[bytes, bytes]] | None = None) -> list[dict]:
+    messages = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": headers or []}
+    await app(scope, receive, send)
+    return messages
+
+
+async def test_middleware_skips_caching_response_built_across_invalidation(cache):
+    async def endpoint(scope, receive, send):
+        # 응답을 만드는 도중 게시글이 수정된 경우
+        cache.invalidate()
+        await JSONResponse({"title": "old"})(scope, receive, send)
+
+    await _get(CompressionMiddleware(endpoint, cache=cache), "/content/1")
+    assert cache.get("/content/1?") is None
+
+    async def unchanged_endpoint(scope, receive, send):
+        await JSONResponse({"title": "new"})(scope, receive, send)
+
+    await _get(CompressionMiddleware(unchanged_endpoint, cache=cache), "/content/1")
+    assert cache.get("/content/1?").body == b'{"title":"new"}'
+
+
+async def test_shared_cache_write_error_still_sends_response(tmp_path, monkeypatch):
+    cache = SharedResponseCache(directory=str(tmp_path))
+
+    def replace_without_space(source: str, destination: str) -> None:
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    # /dev/shm이 가득 찬 경우
+    monkeypatch.setattr(os, "replace", replace_without_space)
+
+    async def endpoint(scope, receive, send):
+        await JSONResponse({"title": "post"})(scope, receive, send)
+
+    messages = await _get(CompressionMiddleware(endpoint, cache=cache), "/content/1")
+
+    assert messages[0]["status"] == 200
+    assert messages[1]["body"] == b'{"title":"post"}'
+    assert cache.skipped_writes == 1
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_shared_cache_skips_writes_while_another_worker_holds_the_lock(tmp_path):
+    cache = SharedResponseCache(directory=str(tmp_path))
+    cache.set("/content/1?", _entry())
+
+    # 다른 워커 프로세스의 잠금과 같도록 잠금 파일을 따로 열어 잡습니다
+    other_worker_fd = os.open(os.path.join(str(tmp_path), "lock"), os.O_RDWR)
+    try:
+        fcntl.flock(other_worker_fd, fcntl.LOCK_EX)
+        cache.set("/content/2?", _entry())
+        cache.set_variant("/content/1?", "gzip", b"compressed")
+    finally:
+        os.close(other_worker_fd)
+
+    assert cache.skipped_writes == 2
+    assert cache.get("/content/2?") is None
+    assert cache.get("/content/1?").variants == {}
+
+
+def test_shared_cache_evicts_only_past_max_entries(tmp_path):
+    cache = SharedResponseCache(directory=str(tmp_path), max_entries=10)
+    for index in range(10):
+        cache.set(f"/content/{index}?", _entry())
+        # 덮어쓰기는 항목 수를 늘리지 않습니다
+        cache.set(f"/content/{index}?", _entry())
+    assert len(list(tmp_path.glob("*.entry"))) == 10
+
+    cache.set("/content/10?", _entry())
+
+    assert len(list(tmp_path.glob("*.entry"))) == 9
+    assert cache.get("/content/10?") is not None
+
+
+async def test_large_response_is_compressed_off_the_event_loop(cache, monkeypatch):
+    threaded_calls = []
+    original_to_thread = asyncio.to_thread
+
+    async def to_thread(func, *args):
+        threaded_calls.append(func)
+        return await original_to_thread(func, *args)
+
+    monkeypatch.setattr(compression_utils.asyncio, "to_thread", to_thread)
+    monkeypatch.setattr(compression_utils.settings, "COMPRESSION_THREAD_MIN_SIZE", 10_000)
+    accept_gzip = [(b"accept-encoding", b"gzip")]
+
+    async def small_endpoint(scope, receive, send):
+        await JSONResponse({"title": "짧은 글" * 100})(scope, receive, send)
+
+    async def large_endpoint(scope, receive, send):
+        await JSONResponse({"title": "긴 글" * 5000})(scope, receive, send)
+
+    await _get(CompressionMiddleware(small_endpoint, cache=cache), "/content/1", accept_gzip)
+    assert threaded_calls == []
+
+    messages = await _get(CompressionMiddleware(large_endpoint, cache=cache), "/content/2", accept_gzip)
+    assert threaded_calls == [compression_utils.compress_body]
+    assert (b"content-encoding", b"gzip") in messages[0]["headers"]
+    assert gzip.decompress(messages[1]["body"]) == cache.get("/content/2?").body
@@ -0,0 +1,107 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from utils import event_utils
+from utils.event_utils import ContentEventHub
+from utils.memory_backend_utils import MemoryFirestoreClient
+from utils.search_utils import ContentSearchIndex
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def db(monkeypatch) -> MemoryFirestoreClient:
+    client = MemoryFirestoreClient()
+    monkeypatch.setattr(event_utils, "get_firestore_client", lambda: client)
+    monkeypatch.setattr(event_utils.settings, "SSE_WATCH_CHECK_SECONDS", 0.01)
+    return client
+
+
+@pytest.fixture
+async def hub(db):
+    content_event_hub = ContentEventHub()
+    yield content_event_hub
+    content_event_hub.stop()
+
+
+async def _write_content(db: MemoryFirestoreClient, post_number: int, title: str, is_deleted: bool = False) -> None:
+    now = datetime.now(timezone.utc)
+    await db.collection("contents").document(f"content-{post_number}").set({
+        "post_number": post_number,
+        "title": title,
+        "contents": "본문",
+        "category": "notice",
+        "images": [],
+        "created_at": now,
+        "updated_at": now,
+        "is_deleted": is_deleted,
+    })
+
+
+async def _settle() -> None:
+    # call_soon_threadsafe로 넘긴 콜백이 실행되도록 이벤트 루프를 한 바퀴 돌립니다
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+async def test_change_handler_applies_writes_from_other_workers(db, hub):
+    search_index = ContentSearchIndex()
+    hub.add_change_handler(search_index.apply_change)
+    hub.start()
+
+    # 다른 워커가 Firestore에 직접 쓴 변경
+    await _write_content(db, 1, "장학금 안내")
+    await _settle()
+    assert [result["post_number"] for result in search_index.search("장학금")[0]] == [1]
+
+    await _write_content(db, 1, "장학금 안내", is_deleted=True)
+    await _settle()
+    assert search_index.search("장학금")[0] == []
+
+
+async def test_listener_restart_sends_reset(db, hub):
+    resets = []
+    hub.add_change_handler(lambda document_id, content_data: None, on_reset=lambda: resets.append(True))
+    subscriber = hub.subscribe()
+    await _write_content(db, 1, "첫 글")
+    first_event = await asyncio.wait_for(subscriber.queue.get(), timeout=1)
+
+    # 복구할 수 없는 오류로 watch 스트림이 끝난 경우
+    hub._watch.unsubscribe()
+    reset_event = await asyncio.wait_for(subscriber.queue.get(), timeout=1)
+
+    assert reset_event["type"] == "reset"
+    assert reset_event["data"] == {"since": first_event["id"]}
+    assert resets == [True]
+    assert hub.events_after(first_event["id"]) is None
+
+    await _write_content(db, 2, "두 번째 글")
+    next_event = await asyncio.wait_for(subscriber.queue.get(), timeout=1)
+    assert next_event["data"]["post_number"] == 2
+
+
+async def test_reanchored_listener_does_not_repeat_events(db, hub, monkeypatch):
+    # 리스너 시작 전에 만들어진 글
+    await _write_content(db, 1, "첫 글")
+    subscriber = hub.subscribe()
+
+    # 시작 전에 만들어진 글의 수정은 결과에 처음 들어와도(ADDED) update입니다
+    await db.collection("contents").document("content-1").update({"updated_at": datetime.now(timezone.utc)})
+    update_event = await asyncio.wait_for(subscriber.queue.get(), timeout=1)
+    assert (update_event["type"], update_event["data"]["post_number"]) == ("update", 1)
+
+    first_watch = hub._watch
+    monkeypatch.setattr(event_utils.settings, "SSE_WATCH_REANCHOR_SECONDS", 0)
+    for _ in range(100):
+        if hub._watch is not first_watch:
+            break
+        await asyncio.sleep(0.01)
+    assert hub._watch is not first_watch
+
+    # 새 리스너의 첫 스냅샷에 들어 있는 이미 보낸 변경은 다시 보내지 않습니다
+    await _write_content(db, 2, "두 번째 글")
+    create_event = await asyncio.wait_for(subscriber.queue.get(), timeout=1)
+    assert (create_event["type"], create_event["data"]["post_number"]) == ("create", 2)
+    assert subscriber.queue.empty()
@@ -0,0 +1,109 @@
+import json
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "src")
+
+REQUEST_DEADLINE_SECONDS = 0.5
+# deadline을 넘긴 요청이 504로 끝나기까지 허용하는 추가 시간 (이벤트 루프 스케줄링, 미들웨어 처리)
+DEADLINE_SLACK_SECONDS = 0.25
+
+# 인메모리 백엔드에 오류와 deadline보다 긴 꼬리 지연을 넣고 앱 전체(lifespan, 미들웨어 포함)를 구동합니다.
+# 캐시 HIT로 백엔드를 건너뛰지 않도록 요청마다 다른 query string을 붙입니다.
+LOAD_SCRIPT = """
+import asyncio
+import json
+import time
+
+import httpx
+
+import main
+
+
+async def run():
+    results = []
+    semaphore = asyncio.Semaphore(16)
+
+    async def request(client, index):
+        if index % 4 == 0:
+            path, params = "/content", {"page": index % 5 + 1, "nonce": index}
+        else:
+            path, params = f"/content/{index % 100 + 1}", {"nonce": index}
+        async with semaphore:
+            started_at = time.perf_counter()
+            response = await client.get(path, params=params)
+            results.append({
+                "status": response.status_code,
+                "elapsed": time.perf_counter() - started_at,
+                "retry_after": response.headers.get("retry-after"),
+                "detail": response.json().get("detail") if response.status_code >= 400 else None,
+            })
+
+    async with main.app.router.lifespan_context(main.app):
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            await asyncio.gather(*(request(client, index) for index in range(400)))
+    print(json.dumps(results))
+
+
+asyncio.run(run())
+"""
+
+
+def _run_load(**fault_env: str) -> list[dict]:
+    env = dict(os.environ)
+    env.update({
+        "DATA_BACKEND": "memory",
+        "MEMORY_BACKEND_SEED_CONTENTS": "100",
+        "MEMORY_BACKEND_SEED": "7",
+        "REQUEST_DEADLINE_PUBLIC_SECONDS": str(REQUEST_DEADLINE_SECONDS),
+        "SNAPSHOT_ENABLED": "false",
+        "WARMUP_ENABLED": "false",
+        **fault_env,
+    })
+    result = subprocess.run(
+        [sys.executable, "-c", LOAD_SCRIPT],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percentile))]
+
+
+def test_backend_faults_fail_fast_with_bounded_latency():
+    results = _run_load(
+        MEMORY_BACKEND_ERROR_RATE="0.2",
+        MEMORY_BACKEND_SLOW_RATE="0.1",
+        MEMORY_BACKEND_SLOW_MS="3000",
+    )
+    statuses = {result["status"] for result in results}
+
+    # 백엔드 오류는 404/500이 아니라 503으로, 꼬리 지연은 deadline에서 504로 끝나야 합니다
+    assert statuses <= {200, 503, 504}
+    assert {200, 503, 504} <= statuses
+    assert all(result["retry_after"] for result in results if result["status"] == 503)
+
+    limit = REQUEST_DEADLINE_SECONDS + DEADLINE_SLACK_SECONDS
+    assert max(result["elapsed"] for result in results if result["status"] == 503) < limit
+    assert max(result["elapsed"] for result in results if result["status"] == 504) < limit
+    assert _percentile([result["elapsed"] for result in results], 0.99) < limit
+
+
+def test_open_circuit_breaker_rejects_without_waiting():
+    results = _run_load(MEMORY_BACKEND_ERROR_RATE="0.8")
+    rejected = [result for result in results if result["status"] == 503]
+    # 실패율이 threshold를 넘으면 breaker가 열려 백엔드를 호출하지 않고 바로 거절합니다
+    short_circuited = [result for result in rejected if result["detail"] == "firestore is temporarily unavailable"]
+
+    assert {result["status"] for result in results} <= {200, 503}
+    assert len(short_circuited) > len(results) / 2
+    assert _percentile([result["elapsed"] for result in rejected], 0.99) < REQUEST_DEADLINE_SECONDS
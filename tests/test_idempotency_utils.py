@@ -0,0 +1,57 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from utils import resilience_utils
+from utils.idempotency_utils import IdempotencyStore, make_request_fingerprint
+from utils.memory_backend_utils import MemoryFirestoreClient
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def circuit_breakers(monkeypatch) -> None:
+    monkeypatch.setattr(resilience_utils, "circuit_breakers", {})
+
+
+async def test_fingerprint_changes_with_image_bytes():
+    first = UploadFile(io.BytesIO(b"first image"), filename="photo.png")
+    second = UploadFile(io.BytesIO(b"other image"), filename="photo.png")
+
+    assert await make_request_fingerprint({}, [first]) != await make_request_fingerprint({}, [second])
+    # 지문을 만든 뒤에도 업로드할 때 처음부터 읽을 수 있어야 합니다
+    assert first.file.read() == b"first image"
+
+
+async def test_long_running_handler_is_not_taken_over():
+    db = MemoryFirestoreClient()
+    # 두 store는 같은 Firestore를 쓰는 서로 다른 프로세스를 흉내 냅니다
+    owner = IdempotencyStore(lock_timeout_seconds=0.3)
+    other = IdempotencyStore(lock_timeout_seconds=0.3)
+    other.poll_interval = 0.02
+    calls = 0
+
+    async def handler() -> dict:
+        nonlocal calls
+        calls += 1
+        # lock_timeout보다 오래 걸리는 처리
+        await asyncio.sleep(1)
+        return {"post_number": calls}
+
+    async def retry_after_lock_timeout() -> None:
+        await asyncio.sleep(0.5)
+        # heartbeat가 갱신되고 있으므로 중단된 요청으로 보고 대신 처리하지 않고, 처리 중이라고 거절합니다
+        with pytest.raises(HTTPException) as exc_info:
+            await other.run(db, "content:create", "key", "fingerprint", handler)
+        assert exc_info.value.status_code == 409
+
+    (response, is_replayed), _ = await asyncio.gather(
+        owner.run(db, "content:create", "key", "fingerprint", handler),
+        retry_after_lock_timeout(),
+    )
+
+    assert calls == 1
+    assert response == {"post_number": 1}
+    assert not is_replayed
@@ -0,0 +1,65 @@
+import io
+import json
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from google.api_core.exceptions import ServiceUnavailable
+
+from config import settings
+from domain.service.import_services import service_import_contents, service_prepare_import
+from utils import resilience_utils
+from utils.memory_backend_utils import MemoryFirestoreClient
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def circuit_breakers(monkeypatch) -> None:
+    monkeypatch.setattr(resilience_utils, "circuit_breakers", {})
+
+
+def _ndjson_upload(count: int) -> UploadFile:
+    lines = [
+        json.dumps({"title": f"title {index}", "contents": "contents", "category": "notice"})
+        for index in range(count)
+    ]
+    return UploadFile(io.BytesIO("\n".join(lines).encode()), filename="contents.ndjson")
+
+
+async def test_plain_ndjson_upload_is_size_limited(monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_MAX_UNCOMPRESSED_BYTES", 100)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await service_prepare_import(_ndjson_upload(10))
+    assert exc_info.value.status_code == 400
+
+
+async def test_failed_batch_commit_is_retried(monkeypatch):
+    db = MemoryFirestoreClient()
+    await db.collection("counters").document("contents").set({"count": 0})
+    original_batch = db.batch
+    failures = 0
+
+    def flaky_batch():
+        batch = original_batch()
+        original_commit = batch.commit
+
+        async def commit(*args, **kwargs):
+            nonlocal failures
+            if failures == 0:
+                failures += 1
+                raise ServiceUnavailable("injected")
+            return await original_commit(*args, **kwargs)
+
+        batch.commit = commit
+        return batch
+
+    monkeypatch.setattr(db, "batch", flaky_batch)
+    archive = await service_prepare_import(_ndjson_upload(3))
+    results = [json.loads(line) async for line in service_import_contents(archive, db, image_uploader=None)]
+
+    # 다시 커밋해도 같은 문서 ID로 쓰므로 예약한 번호가 빠지거나 문서가 중복되지 않습니다
+    assert failures == 1
+    assert sorted(result["post_number"] for result in results) == [1, 2, 3]
+    assert {result["status"] for result in results} == {"created"}
+    assert len(await db.collection("contents").get()) == 3
@@ -0,0 +1,72 @@
+import json
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "src")
+
+# 콜드 스타트에서 import가 네트워크나 인증을 기다리지 않는지 확인하는 상한입니다 (실제로는 1.3초 안팎)
+IMPORT_TIME_BUDGET_SECONDS = 3
+
+# 클라이언트 생성자를 가로챈 뒤 database와 main을 import하고, 만들어진 클라이언트가 없는지 확인합니다
+IMPORT_SCRIPT = """
+import json
+import time
+
+import firebase_admin
+from google.cloud import firestore, storage
+
+
+def fail(*args, **kwargs):
+    raise AssertionError("client created at import time")
+
+
+for client_class in (firestore.AsyncClient, firestore.Client, storage.Client):
+    client_class.__init__ = fail
+firebase_admin.initialize_app = fail
+
+started_at = time.perf_counter()
+import database
+import main
+elapsed = time.perf_counter() - started_at
+
+from utils import memory_backend_utils
+
+print(json.dumps({
+    "elapsed": elapsed,
+    "clients": [
+        name for name, client in {
+            "credentials": database._credentials,
+            "firestore": database._firestore_client,
+            "sync_firestore": database._sync_firestore_client,
+            "storage": database._storage_client,
+            "firebase_app": firebase_admin._apps or None,
+            "memory_firestore": memory_backend_utils._memory_firestore_client,
+            "memory_storage": memory_backend_utils._memory_storage_client,
+        }.items()
+        if client is not None
+    ],
+}))
+"""
+
+
+def test_import_without_credentials_creates_no_clients():
+    env = {
+        key: value for key, value in os.environ.items()
+        if key not in ("GOOGLE_APPLICATION_CREDENTIALS", "DATA_BACKEND")
+    }
+    env["DATA_BACKEND"] = "google"
+
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=IMPORT_TIME_BUDGET_SECONDS * 3,
+    )
+
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert report["clients"] == []
+    assert report["elapsed"] < IMPORT_TIME_BUDGET_SECONDS
@@ -0,0 +1,224 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from google.api_core.exceptions import Aborted, FailedPrecondition, ServiceUnavailable
+from google.cloud.firestore_v1.base_query import And, FieldFilter, Or
+
+from utils import resilience_utils
+from utils.crud_utils import FirestoreService
+from utils.memory_backend_utils import FaultProfile, MemoryFirestoreClient
+
+pytestmark = pytest.mark.anyio
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# (문서 ID, post_number, category, is_deleted) - post_number 3은 두 문서가 같은 값이라 문서 ID로 순서가 정해집니다
+DOCUMENTS = [
+    ("a", 1, "notice", False),
+    ("b", 2, "apply", False),
+    ("c", 3, "notice", False),
+    ("d", 3, "notice", False),
+    ("e", 4, "cardnews", True),
+    ("f", 5, "notice", False),
+]
+
+
+@pytest.fixture
+async def db() -> MemoryFirestoreClient:
+    client = MemoryFirestoreClient()
+    for document_id, post_number, category, is_deleted in DOCUMENTS:
+        await client.collection("contents").document(document_id).set({
+            "post_number": post_number,
+            "category": category,
+            "is_deleted": is_deleted,
+            "updated_at": BASE_TIME + timedelta(minutes=post_number),
+        })
+    # 정렬 필드가 없는 문서
+    await client.collection("contents").document("g").set({"category": "notice", "is_deleted": False})
+    return client
+
+
+@pytest.fixture(autouse=True)
+def circuit_breakers(monkeypatch) -> None:
+    # 주입한 오류가 다른 테스트의 circuit breaker 상태에 남지 않도록 테스트마다 새로 만듭니다
+    monkeypatch.setattr(resilience_utils, "circuit_breakers", {})
+
+
+def _ids(snapshots) -> list[str]:
+    return [snapshot.id for snapshot in snapshots]
+
+
+async def test_where_and_or_filters(db):
+    notices = await db.collection("contents").where(filter=And([
+        FieldFilter("category", "==", "notice"),
+        FieldFilter("is_deleted", "==", False),
+    ])).get()
+    assert sorted(_ids(notices)) == ["a", "c", "d", "f", "g"]
+
+    chained = await db.collection("contents").where("category", "==", "notice").where("post_number", ">=", 3).get()
+    assert sorted(_ids(chained)) == ["c", "d", "f"]
+
+    either = await db.collection("contents").where(filter=Or([
+        FieldFilter("category", "==", "apply"),
+        FieldFilter("is_deleted", "==", True),
+    ])).get()
+    assert sorted(_ids(either)) == ["b", "e"]
+
+    # 범위 조건은 같은 종류의 값끼리만 비교합니다
+    recent = await db.collection("contents").where("updated_at", ">", BASE_TIME + timedelta(minutes=3)).get()
+    assert sorted(_ids(recent)) == ["e", "f"]
+    assert await db.collection("contents").where("category", ">", BASE_TIME).get() == []
+
+
+async def test_order_by_offset_limit(db):
+    query = db.collection("contents").where("is_deleted", "==", False)
+
+    descending = await query.order_by("post_number", direction="DESCENDING").get()
+    # 같은 post_number는 마지막 정렬 방향으로 문서 ID 순, 정렬 필드가 없는 문서는 빠집니다
+    assert _ids(descending) == ["f", "d", "c", "b", "a"]
+
+    ascending = await query.order_by("post_number").get()
+    assert _ids(ascending) == ["a", "b", "c", "d", "f"]
+
+    page = await query.order_by("post_number", direction="DESCENDING").offset(1).limit(2).get()
+    assert _ids(page) == ["d", "c"]
+    assert await query.order_by("post_number").offset(10).get() == []
+
+    count = await query.order_by("post_number").count().get()
+    assert count[0][0].value == 5
+
+
+async def test_start_after_cursor(db):
+    query = db.collection("contents").where("is_deleted", "==", False).order_by("post_number", direction="DESCENDING")
+    first_page = await query.limit(2).get()
+    assert _ids(first_page) == ["f", "d"]
+
+    # 스냅샷 커서는 문서 ID까지 이어서 같은 post_number의 나머지 문서부터 시작합니다
+    second_page = await query.start_after(first_page[-1]).limit(2).get()
+    assert _ids(second_page) == ["c", "b"]
+
+    # 필드 값만 준 커서는 그 값의 문서를 모두 건너뜁니다
+    after_value = await query.start_after({"post_number": 3}).get()
+    assert _ids(after_value) == ["b", "a"]
+
+    with pytest.raises(ValueError):
+        await query.start_after({"category": "notice"}).get()
+
+
+async def test_transaction_aborts_on_conflicting_write(db):
+    counter_ref = db.collection("counters").document("contents")
+    await counter_ref.set({"count": 1})
+
+    transaction = db.transaction()
+    await transaction._begin()
+    snapshot = await counter_ref.get(transaction=transaction)
+    transaction.set(counter_ref, {"count": snapshot.get("count") + 1})
+
+    # 읽은 뒤 다른 쪽이 먼저 쓰면 커밋이 Aborted로 실패하고 아무것도 반영되지 않습니다
+    await counter_ref.set({"count": 10})
+    with pytest.raises(Aborted):
+        await transaction._commit()
+    assert not transaction.in_progress
+    assert (await counter_ref.get()).get("count") == 10
+
+
+async def test_run_transaction_retries_after_conflict(db):
+    counter_ref = db.collection("counters").document("contents")
+    await counter_ref.set({"count": 1})
+    attempts = 0
+
+    async def increment(transaction) -> int:
+        nonlocal attempts
+        attempts += 1
+        snapshot = await counter_ref.get(transaction=transaction)
+        if attempts == 1:
+            await counter_ref.set({"count": 10})
+        transaction.set(counter_ref, {"count": snapshot.get("count") + 1})
+        return snapshot.get("count") + 1
+
+    service = FirestoreService(db)
+    service.base_retry_delay = 0.001
+
+    assert await service.run_transaction(increment) == 11
+    assert attempts == 2
+    assert (await counter_ref.get()).get("count") == 11
+
+
+async def test_last_update_option_rejects_stale_write(db):
+    reference = db.collection("contents").document("a")
+    snapshot = await reference.get()
+    await reference.update({"category": "apply"})
+
+    with pytest.raises(FailedPrecondition):
+        await reference.update({"category": "cardnews"}, option=db.write_option(last_update_time=snapshot.update_time))
+    assert (await reference.get()).get("category") == "apply"
+
+
+async def test_concurrent_id_allocation_under_faults():
+    db = MemoryFirestoreClient()
+    await db.collection("counters").document("contents").set({"count": 0})
+    db.profile = FaultProfile(
+        latency_seconds=0.002,
+        jitter_seconds=0.003,
+        slow_rate=0.1,
+        slow_seconds=0.02,
+        error_rate=0.1,
+        seed=3,
+    )
+
+    async def allocate(count: int) -> tuple[int, int]:
+        service = FirestoreService(db)
+        service.max_transaction_attempts = 20
+        service.base_retry_delay = 0.001
+        return await service.allocate_increment_ids("contents", count), count
+
+    results = await asyncio.gather(*(allocate(index % 3 + 1) for index in range(30)), return_exceptions=True)
+    allocations = [result for result in results if not isinstance(result, BaseException)]
+    failures = [result for result in results if isinstance(result, BaseException)]
+
+    # 재시도를 다 써서 실패한 호출은 일시적인 오류여야 하고, 성공한 구간은 겹치거나 비지 않아야 합니다
+    assert all(isinstance(failure, (Aborted, ServiceUnavailable)) for failure in failures)
+    assert len(allocations) > len(results) * 0.8
+    reserved = sorted(post_number for first, count in allocations for post_number in range(first, first + count))
+    db.profile = FaultProfile()
+    assert reserved == list(range(1, len(reserved) + 1))
+    assert (await db.collection("counters").document("contents").get()).get("count") == len(reserved)
+
+
+async def test_update_is_not_retried_after_commit_outcome_is_unknown(db, monkeypatch):
+    original_transaction = db.transaction
+    commits = 0
+
+    def lost_reply_transaction():
+        transaction = original_transaction()
+        original_commit = transaction._commit
+
+        async def commit():
+            # 커밋은 반영되었지만 응답을 받지 못한 경우
+            nonlocal commits
+            commits += 1
+            await original_commit()
+            raise ServiceUnavailable("connection reset")
+
+        transaction._commit = commit
+        return transaction
+
+    monkeypatch.setattr(db, "transaction", lost_reply_transaction)
+    service = FirestoreService(db)
+    service.base_retry_delay = 0.001
+
+    # 다시 실행하면 자신의 쓰기를 다른 요청의 수정으로 보고 409를 내므로, 재시도하지 않고 503으로 끝나야 합니다
+    with pytest.raises(ServiceUnavailable):
+        await service.update_document_by_increment_id(
+            "contents",
+            "post_number",
+            1,
+            {"updated_at": BASE_TIME},
+            expected_updated_at=BASE_TIME + timedelta(minutes=1),
+        )
+    assert commits == 1
+
+    # 찾는 문서가 없으면 커밋하지 않습니다
+    assert await service.update_document_by_increment_id("contents", "post_number", 99, {"category": "apply"}) is None
+    assert commits == 1
@@ -0,0 +1,125 @@
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from google.api_core.datetime_helpers import DatetimeWithNanoseconds
+
+from domain.schema.content_schemas import (
+    RouteResContentBatchItem,
+    RouteResContentSummary,
+    RouteResGetContent,
+    RouteResGetContentBatch,
+    RouteResGetContentList,
+)
+from utils import response_utils
+from utils.response_utils import FastJSONResponse
+
+# Firestore가 돌려주는 시각: 마이크로초가 있는 값, 없는 값, 나노초까지 있는 값, 서울 시간대로 저장된 값
+UPDATED_ATS = [
+    DatetimeWithNanoseconds(2024, 3, 1, 9, 30, 15, 123456, tzinfo=timezone.utc),
+    DatetimeWithNanoseconds(2024, 3, 1, 9, 30, 15, tzinfo=timezone.utc),
+    DatetimeWithNanoseconds(2024, 3, 1, 9, 30, 15, nanosecond=987654321, tzinfo=timezone.utc),
+    datetime(2024, 3, 1, 18, 30, 15, 5000, tzinfo=ZoneInfo("Asia/Seoul")),
+]
+
+
+def _content_data(index: int) -> dict[str, object]:
+    """get_document_by_increment_id가 돌려주는 Firestore 문서 dict와 같은 모양."""
+    updated_at = UPDATED_ATS[index % len(UPDATED_ATS)]
+    return {
+        "document_id": f"doc-{index}",
+        "post_number": index,
+        "title": f"게시글 {index} \"따옴표\" \\ 역슬래시",
+        "contents": "본문 😀\n줄바꿈",
+        "images": [f"https://storage.googleapis.com/kusis/{index}.webp"] if index % 2 else [],
+        "category": ["apply", "notice", "cardnews"][index % 3],
+        "created_at": updated_at,
+        "updated_at": updated_at,
+        "is_deleted": False,
+    }
+
+
+def _content(content_data: dict[str, object]) -> RouteResGetContent:
+    return RouteResGetContent(content_id=content_data["document_id"], **content_data)
+
+
+def _content_list(count: int) -> RouteResGetContentList:
+    summaries = [
+        RouteResContentSummary(
+            post_number=content_data["post_number"],
+            title=content_data["title"],
+            first_image=content_data["images"][0] if content_data["images"] else "",
+            category=content_data["category"],
+        )
+        for content_data in map(_content_data, range(1, count + 1))
+    ]
+    return RouteResGetContentList(data=summaries, count=len(summaries), total=count + 100)
+
+
+def _content_batch(count: int) -> RouteResGetContentBatch:
+    items = [
+        RouteResContentBatchItem(
+            post_number=post_number,
+            is_found=post_number % 3 != 0,
+            content=_content(_content_data(post_number)) if post_number % 3 != 0 else None,
+        )
+        for post_number in range(1, count + 1)
+    ]
+    return RouteResGetContentBatch(data=items, count=sum(item.is_found for item in items))
+
+
+def _build_app() -> FastAPI:
+    """같은 응답 모델을 기존 방식(response_model 재검증 + 표준 JSONResponse)과 FastJSONResponse로 내보내는 앱."""
+    app = FastAPI()
+
+    @app.get("/old/content/{index}", response_model=RouteResGetContent)
+    async def old_content(index: int):
+        return _content(_content_data(index))
+
+    @app.get("/new/content/{index}", response_model=RouteResGetContent)
+    async def new_content(index: int):
+        return FastJSONResponse(_content(_content_data(index)))
+
+    @app.get("/old/list/{count}", response_model=RouteResGetContentList)
+    async def old_list(count: int):
+        return _content_list(count)
+
+    @app.get("/new/list/{count}", response_model=RouteResGetContentList)
+    async def new_list(count: int):
+        return FastJSONResponse(_content_list(count))
+
+    @app.get("/old/batch/{count}", response_model=RouteResGetContentBatch)
+    async def old_batch(count: int):
+        return _content_batch(count)
+
+    @app.get("/new/batch/{count}", response_model=RouteResGetContentBatch)
+    async def new_batch(count: int):
+        return FastJSONResponse(_content_batch(count))
+
+    return app
+
+
+@pytest.fixture(params=["orjson", "json"])
+def client(request, monkeypatch) -> TestClient:
+    if request.param == "json":
+        monkeypatch.setattr(response_utils, "orjson", None)
+    elif response_utils.orjson is None:
+        pytest.skip("orjson is not installed")
+    return TestClient(_build_app())
+
+
+@pytest.mark.parametrize("path", [
+    *(f"content/{index}" for index in range(1, len(UPDATED_ATS) + 1)),
+    "list/0",
+    "list/10",
+    "batch/7",
+])
+def test_fast_json_response_matches_response_model_output(client, path):
+    old_response = client.get(f"/old/{path}")
+    new_response = client.get(f"/new/{path}")
+
+    assert old_response.status_code == new_response.status_code == 200
+    assert new_response.content == old_response.content
+    assert new_response.headers["content-type"] == old_response.headers["content-type"]
@@ -0,0 +1,55 @@
+import pytest
+
+from utils.memory_backend_utils import MemoryFirestoreClient, MemoryQuery
+from utils.search_utils import ContentSearchIndex
+
+pytestmark = pytest.mark.anyio
+
+
+async def _save(db: MemoryFirestoreClient, post_number: int, title: str, is_deleted: bool = False) -> None:
+    await db.collection("contents").document(f"content-{post_number}").set({
+        "post_number": post_number,
+        "title": title,
+        "contents": "본문",
+        "category": "notice",
+        "images": [],
+        "is_deleted": is_deleted,
+    })
+
+
+def _post_numbers(index: ContentSearchIndex, query: str) -> list[int]:
+    results, _ = index.search(query)
+    return [result["post_number"] for result in results]
+
+
+async def test_rebuild_drops_posts_deleted_while_listener_was_down():
+    db = MemoryFirestoreClient()
+    await _save(db, 1, "장학금 신청")
+    await _save(db, 2, "장학금 발표")
+    index = ContentSearchIndex()
+    await index.build(db)
+    assert sorted(_post_numbers(index, "장학금")) == [1, 2]
+
+    # 리스너가 끊긴 동안 다른 인스턴스에서 삭제된 게시글
+    await _save(db, 2, "장학금 발표", is_deleted=True)
+    await index.build(db)
+
+    assert _post_numbers(index, "장학금") == [1]
+
+
+async def test_changes_during_build_reach_the_new_index(monkeypatch):
+    db = MemoryFirestoreClient()
+    await _save(db, 1, "장학금 신청")
+    index = ContentSearchIndex()
+    original_stream = MemoryQuery.stream
+
+    async def stream_with_concurrent_write(query, *args, **kwargs):
+        async for document in original_stream(query, *args, **kwargs):
+            # 색인을 만드는 동안 리스너로 들어온 새 게시글
+            index.upsert(3, {"post_number": 3, "title": "장학금 안내", "contents": "", "category": "notice"})
+            yield document
+
+    monkeypatch.setattr(MemoryQuery, "stream", stream_with_concurrent_write)
+    await index.build(db)
+
+    assert sorted(_post_numbers(index, "장학금")) == [1, 3]
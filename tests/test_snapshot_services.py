@@ -0,0 +1,145 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from domain.service import snapshot_services
+from domain.service.snapshot_services import (
+    SnapshotPublisher,
+    content_snapshot_path,
+    list_snapshot_path,
+    publish_list_snapshots,
+)
+from utils.memory_backend_utils import MemoryFirestoreClient
+from utils.snapshot_utils import LocalSnapshotStorage
+
+pytestmark = pytest.mark.anyio
+
+
+async def _create_content(db: MemoryFirestoreClient, post_number: int, category: str = "notice") -> None:
+    now = datetime.now(timezone.utc)
+    await db.collection("contents").document(f"content-{post_number}").set({
+        "post_number": post_number,
+        "title": f"게시글 {post_number}",
+        "contents": "본문",
+        "category": category,
+        "images": [],
+        "created_at": now,
+        "updated_at": now,
+        "is_deleted": False,
+    })
+    await db.collection("counters").document("contents").set({"count": post_number}, merge=True)
+
+
+class SlowLocalSnapshotStorage(LocalSnapshotStorage):
+    """쓰기마다 잠시 멈춰 flush가 진행 중인 동안 schedule()이 끼어들 수 있게 합니다."""
+
+    def __init__(self, base_dir: str):
+        super().__init__(base_dir)
+        self.is_writing = asyncio.Event()
+
+    async def write(self, path: str, data: bytes) -> None:
+        self.is_writing.set()
+        await asyncio.sleep(0.05)
+        await super().write(path, data)
+
+
+@pytest.fixture
+def db(monkeypatch) -> MemoryFirestoreClient:
+    client = MemoryFirestoreClient()
+    monkeypatch.setattr(snapshot_services, "get_async_firestore_client", lambda: client)
+    return client
+
+
+@pytest.fixture
+def storage(monkeypatch, tmp_path) -> SlowLocalSnapshotStorage:
+    snapshot_storage = SlowLocalSnapshotStorage(str(tmp_path))
+
+    async def get_snapshot_storage() -> SlowLocalSnapshotStorage:
+        return snapshot_storage
+
+    monkeypatch.setattr(snapshot_services, "get_snapshot_storage", get_snapshot_storage)
+    return snapshot_storage
+
+
+async def test_schedule_during_flush_is_published(db, storage):
+    publisher = SnapshotPublisher(debounce_seconds=0.01)
+    await _create_content(db, 1)
+    publisher.schedule(1, ["notice"])
+
+    await asyncio.wait_for(storage.is_writing.wait(), timeout=1)
+    await _create_content(db, 2)
+    publisher.schedule(2, ["notice"])
+
+    await asyncio.wait_for(publisher._flush_task, timeout=5)
+
+    assert await storage.read(content_snapshot_path(1)) is not None
+    assert await storage.read(content_snapshot_path(2)) is not None
+    first_page = json.loads(await storage.read(list_snapshot_path("notice", 1)))
+    assert [summary["post_number"] for summary in first_page["data"]] == [2, 1]
+    assert not publisher.dirty_post_numbers and not publisher.dirty_categories
+
+
+async def test_failed_flush_is_retried(db, storage, monkeypatch):
+    publisher = SnapshotPublisher(debounce_seconds=0.01)
+    await _create_content(db, 1)
+
+    original_write = LocalSnapshotStorage.write
+    failures = []
+
+    async def flaky_write(self, path: str, data: bytes) -> None:
+        if path == content_snapshot_path(1) and not failures:
+            failures.append(path)
+            raise OSError("disk full")
+        await original_write(self, path, data)
+
+    monkeypatch.setattr(SlowLocalSnapshotStorage, "write", flaky_write)
+    publisher.schedule(1, ["notice"])
+    await asyncio.wait_for(publisher._flush_task, timeout=5)
+
+    assert failures
+    assert await storage.read(content_snapshot_path(1)) is not None
+
+
+async def test_publish_list_snapshots_removes_stale_pages(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_services.settings, "SNAPSHOT_PAGE_SIZE", 2)
+    snapshot_storage = LocalSnapshotStorage(str(tmp_path))
+    for post_number in range(1, 6):
+        await _create_content(db, post_number)
+
+    await publish_list_snapshots("notice", db, snapshot_storage)
+    assert await snapshot_storage.read(list_snapshot_path("notice", 3)) is not None
+
+    for post_number in (4, 5):
+        await db.collection("contents").document(f"content-{post_number}").update({"is_deleted": True})
+    await publish_list_snapshots("notice", db, snapshot_storage)
+
+    assert await snapshot_storage.read(list_snapshot_path("notice", 3)) is None
+    last_page = json.loads(await snapshot_storage.read(list_snapshot_path("notice", 2)))
+    assert [summary["post_number"] for summary in last_page["data"]] == [1]
+    assert last_page["total"] == 5
+
+
+async def test_publish_list_snapshots_uploads_only_changed_pages(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_services.settings, "SNAPSHOT_PAGE_SIZE", 2)
+    snapshot_storage = LocalSnapshotStorage(str(tmp_path))
+    for post_number in range(1, 6):
+        await _create_content(db, post_number)
+    await publish_list_snapshots("notice", db, snapshot_storage)
+
+    written_paths = []
+    original_write = LocalSnapshotStorage.write
+
+    async def recording_write(self, path: str, data: bytes) -> None:
+        written_paths.append(path)
+        await original_write(self, path, data)
+
+    monkeypatch.setattr(LocalSnapshotStorage, "write", recording_write)
+    # 3번 게시글은 2페이지([3, 2])에만 나옵니다
+    await db.collection("contents").document("content-3").update({"title": "수정된 제목"})
+    await publish_list_snapshots("notice", db, snapshot_storage)
+
+    assert [path for path in written_paths if not path.endswith("meta.json")] == [list_snapshot_path("notice", 2)]
+    second_page = json.loads(await snapshot_storage.read(list_snapshot_path("notice", 2)))
+    assert second_page["data"][0]["title"] == "수정된 제목"